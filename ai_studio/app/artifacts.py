@@ -0,0 +1,194 @@
+# app/artifacts.py
+"""
+HTTP serving for generated artifacts (narration MP3s, timeline exports).
+
+Artifacts are content-addressed and never rewritten in place, so they
+go out with strong ETags derived from their id (the content hash) and
+`Cache-Control: immutable`; conditional
+requests get 304s, and single byte ranges get 206s streamed straight
+from disk, so seeking in the player only moves the bytes it needs.
+"""
+import os
+import re
+from email.utils import formatdate
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+
+from config.settings import ARTIFACT_MAX_AGE
+from tts.audio_generator import AUDIO_DIR
+
+router = APIRouter()
+
+IMMUTABLE = f"public, max-age={ARTIFACT_MAX_AGE}, immutable"
+REVALIDATE = "no-cache"
+
+CHUNK_SIZE = 256 * 1024
+
+AUDIO_NAME_RE = re.compile(r"^[0-9a-f]{32}\.mp3$")
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+# ---------------- VALIDATORS ----------------
+
+def file_etag(st: os.stat_result, variant: str = "") -> str:
+    """
+    Strong ETag of a write-once file: it only ever changes by being
+    replaced, which changes its mtime.
+    """
+    return f'"{st.st_size:x}-{st.st_mtime_ns:x}{variant}"'
+
+
+def artifact_etag(artifact_id: str, size: int, variant: str = "") -> str:
+    """
+    Strong ETag of a content-addressed artifact: its id and size, never
+    its mtime, so re-generating or cache housekeeping (recency, copies)
+    does not invalidate what clients hold.
+    """
+    return f'"{artifact_id}-{size:x}{variant}"'
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    tags = [tag.strip() for tag in header.split(",")]
+    # If-None-Match uses the weak comparison
+    return "*" in tags or etag in (tag.removeprefix("W/") for tag in tags)
+
+
+def _byte_range(request: Request, etag: str, size: int):
+    """
+    (start, end) inclusive for a satisfiable single range, "unsatisfiable",
+    or None to send the whole file (no Range, multiple ranges, or an
+    If-Range that no longer matches).
+    """
+    header = request.headers.get("range")
+    if not header:
+        return None
+
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() != etag:
+        return None
+
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+
+    if not first:
+        if not last or int(last) == 0:
+            return "unsatisfiable"
+        return max(size - int(last), 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return "unsatisfiable"
+    return start, end
+
+
+def _iter_file(path: str, start: int, length: int):
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+# ---------------- RESPONSES ----------------
+
+def serve_file(
+    request: Request,
+    path: str,
+    media_type: str,
+    cache_control: str = IMMUTABLE,
+    headers: dict | None = None,
+    etag_variant: str = "",
+    artifact_id: str | None = None
+) -> Response:
+    """
+    A file response with validators, 304s and single-range 206s. With
+    `artifact_id` (content-addressed files) the ETag comes from the id,
+    otherwise from the file's size and mtime.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+
+    if artifact_id:
+        etag = artifact_etag(artifact_id, st.st_size, etag_variant)
+    else:
+        etag = file_etag(st, etag_variant)
+    base = {
+        "etag": etag,
+        "cache-control": cache_control,
+        "last-modified": formatdate(st.st_mtime, usegmt=True),
+        **(headers or {})
+    }
+
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=base)
+
+    size = st.st_size
+    span = _byte_range(request, etag, size)
+    base["accept-ranges"] = "bytes"
+
+    if span == "unsatisfiable":
+        return Response(status_code=416, headers={**base, "content-range": f"bytes */{size}"})
+
+    if span is None:
+        start, end, status = 0, size - 1, 200
+    else:
+        (start, end), status = span, 206
+        base["content-range"] = f"bytes {start}-{end}/{size}"
+
+    length = end - start + 1 if size else 0
+    base["content-length"] = str(length)
+
+    if request.method == "HEAD":
+        return Response(status_code=status, headers=base, media_type=media_type)
+
+    return StreamingResponse(
+        _iter_file(path, start, length),
+        status_code=status,
+        headers=base,
+        media_type=media_type
+    )
+
+
+def accepted_encodings(request: Request) -> set[str]:
+    accepted = set()
+
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip().removeprefix("q=")
+        try:
+            if coding and (not params or float(q) > 0):
+                accepted.add(coding.strip().lower())
+        except ValueError:
+            continue
+
+    return accepted
+
+
+# ---------------- AUDIO ----------------
+# Registered ahead of the /static mount, so MP3 URLs are unchanged.
+
+@router.api_route("/static/audio/{name}", methods=["GET", "HEAD"])
+def get_audio(name: str, request: Request):
+    if not AUDIO_NAME_RE.match(name):
+        raise HTTPException(status_code=404, detail="Artifact not found")
+
+    return serve_file(
+        request,
+        os.path.join(AUDIO_DIR, name),
+        "audio/mpeg",
+        artifact_id=name.removesuffix(".mp3")
+    )
@@ -0,0 +1,217 @@
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.uploads import UPLOAD_DIR, check_upload, extract_documents, save_upload
+from config.settings import BATCH_MAX_FILES
+from jobs.manager import get_job_manager
+
+import asyncio
+import json
+import os
+import time
+
+router = APIRouter(prefix="/jobs")
+
+JOB_UPLOAD_DIR = os.path.join(UPLOAD_DIR, "jobs")
+os.makedirs(JOB_UPLOAD_DIR, exist_ok=True)
+
+
+# ---------------- SUBMIT ----------------
+@router.post("/script")
+async def submit_script_job(
+    file: UploadFile = File(..., description="Upload a PDF or PPTX file"),
+    tone: str = "educational",
+    audio: bool = False,
+    no_cache: bool = False,
+    alignment: str | None = None
+):
+    """
+    Queues script generation (and optionally narration) for an upload.
+    Returns immediately with a job id to poll.
+    """
+    check_upload(file)
+
+    # kept until the job finishes, so a persisted job can resume
+    saved_path = await save_upload(file, JOB_UPLOAD_DIR)
+
+    job = get_job_manager().submit("script", {
+        "file_path": saved_path,
+        "tone": tone,
+        "audio": audio,
+        "use_cache": not no_cache,
+        "alignment": alignment
+    })
+
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job.id, "status": job.status}
+    )
+
+
+@router.post("/audio")
+def submit_audio_job(
+    script: str = Form(...),
+    no_cache: bool = False,
+    alignment: str | None = None
+):
+    if not script.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="Script text cannot be empty"
+        )
+
+    job = get_job_manager().submit("audio", {
+        "script": script,
+        "use_cache": not no_cache,
+        "alignment": alignment
+    })
+
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job.id, "status": job.status}
+    )
+
+
+# ---------------- BATCH ----------------
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _save_batch(files: list[UploadFile]) -> list[tuple[str, str]]:
+    """
+    Saves every document of a batch to JOB_UPLOAD_DIR; a zip contributes
+    its PDF/PPTX members. All or nothing: on error nothing is left behind.
+    """
+    documents = []
+
+    try:
+        for file in files:
+            if file.filename and file.filename.lower().endswith(".zip"):
+                zip_path = await save_upload(file, JOB_UPLOAD_DIR)
+                try:
+                    documents += await run_in_threadpool(
+                        extract_documents,
+                        zip_path,
+                        JOB_UPLOAD_DIR,
+                        BATCH_MAX_FILES - len(documents)
+                    )
+                finally:
+                    os.remove(zip_path)
+                continue
+
+            check_upload(file)
+            if len(documents) >= BATCH_MAX_FILES:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Batch exceeds the limit of {BATCH_MAX_FILES} documents"
+                )
+            documents.append((file.filename, await save_upload(file, JOB_UPLOAD_DIR)))
+
+    except BaseException:
+        for _, path in documents:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    if not documents:
+        raise HTTPException(status_code=400, detail="No PDF or PPTX documents in batch")
+
+    return documents
+
+
+@router.post("/batch")
+async def submit_batch(
+    files: list[UploadFile] = File(..., description="PDF/PPTX files, or zips of them"),
+    tone: str = "educational",
+    audio: bool = False,
+    no_cache: bool = False,
+    alignment: str | None = None
+):
+    """
+    Queues one script job (optionally with narration) per document and
+    streams Server-Sent Events: `accepted` with the job ids, one
+    `document` event per job as it finishes (in completion order), then
+    `done`. Jobs run on the same bounded stage pools and LLM budget as
+    everything else, and keep running if the client disconnects; their
+    ids can be polled at /jobs/{id}.
+
+    The request body may total BATCH_MAX_BYTES; each file (and each
+    document inside a zip) is held to UPLOAD_MAX_BYTES.
+    """
+    documents = await _save_batch(files)
+    manager = get_job_manager()
+    loop = asyncio.get_running_loop()
+    finished = asyncio.Queue()
+
+    jobs = {}
+    for filename, path in documents:
+        job = manager.submit("script", {
+            "file_path": path,
+            "tone": tone,
+            "audio": audio,
+            "use_cache": not no_cache,
+            "alignment": alignment
+        })
+        jobs[job.id] = filename
+        manager.on_finish(
+            job.id, lambda done: loop.call_soon_threadsafe(finished.put_nowait, done)
+        )
+
+    async def events():
+        started = time.perf_counter()
+        counts = {"succeeded": 0, "failed": 0, "cancelled": 0}
+
+        yield _sse("accepted", {
+            "documents": [
+                {"job_id": job_id, "filename": filename}
+                for job_id, filename in jobs.items()
+            ]
+        })
+
+        for _ in range(len(jobs)):
+            job = await finished.get()
+            counts[job.status] += 1
+
+            yield _sse("document", {
+                "job_id": job.id,
+                "filename": jobs[job.id],
+                "status": job.status,
+                "result": job.result,
+                "error": job.error,
+                "stages": job.stages
+            })
+
+        yield _sse("done", {
+            "documents": len(jobs),
+            **counts,
+            "total_seconds": round(time.perf_counter() - started, 3)
+        })
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# ---------------- STATUS ----------------
+@router.get("/{job_id}")
+def get_job(job_id: str):
+    job = get_job_manager().get(job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job.to_dict()
+
+
+# ---------------- CANCEL ----------------
+@router.delete("/{job_id}")
+def cancel_job(job_id: str):
+    job = get_job_manager().cancel(job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job.to_dict()
@@ -1,18 +1,56 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 
+from app.artifacts import router as artifact_router
 from app.routes import router as api_router
 from app.ui_routes import router as ui_router
+from app.job_routes import router as job_router
+from app.timeline_routes import router as timeline_router
+from app.uploads import UploadLimitMiddleware
+from app.profiling import StageProfileMiddleware
+from jobs.manager import get_job_manager
+from services.readiness import start_warmup
+from services.stage_pools import shutdown_pools
+from tts.alignment_service import AlignmentBusyError, shutdown_alignment_service
 
 BASE_DIR = Path(__file__).resolve().parents[1]  # ai_studio/
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_job_manager()  # resumes persisted jobs
+    start_warmup()     # background; /health is served meanwhile
+    yield
+    shutdown_pools()
+    shutdown_alignment_service()
+
+
 app = FastAPI(
     title="AI Tutor Studio",
     description="Generate YouTube-style tutorial scripts from PDFs and PPTs",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+app.add_middleware(UploadLimitMiddleware)
+app.add_middleware(StageProfileMiddleware)
+
+
+@app.exception_handler(AlignmentBusyError)
+async def alignment_busy_handler(request: Request, exc: AlignmentBusyError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "5"}
+    )
+
+
+# MP3s: conditional + Range requests, before the generic mount below
+app.include_router(artifact_router)
+
 # ✅ THIS IS THE KEY FIX
 app.mount(
     "/static",
@@ -22,3 +60,5 @@ app.mount(
 
 app.include_router(ui_router)
 app.include_router(api_router)
+app.include_router(job_router)
+app.include_router(timeline_router)
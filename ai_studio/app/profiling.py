@@ -0,0 +1,47 @@
+from monitoring.metrics import start_profile, finish_profile, current_profile, profile_entries
+
+PROFILE_HEADER = b"x-profile"
+
+
+class StageProfileMiddleware:
+    """
+    Opt-in per-request stage breakdown: a request sent with
+    `X-Profile: 1` gets a `Server-Timing` header listing the time spent
+    in each pipeline stage (e.g. `generate;dur=2310.4;desc="1 call"`).
+
+    Streaming responses send headers first, so they only list the
+    stages finished before the first byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or dict(scope["headers"]).get(PROFILE_HEADER) != b"1":
+            await self.app(scope, receive, send)
+            return
+
+        token = start_profile()
+        profile = current_profile()
+
+        async def send_with_profile(message):
+            if message["type"] == "http.response.start":
+                timing = _server_timing(profile)
+                if timing:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", timing.encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            finish_profile(token)
+
+
+def _server_timing(profile: dict) -> str:
+    entries = sorted(profile_entries(profile).items(), key=lambda kv: -kv[1][0])
+    return ", ".join(
+        f'{stage};dur={seconds * 1000:.1f};desc="{calls} call{"s" if calls != 1 else ""}"'
+        for stage, (seconds, calls) in entries
+    )
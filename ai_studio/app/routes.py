@@ -1,17 +1,25 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse, FileResponse
-
-from services.script_service import generate_script_from_file
-from tts.audio_generator import script_to_audio
-
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
+
+from app.artifacts import serve_file
+from app.uploads import open_upload
+from services.script_service import (
+    agenerate_script_from_file,
+    stream_script_from_file,
+    script_cache
+)
+from services.readiness import readiness
+from services.stage_pools import run_stage, submit
+from llm.gemini_client import prefix_cache_stats, llm_stats
+from monitoring.metrics import render_prometheus
+from tts.audio_generator import AUDIO_DIR, script_to_audio, audio_cache_stats
+
+import json
 import os
-import uuid
+import time
 
 router = APIRouter()
 
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
 
 # ---------------- HEALTH ----------------
 @router.get("/health")
@@ -19,28 +27,71 @@ def health_check():
     return {"status": "ok"}
 
 
+@router.get("/ready")
+def readiness_check():
+    """
+    Which engines are loaded; 503 until those WARMUP asked for are warm.
+    """
+    report = readiness()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+
+# ---------------- METRICS ----------------
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Prometheus text format: per-stage timing histograms and call/error
+    counters, input sizes, plus cache and LLM client counters.
+    """
+    counters = {f"llm_{name}_total": value for name, value in llm_stats.items()}
+    counters.update({
+        f"audio_cache_{name}_total": value
+        for name, value in audio_cache_stats.items()
+    })
+    counters.update({
+        f"script_cache_{name}_total": value
+        for name, value in script_cache.stats().items()
+        if name in ("hits", "misses", "evictions")
+    })
+
+    return PlainTextResponse(
+        render_prometheus(counters),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
+# ---------------- CACHE STATS ----------------
+@router.get("/cache/stats")
+def cache_stats():
+    return {
+        "script_cache": script_cache.stats(),
+        "audio_cache": dict(audio_cache_stats),
+        "prompt_cache": prefix_cache_stats()
+    }
+
+
+# ---------------- LLM CLIENT STATS ----------------
+@router.get("/llm/stats")
+def llm_client_stats():
+    return dict(llm_stats)
+
+
 # ---------------- SCRIPT GENERATION ----------------
 @router.post("/generate-script")
 async def generate_script_api(
     file: UploadFile = File(..., description="Upload a PDF or PPTX file"),
-    tone: str = "educational"
+    tone: str = "educational",
+    no_cache: bool = False
 ):
-    filename = file.filename.lower()
-
-    if not filename.endswith((".pdf", ".pptx")):
-        raise HTTPException(
-            status_code=400,
-            detail="Only PDF and PPTX files are supported"
-        )
-
-    file_id = str(uuid.uuid4())
-    saved_path = os.path.join(UPLOAD_DIR, f"{file_id}_{file.filename}")
-
-    with open(saved_path, "wb") as f:
-        f.write(await file.read())
+    upload = await open_upload(file)
 
     try:
-        script = generate_script_from_file(saved_path)
+        script = await agenerate_script_from_file(
+            upload.source,
+            tone=tone,
+            use_cache=not no_cache,
+            filename=upload.filename
+        )
         return JSONResponse(
             status_code=200,
             content={
@@ -59,16 +110,111 @@ async def generate_script_api(
         raise HTTPException(status_code=500, detail=str(e))
 
     finally:
-        if os.path.exists(saved_path):
-            os.remove(saved_path)
+        upload.close()
+
+
+# ---------------- STREAMING SCRIPT GENERATION ----------------
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _drain_audio(pending: list, wait: bool):
+    """
+    Yields `audio` events for finished per-slide narrations, in slide
+    order; with wait=True blocks until all are done.
+    """
+    while pending and (wait or pending[0][1].done()):
+        slide_num, future = pending.pop(0)
+        try:
+            audio = future.result()
+            yield _sse("audio", {
+                "slide": slide_num,
+                "audio_url": audio["audio_url"],
+                "duration": audio["duration"],
+                "words": audio["timestamps"]
+            })
+        except Exception as e:
+            yield _sse("audio_error", {"slide": slide_num, "detail": str(e)})
+
+
+@router.post("/generate-script/stream")
+async def generate_script_stream_api(
+    file: UploadFile = File(..., description="Upload a PDF or PPTX file"),
+    tone: str = "educational",
+    no_cache: bool = False,
+    tts: bool = False,
+    alignment: str | None = None
+):
+    """
+    Server-Sent Events: one `slide` event per completed `Slide N:` block,
+    optional per-slide `audio` events (tts=true) narrated while the LLM
+    is still writing, then a `done` event with time-to-first-slide.
+    """
+    upload = await open_upload(file)
+
+    def events():
+        started = time.perf_counter()
+        first_slide = None
+        count = 0
+        pending_audio = []
+
+        try:
+            for block in stream_script_from_file(
+                upload.source,
+                tone=tone,
+                use_cache=not no_cache,
+                filename=upload.filename
+            ):
+                if first_slide is None:
+                    first_slide = round(time.perf_counter() - started, 3)
+
+                count += 1
+                yield _sse("slide", {
+                    "slide": block["slide"],
+                    "title": block["title"],
+                    "text": block["text"]
+                })
+
+                if tts:
+                    pending_audio.append((
+                        block["slide"],
+                        submit("tts", script_to_audio, block["raw"], alignment=alignment)
+                    ))
+
+                yield from _drain_audio(pending_audio, wait=False)
+
+            yield from _drain_audio(pending_audio, wait=True)
+
+            yield _sse("done", {
+                "slides": count,
+                "time_to_first_slide": first_slide,
+                "total_seconds": round(time.perf_counter() - started, 3)
+            })
+
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+
+        finally:
+            upload.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 # ---------------- AUDIO GENERATION ----------------
 @router.post("/generate-audio")
-async def generate_audio_api(script: str):
+async def generate_audio_api(
+    request: Request,
+    script: str,
+    no_cache: bool = False,
+    alignment: str | None = None
+):
     """
     Converts narration script to audio.
-    Returns the audio file directly.
+    Returns the audio file directly (Range requests supported).
     """
     if not script.strip():
         raise HTTPException(
@@ -76,10 +222,23 @@ async def generate_audio_api(script: str):
             detail="Script text cannot be empty"
         )
 
-    audio_result = script_to_audio(script)
+    try:
+        audio_result = await run_stage(
+            "tts",
+            script_to_audio,
+            script,
+            use_cache=not no_cache,
+            alignment=alignment
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return FileResponse(
-        audio_result["audio_url"],
-        media_type="audio/mpeg",
-        filename="tutorial_audio.mp3"
+    # audio_url is the public URL; serve the file behind it
+    return serve_file(
+        request,
+        os.path.join(AUDIO_DIR, f"{audio_result['audio_id']}.mp3"),
+        "audio/mpeg",
+        cache_control="no-store",
+        headers={"content-disposition": 'attachment; filename="tutorial_audio.mp3"'},
+        artifact_id=audio_result["audio_id"]
     )
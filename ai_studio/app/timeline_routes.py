@@ -0,0 +1,100 @@
+import gzip
+import os
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+
+from app.artifacts import (
+    IMMUTABLE,
+    REVALIDATE,
+    accepted_encodings,
+    artifact_etag,
+    file_etag,
+    not_modified,
+    serve_file
+)
+from services.timeline_service import (
+    EXPORT_ENCODINGS,
+    TimelineNotFound,
+    slide_index,
+    slide_words,
+    timeline_export,
+    timeline_path
+)
+
+router = APIRouter(prefix="/timeline")
+
+
+def _revalidated(request: Request, audio_id: str, variant: str, build) -> Response:
+    """
+    JSON view of a stored timeline, revalidated against the file: slide
+    offsets can be rewritten by alignment, so these go out `no-cache`
+    and a repeat visit costs a stat and a 304.
+    """
+    try:
+        etag = file_etag(os.stat(timeline_path(audio_id)), variant)
+        headers = {"etag": etag, "cache-control": REVALIDATE}
+        if not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(build(), headers=headers)
+    except (TimelineNotFound, FileNotFoundError):
+        raise HTTPException(status_code=404, detail="Timeline not found")
+
+
+# ---------------- JSON EXPORT ----------------
+# Declared before /{audio_id}, which would otherwise match "<id>.json".
+@router.api_route("/{audio_id}.json", methods=["GET", "HEAD"])
+def get_timeline_export(audio_id: str, request: Request):
+    """
+    Every word of a narration as JSON, served precompressed (brotli or
+    gzip per Accept-Encoding) and cacheable forever.
+    """
+    accepted = accepted_encodings(request)
+    encoding = next((e for e in EXPORT_ENCODINGS if e in accepted), None)
+
+    try:
+        path = timeline_export(audio_id, encoding or "gzip")
+    except TimelineNotFound:
+        raise HTTPException(status_code=404, detail="Timeline not found")
+
+    headers = {"vary": "Accept-Encoding"}
+    if encoding:
+        return serve_file(
+            request,
+            path,
+            "application/json",
+            headers={**headers, "content-encoding": encoding},
+            etag_variant=f"-{encoding}",
+            artifact_id=audio_id
+        )
+
+    # clients without gzip are rare enough to inflate per request
+    etag = artifact_etag(audio_id, os.stat(path).st_size, "-identity")
+    headers.update({"etag": etag, "cache-control": IMMUTABLE})
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    with open(path, "rb") as f:
+        body = gzip.decompress(f.read())
+    return Response(body, media_type="application/json", headers=headers)
+
+
+# ---------------- SLIDE INDEX ----------------
+@router.get("/{audio_id}")
+def get_slide_index(audio_id: str, request: Request, slides: int | None = None):
+    """
+    Slide start/end times and word offsets for a narration. `slides`
+    is the number of slides the caller displays; when it differs from
+    the stored segmentation the duration is split evenly.
+    """
+    return _revalidated(
+        request, audio_id, f"-{slides}", lambda: slide_index(audio_id, slides)
+    )
+
+
+# ---------------- PER-SLIDE WORDS ----------------
+@router.get("/{audio_id}/slides/{slide}")
+def get_slide_words(audio_id: str, slide: int, request: Request, slides: int | None = None):
+    return _revalidated(
+        request, audio_id, f"-{slides}-{slide}", lambda: slide_words(audio_id, slide, slides)
+    )
@@ -1,97 +1,18 @@
-from fastapi import APIRouter, Request, UploadFile, File, Form
+from fastapi import APIRouter, Request, UploadFile, File, Form, HTTPException
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
-from services.script_service import generate_script_from_file
+from app.uploads import open_upload
+from monitoring.metrics import timed
+from processing.script_parser import parse_slides_from_script
+from services.script_service import agenerate_script_from_file
+from services.stage_pools import run_stage
+from services.timeline_service import align_slides, slide_index
 from tts.audio_generator import script_to_audio
 
-import os
-import uuid
-import re
-
 router = APIRouter()
 templates = Jinja2Templates(directory="templates")
 
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-
-# ---------------- HELPERS ----------------
-
-SLIDE_HEADER_RE = re.compile(r"^slide\s+(\d+)\s*:?", re.IGNORECASE)
-
-
-def parse_slides_from_script(script: str) -> list[dict]:
-    slides = []
-    current = None
-
-    for raw_line in script.splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-
-        match = SLIDE_HEADER_RE.match(line)
-        if match:
-            if current:
-                slides.append(current)
-
-            slide_num = match.group(1)
-            current = {
-                "title": f"Slide {slide_num}:",
-                "text": ""
-            }
-            continue
-
-        if current:
-            current["text"] += line + " "
-
-    if current:
-        slides.append(current)
-
-    # Fallback safety
-    if not slides:
-        slides = [{
-            "title": "Slide 1:",
-            "text": script.strip()
-        }]
-
-    return slides
-
-
-def assign_slide_timings(slides: list[dict], duration: float):
-    per_slide = duration / max(len(slides), 1)
-    t = 0.0
-
-    for idx, slide in enumerate(slides):
-        slide["start"] = round(t, 2)
-        slide["end"] = round(t + per_slide, 2)
-        slide["slide_index"] = idx
-        t += per_slide
-
-
-def attach_words_to_slides(slides: list[dict], words: list[dict]):
-    """
-    Attach word-level timestamps to their corresponding slide.
-    """
-    word_idx = 0
-    total_words = len(words)
-
-    for slide in slides:
-        slide_words = []
-
-        while word_idx < total_words:
-            w = words[word_idx]
-
-            if w["start"] >= slide["start"] and w["end"] <= slide["end"]:
-                slide_words.append(w)
-                word_idx += 1
-            elif w["start"] > slide["end"]:
-                break
-            else:
-                word_idx += 1
-
-        slide["words"] = slide_words
-
 
 # ---------------- HOME ----------------
 
@@ -108,7 +29,8 @@ def home(request: Request):
 @router.post("/ui/generate", response_class=HTMLResponse)
 async def generate_script_ui(
     request: Request,
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    no_cache: bool = Form(False)
 ):
     filename = file.filename.lower()
 
@@ -121,18 +43,27 @@ async def generate_script_ui(
             }
         )
 
-    file_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4()}_{file.filename}")
-
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
+    try:
+        upload = await open_upload(file)
+    except HTTPException as e:
+        return templates.TemplateResponse(
+            "index.html",
+            {
+                "request": request,
+                "script": f"Error: {e.detail}"
+            }
+        )
 
     try:
-        script = generate_script_from_file(file_path)
+        script = await agenerate_script_from_file(
+            upload.source,
+            use_cache=not no_cache,
+            filename=upload.filename
+        )
     except Exception as e:
         script = f"Error: {str(e)}"
     finally:
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        upload.close()
 
     return templates.TemplateResponse(
         "index.html",
@@ -145,29 +76,46 @@ async def generate_script_ui(
 
 # ---------------- AUDIO + SLIDE PLAYER ----------------
 
+def _player_slides(script: str, audio_id: str) -> list[dict]:
+    """
+    Slide index: times + word offsets only; the player fetches each
+    slide's words from the timeline API when it needs them.
+    """
+    slides = parse_slides_from_script(script)
+
+    # stored per-slide offsets normally line up with the parsed slides;
+    # otherwise boundaries come from aligning the words to the slides
+    align_slides(audio_id, [s["title"] + " " + s["text"] for s in slides])
+
+    with timed("slide_index"):
+        index = slide_index(audio_id, len(slides))
+
+    for slide, entry in zip(slides, index["slides"]):
+        slide.pop("text")
+        slide.update(entry)
+
+    return slides
+
+
 @router.post("/ui/audio", response_class=HTMLResponse)
-def generate_audio_ui(
+async def generate_audio_ui(
     request: Request,
-    script: str = Form(...)
+    script: str = Form(...),
+    alignment: str | None = Form(None)
 ):
-    # 1️⃣ TTS + WORD TIMESTAMPS
-    audio_result = script_to_audio(script)
-    audio_url = audio_result["audio_url"]
-    duration = audio_result["duration"]
-    words = audio_result["timestamps"]
-
-    # 2️⃣ Slides
-    slides = parse_slides_from_script(script)
-    assign_slide_timings(slides, duration)
+    # 1️⃣ TTS + WORD TIMESTAMPS (stored as a timeline)
+    audio_result = await run_stage("tts", script_to_audio, script, alignment=alignment)
+    audio_id = audio_result["audio_id"]
 
-    # 3️⃣ Attach word timestamps
-    attach_words_to_slides(slides, words)
+    # 2️⃣ Slide index (alignment itself runs on the "cpu" pool)
+    slides = await run_stage("extract", _player_slides, script, audio_id)
 
     return templates.TemplateResponse(
         "player.html",
         {
             "request": request,
-            "audio_url": audio_url,
+            "audio_url": audio_result["audio_url"],
+            "audio_id": audio_id,
             "slides": slides
         }
     )
@@ -0,0 +1,276 @@
+import io
+import mmap
+import os
+import uuid
+import zipfile
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+from config.settings import (
+    BATCH_MAX_BYTES,
+    UPLOAD_MAX_BYTES,
+    UPLOAD_CHUNK_BYTES,
+    UPLOAD_IN_MEMORY_MAX_BYTES,
+    UPLOAD_MMAP
+)
+
+UPLOAD_DIR = "uploads"
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+SUPPORTED_EXTENSIONS = (".pdf", ".pptx")
+
+# room for multipart boundaries and form fields around the file itself
+_MULTIPART_OVERHEAD = 64 * 1024
+
+
+# body limits for multi-file endpoints; everything else gets UPLOAD_MAX_BYTES
+BODY_LIMITS = {
+    "/jobs/batch": BATCH_MAX_BYTES,
+}
+
+
+def _too_large(limit: int = UPLOAD_MAX_BYTES) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Upload exceeds the limit of {limit} bytes"
+    )
+
+
+# ---------------- EARLY REJECTION ----------------
+
+class UploadLimitMiddleware:
+    """
+    Rejects request bodies over the upload limit before they are parsed:
+    immediately when Content-Length says so, otherwise as soon as the
+    streamed body crosses the limit. Paths in `path_limits` (batch
+    uploads) get their own total; their files are still checked one by
+    one against UPLOAD_MAX_BYTES when saved.
+    """
+
+    def __init__(self, app, max_bytes: int = UPLOAD_MAX_BYTES, path_limits: dict[str, int] | None = None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_limits = BODY_LIMITS if path_limits is None else path_limits
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT"):
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes = self.path_limits.get(scope["path"], self.max_bytes)
+        limit = max_bytes + _MULTIPART_OVERHEAD
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length and int(content_length) > limit:
+            exc = _too_large(max_bytes)
+            response = JSONResponse({"detail": exc.detail}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise _too_large(max_bytes)
+
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+# ---------------- SAVING ----------------
+
+def check_upload(file: UploadFile):
+    if not file.filename or not file.filename.lower().endswith(SUPPORTED_EXTENSIONS):
+        raise HTTPException(
+            status_code=400,
+            detail="Only PDF and PPTX files are supported"
+        )
+
+    if file.size is not None and file.size > UPLOAD_MAX_BYTES:
+        raise _too_large()
+
+
+async def save_upload(
+    file: UploadFile,
+    directory: str = UPLOAD_DIR,
+    max_bytes: int = UPLOAD_MAX_BYTES
+) -> str:
+    """
+    Streams an upload to disk in UPLOAD_CHUNK_BYTES pieces, aborting
+    (and deleting the partial file) once it crosses `max_bytes`.
+    """
+    name = os.path.basename(file.filename)
+    path = os.path.join(directory, f"{uuid.uuid4()}_{name}")
+    written = 0
+
+    try:
+        with open(path, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise _too_large()
+                f.write(chunk)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+    return path
+
+
+def extract_documents(zip_path: str, directory: str, max_files: int) -> list[tuple[str, str]]:
+    """
+    Writes the PDF/PPTX members of a zip to `directory` as
+    (filename, path) pairs. Members are copied in chunks and held to
+    UPLOAD_MAX_BYTES by what they actually inflate to, not by the size
+    the archive claims.
+    """
+    documents = []
+
+    try:
+        archive = zipfile.ZipFile(zip_path)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Not a valid zip archive")
+
+    try:
+        with archive:
+            for member in archive.infolist():
+                name = os.path.basename(member.filename)
+                if (
+                    member.is_dir()
+                    or name.startswith(".")
+                    or member.filename.startswith("__MACOSX/")
+                    or not name.lower().endswith(SUPPORTED_EXTENSIONS)
+                ):
+                    continue
+
+                if len(documents) >= max_files:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Batch exceeds the limit of {max_files} documents"
+                    )
+
+                path = os.path.join(directory, f"{uuid.uuid4()}_{name}")
+                documents.append((name, path))
+                written = 0
+
+                with archive.open(member) as src, open(path, "wb") as dst:
+                    while chunk := src.read(UPLOAD_CHUNK_BYTES):
+                        written += len(chunk)
+                        if written > UPLOAD_MAX_BYTES:
+                            raise _too_large()
+                        dst.write(chunk)
+    except BaseException:
+        for _, path in documents:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    return documents
+
+
+async def read_upload(file: UploadFile, max_bytes: int = UPLOAD_MAX_BYTES) -> io.BytesIO:
+    buf = io.BytesIO()
+
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        if buf.tell() + len(chunk) > max_bytes:
+            raise _too_large()
+        buf.write(chunk)
+
+    buf.seek(0)
+    return buf
+
+
+class MappedFile(io.RawIOBase):
+    """
+    Read-only, seekable file view over an mmap. Loaders (zipfile,
+    pdfminer) need a real file object; getbuffer() exposes the mapping
+    for hashing without a copy.
+    """
+
+    def __init__(self, mapped: mmap.mmap):
+        self._mapped = mapped
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._mapped[self._pos:self._pos + len(buffer)]
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._mapped)
+        self._pos = max(offset, 0)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def getbuffer(self) -> memoryview:
+        return memoryview(self._mapped)
+
+    def close(self):
+        if not self.closed:
+            self._mapped.close()
+        super().close()
+
+
+class UploadSource:
+    """
+    A validated upload ready for the loaders.
+
+    `source` is a BytesIO for small files (never touches disk), an mmap
+    of the spooled file when UPLOAD_MMAP is set, or else a temp path.
+    close() releases buffers and deletes the temp file.
+    """
+
+    def __init__(self, filename: str, source, path: str | None = None, handle=None):
+        self.filename = filename
+        self.source = source
+        self.path = path
+        self._handle = handle
+
+    def close(self):
+        if isinstance(self.source, (io.BytesIO, MappedFile)):
+            self.source.close()
+        if self._handle is not None:
+            self._handle.close()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+async def open_upload(file: UploadFile, in_memory: bool = True) -> UploadSource:
+    check_upload(file)
+
+    if in_memory and file.size is not None and file.size <= UPLOAD_IN_MEMORY_MAX_BYTES:
+        return UploadSource(file.filename, await read_upload(file))
+
+    path = await save_upload(file)
+
+    if UPLOAD_MMAP:
+        handle = open(path, "rb")
+        try:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            handle.close()
+            os.remove(path)
+            raise
+        return UploadSource(file.filename, MappedFile(mapped), path=path, handle=handle)
+
+    return UploadSource(file.filename, path, path=path)
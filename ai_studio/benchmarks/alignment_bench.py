@@ -0,0 +1,120 @@
+# benchmarks/alignment_bench.py
+"""
+Compares the fast text-aware aligner with the Whisper path on the bundled
+static/audio + static/audio_meta corpus.
+
+The stored Whisper word timings are the reference: their words are fed
+to the fast aligner as the "known script", so every word has a 1:1
+counterpart and timing errors can be measured directly.
+
+    python -m benchmarks.alignment_bench              # fast path only
+    python -m benchmarks.alignment_bench --whisper    # also time Whisper
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+from mutagen.mp3 import MP3
+
+from storage.timeline_file import TIMELINE_SUFFIX, load_timeline_meta
+from tts.fast_aligner import align_words, speech_intervals, _decode
+
+AUDIO_DIR = "static/audio"
+META_DIR = "static/audio_meta"
+
+
+def load_corpus(limit: int | None = None) -> list[dict]:
+    corpus = []
+
+    for name in sorted(os.listdir(META_DIR)):
+        audio_id, ext = os.path.splitext(name)
+        audio_path = os.path.join(AUDIO_DIR, f"{audio_id}.mp3")
+        if ext not in (".json", TIMELINE_SUFFIX) or not os.path.exists(audio_path):
+            continue
+        if ext == ".json" and os.path.exists(os.path.join(META_DIR, audio_id + TIMELINE_SUFFIX)):
+            continue   # migrated; the timeline is the same data
+
+        words = load_timeline_meta(os.path.join(META_DIR, name))["words"]
+        if words:
+            corpus.append({"audio_id": audio_id, "path": audio_path, "words": words})
+
+    return corpus[:limit] if limit else corpus
+
+
+def _time_whisper(path: str) -> float:
+    from tts.alignment_service import _init_worker, _transcribe_words, resolve_profile
+
+    _init_worker(resolve_profile())
+    start = time.perf_counter()
+    _transcribe_words(path)
+    return time.perf_counter() - start
+
+
+def run(limit: int | None = None, whisper: bool = False) -> dict:
+    files = []
+    all_start_err = []
+
+    for item in load_corpus(limit):
+        ref = item["words"]
+        duration = MP3(item["path"]).info.length
+
+        t0 = time.perf_counter()
+        intervals = speech_intervals(_decode(item["path"]))
+        aligned = align_words([w["word"] for w in ref], duration, intervals)
+        fast_seconds = time.perf_counter() - t0
+
+        start_err = np.abs(
+            np.array([w["start"] for w in aligned]) - np.array([w["start"] for w in ref])
+        )
+        end_err = np.abs(
+            np.array([w["end"] for w in aligned]) - np.array([w["end"] for w in ref])
+        )
+        all_start_err.extend(start_err.tolist())
+
+        row = {
+            "audio_id": item["audio_id"],
+            "audio_seconds": round(duration, 2),
+            "words": len(ref),
+            "fast_seconds": round(fast_seconds, 4),
+            "start_mae": round(float(start_err.mean()), 3),
+            "end_mae": round(float(end_err.mean()), 3),
+            "within_250ms": round(float((start_err <= 0.25).mean()), 3),
+        }
+
+        if whisper:
+            row["whisper_seconds"] = round(_time_whisper(item["path"]), 3)
+
+        files.append(row)
+        print(json.dumps(row), file=sys.stderr)
+
+    summary = {
+        "files": len(files),
+        "fast_seconds_mean": round(statistics.mean(r["fast_seconds"] for r in files), 4),
+        "fast_realtime_factor": round(
+            sum(r["fast_seconds"] for r in files) / sum(r["audio_seconds"] for r in files), 5
+        ),
+        "start_mae": round(statistics.mean(all_start_err), 3),
+        "start_median_error": round(statistics.median(all_start_err), 3),
+        "start_p90_error": round(float(np.percentile(all_start_err, 90)), 3),
+        "within_250ms": round(float(np.mean(np.array(all_start_err) <= 0.25)), 3),
+    }
+
+    if whisper:
+        summary["whisper_seconds_mean"] = round(
+            statistics.mean(r["whisper_seconds"] for r in files), 3
+        )
+
+    return {"summary": summary, "files": files}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--whisper", action="store_true", help="also time the Whisper path")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.limit, args.whisper)["summary"], indent=2))
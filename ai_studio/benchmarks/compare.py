@@ -0,0 +1,56 @@
+# benchmarks/compare.py
+"""
+Diffs two stage_bench or load_bench JSON summaries (e.g. before/after a
+change) and prints the relative change of every timing.
+
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+
+TIMING_KEYS = ("median_ms", "p50_ms", "p95_ms", "p99_ms", "rps")
+
+
+def _timings(summary: dict, prefix: str = "") -> dict[str, float]:
+    found = {}
+
+    for key, value in summary.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            found.update(_timings(value, name + "."))
+        elif key in TIMING_KEYS or key == "peak_rss_mb":
+            found[name] = value
+
+    return found
+
+
+def compare(before: dict, after: dict) -> list[dict]:
+    old, new = _timings(before), _timings(after)
+    rows = []
+
+    for name in sorted(old.keys() & new.keys()):
+        change = (new[name] - old[name]) / old[name] * 100 if old[name] else None
+        rows.append({
+            "metric": name,
+            "before": old[name],
+            "after": new[name],
+            "change_pct": round(change, 1) if change is not None else None
+        })
+
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    for row in compare(before, after):
+        change = "n/a" if row["change_pct"] is None else f"{row['change_pct']:+.1f}%"
+        print(f"{row['metric']:<56} {row['before']:>12} {row['after']:>12} {change:>9}")
@@ -0,0 +1,105 @@
+# benchmarks/import_bench.py
+"""
+Cold import time of the app, with a budget to catch startup regressions.
+
+Each run imports `app.main` in a fresh interpreter (no GEMINI_API_KEY
+needed) and reports the wall time, the slowest modules by cumulative
+import time (`python -X importtime`), and any heavy engine that got
+imported eagerly. Exits non-zero when the median is over --budget or a
+lazy engine was imported, so it can gate CI (tests/test_import_time.py
+runs the same checks).
+
+    python -m benchmarks.import_bench
+    python -m benchmarks.import_bench --runs 5 --budget 1.5 --top 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+AI_STUDIO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# median seconds to import app.main
+DEFAULT_BUDGET = 1.5
+
+# loaded on first use or by WARMUP, never by importing the app
+LAZY_MODULES = (
+    "google.genai",
+    "pdfplumber",
+    "pptx",
+    "gtts",
+    "faster_whisper",
+    "ctranslate2",
+    "torch",
+)
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    "seconds": elapsed,
+    "eager": [m for m in %r if m in sys.modules]
+}))
+""" % (LAZY_MODULES,)
+
+
+def _run_once() -> dict:
+    env = {k: v for k, v in os.environ.items() if k not in ("GEMINI_API_KEY", "WARMUP")}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=AI_STUDIO_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    modules = []
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.append((int(cumulative), name.strip()))
+
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["modules"] = modules
+    return result
+
+
+def run(runs: int, top: int) -> dict:
+    results = [_run_once() for _ in range(runs)]
+    slowest = sorted(results[-1]["modules"], reverse=True)[:top]
+
+    return {
+        "runs": runs,
+        "median_seconds": round(statistics.median(r["seconds"] for r in results), 3),
+        "max_seconds": round(max(r["seconds"] for r in results), 3),
+        "eager_heavy_modules": sorted({m for r in results for m in r["eager"]}),
+        "slowest_modules_ms": {name: round(us / 1000, 1) for us, name in slowest}
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="Median import seconds allowed")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    summary = run(args.runs, args.top)
+    print(json.dumps(summary, indent=2))
+
+    failures = []
+    if summary["median_seconds"] > args.budget:
+        failures.append(f"import took {summary['median_seconds']} s (budget {args.budget} s)")
+    if summary["eager_heavy_modules"]:
+        failures.append(f"imported eagerly: {', '.join(summary['eager_heavy_modules'])}")
+
+    if failures:
+        print("FAIL: " + "; ".join(failures), file=sys.stderr)
+        sys.exit(1)
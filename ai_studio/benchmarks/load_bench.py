@@ -0,0 +1,188 @@
+# benchmarks/load_bench.py
+"""
+Concurrent load against the API with the offline stand-ins: latency
+percentiles, throughput and errors per endpoint and concurrency level,
+plus peak memory.
+
+By default the app runs in-process behind httpx's ASGI transport (no
+server needed). To measure a real server, start one with
+
+    python -m benchmarks.serve --port 8765
+
+and pass --url http://127.0.0.1:8765 (peak RSS is then read from the
+server's /proc entry when --pid is given).
+
+    python -m benchmarks.load_bench
+    python -m benchmarks.load_bench --concurrency 1 4 16 --requests 64 --out after.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks import stand_ins
+
+ENDPOINTS = ("health", "generate_script", "generate_script_stream", "generate_audio")
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    idx = min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[idx]
+
+
+def _peak_rss_mb(pid: int | None) -> float:
+    if pid is None:
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    return 0.0
+
+
+def _request_factory(endpoint: str, deck: bytes, script: str):
+    files = lambda: {"file": ("bench.pptx", deck)}
+
+    if endpoint == "health":
+        return lambda client: client.get("/health")
+    if endpoint == "generate_script":
+        return lambda client: client.post(
+            "/generate-script", params={"no_cache": True}, files=files()
+        )
+    if endpoint == "generate_script_stream":
+        return lambda client: client.post(
+            "/generate-script/stream", params={"no_cache": True}, files=files()
+        )
+    if endpoint == "generate_audio":
+        return lambda client: client.post(
+            "/generate-audio", params={"script": script, "no_cache": True, "alignment": "fast"}
+        )
+    raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+async def _drive(client: httpx.AsyncClient, send, concurrency: int, requests: int) -> dict:
+    latencies = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                response = await send(client)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / wall, 2),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2)
+    }
+
+
+async def run(
+    endpoints: list[str],
+    concurrency: list[int],
+    requests: int,
+    slides: int,
+    url: str | None,
+    pid: int | None
+) -> dict:
+    from benchmarks.synthetic import make_pptx
+
+    deck = make_pptx(slides)
+    script = stand_ins.narrate(
+        "".join(f"\nSlide {i} CONTENT:\nnarration for slide {i}\n" for i in range(1, 4))
+        + "FINAL REMINDERS:"
+    )
+
+    if url:
+        transport, base_url = None, url
+    else:
+        from app.main import app
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        base_url = "http://bench"
+
+    results = {}
+
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=300) as client:
+        for endpoint in endpoints:
+            send = _request_factory(endpoint, deck, script)
+            await send(client)   # warm-up
+
+            for level in concurrency:
+                row = await _drive(client, send, level, max(requests, level))
+                results.setdefault(endpoint, {})[str(level)] = row
+                print(
+                    f"{endpoint:<24} c={level:<3} p50={row['p50_ms']:>9.2f} ms "
+                    f"p99={row['p99_ms']:>9.2f} ms rps={row['rps']:>8.2f} errors={row['errors']}",
+                    file=sys.stderr
+                )
+
+    return {"endpoints": results, "peak_rss_mb": _peak_rss_mb(pid)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--endpoints", nargs="+", default=list(ENDPOINTS), choices=ENDPOINTS)
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 2, 4, 8, 16])
+    parser.add_argument("--requests", type=int, default=32, help="Requests per level")
+    parser.add_argument("--slides", type=int, default=10, help="Synthetic deck size")
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--tts-latency", type=float, default=0.2)
+    parser.add_argument("--url", help="Benchmark a running server instead of in-process")
+    parser.add_argument("--pid", type=int, help="Server pid, for peak RSS with --url")
+    parser.add_argument("--out", help="Also write the JSON summary here")
+    args = parser.parse_args()
+
+    if args.out:
+        args.out = os.path.abspath(args.out)
+
+    if not args.url:
+        # the app resolves templates/ and static/ relative to the cwd;
+        # run from a scratch copy so caches and audio stay out of the tree
+        workdir = Path(tempfile.mkdtemp(prefix="load_bench_"))
+        os.symlink(stand_ins.BASE_DIR / "templates", workdir / "templates")
+        (workdir / "static/audio").mkdir(parents=True)
+        (workdir / "static/audio_meta").mkdir(parents=True)
+        os.chdir(workdir)
+
+        stand_ins.install(args.llm_latency, args.tts_latency)
+
+    summary = asyncio.run(run(
+        args.endpoints, args.concurrency, args.requests, args.slides, args.url, args.pid
+    ))
+    summary["config"] = {
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "slides": args.slides,
+        "llm_latency": args.llm_latency,
+        "tts_latency": args.tts_latency,
+        "url": args.url
+    }
+
+    output = json.dumps(summary, indent=2)
+    print(output)
+
+    if args.out:
+        Path(args.out).write_text(output)
@@ -0,0 +1,24 @@
+# benchmarks/serve.py
+"""
+Runs the app under uvicorn with the offline stand-ins installed; used by
+the load benchmark.
+
+    python -m benchmarks.serve --port 8765 --llm-latency 0.5 --tts-latency 0.2
+"""
+import argparse
+
+from benchmarks.stand_ins import install
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--tts-latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    install(args.llm_latency, args.tts_latency)
+
+    import uvicorn
+    from app.main import app
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,153 @@
+# benchmarks/slide_bench.py
+"""
+Slide boundary accuracy of transcript→script alignment vs. the even
+split (duration / slides), on the static/audio_meta corpus.
+
+Each stored transcript is used as one slide: K of them are laid end to
+end to form a lecture, so the true slide starts are known exactly. The
+"script" for each slide is the transcript text with deterministic edits
+(dropped, substituted and inserted words, number/punctuation changes)
+standing in for the differences between what the LLM wrote and what
+Whisper heard.
+
+    python -m benchmarks.slide_bench
+    python -m benchmarks.slide_bench --slides 8 --noise 0.15 --scale 4
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+from processing.slide_alignment import slide_boundaries
+from processing.word_timeline import WordTimeline
+from services.timeline_service import assign_slide_timings
+from storage.timeline_file import TIMELINE_SUFFIX, load_timeline_meta
+
+META_DIR = "static/audio_meta"
+
+_FILLER = "the a of this that which model data system layer value".split()
+
+
+def load_transcripts() -> list[list[dict]]:
+    transcripts = []
+
+    for name in sorted(os.listdir(META_DIR)):
+        if os.path.splitext(name)[1] in (".json", TIMELINE_SUFFIX):
+            words = load_timeline_meta(os.path.join(META_DIR, name))["words"]
+            if words:
+                transcripts.append(words)
+
+    return transcripts
+
+
+def _script_text(words: list[dict], rng: random.Random, noise: float) -> str:
+    out = []
+
+    for w in words:
+        r = rng.random()
+        if r < noise / 3:
+            continue                              # dropped by ASR
+        if r < 2 * noise / 3:
+            out.append(rng.choice(_FILLER))       # misheard
+            continue
+        out.append(w["word"])
+        if r < noise:
+            out.append(rng.choice(_FILLER))       # not in the audio
+
+    return " ".join(out)
+
+
+def build_lecture(transcripts: list[list[dict]], rng: random.Random, noise: float):
+    """
+    → (slide texts, lecture words, duration, true slide starts)
+    """
+    texts, words, truth = [], [], []
+    offset = 0.0
+
+    for transcript in transcripts:
+        base = transcript[0]["start"]
+        truth.append(round(offset, 2))
+        texts.append(f"Slide {len(texts) + 1}: " + _script_text(transcript, rng, noise))
+
+        for w in transcript:
+            words.append({
+                "word": w["word"],
+                "start": round(w["start"] - base + offset, 2),
+                "end": round(w["end"] - base + offset, 2)
+            })
+
+        offset = words[-1]["end"] + 0.6           # pause between slides
+
+    return texts, words, round(offset, 2), truth
+
+
+def _boundary_errors(predicted: list[dict], truth: list[float]) -> list[float]:
+    # slide 0 always starts at 0; score the K-1 real boundaries
+    return [abs(p["start"] - t) for p, t in zip(predicted[1:], truth[1:])]
+
+
+def run(slides: int, noise: float, trials: int, scale: int, seed: int) -> dict:
+    transcripts = load_transcripts()
+    rng = random.Random(seed)
+
+    even_err, aligned_err = [], []
+    align_seconds = []
+
+    for _ in range(trials):
+        picked = rng.sample(transcripts, min(slides, len(transcripts)))
+        texts, words, duration, truth = build_lecture(picked, rng, noise)
+
+        even = [{} for _ in texts]
+        assign_slide_timings(even, duration)
+
+        start = time.perf_counter()
+        aligned = slide_boundaries(texts, WordTimeline.from_words(words), duration)
+        align_seconds.append(time.perf_counter() - start)
+
+        even_err += _boundary_errors(even, truth)
+        aligned_err += _boundary_errors(aligned, truth)
+
+    # scaling: the whole corpus as one lecture, repeated `scale` times
+    texts, words, duration, _ = build_lecture(transcripts * scale, rng, noise)
+    start = time.perf_counter()
+    slide_boundaries(texts, WordTimeline.from_words(words), duration)
+    long_seconds = time.perf_counter() - start
+
+    summary = {
+        "corpus_files": len(transcripts),
+        "slides_per_lecture": min(slides, len(transcripts)),
+        "trials": trials,
+        "noise": noise,
+        "even_split_boundary_mae": round(statistics.mean(even_err), 3),
+        "even_split_boundary_max": round(max(even_err), 3),
+        "aligned_boundary_mae": round(statistics.mean(aligned_err), 3),
+        "aligned_boundary_max": round(max(aligned_err), 3),
+        "aligned_within_0.5s": round(sum(e <= 0.5 for e in aligned_err) / len(aligned_err), 3),
+        "align_ms_mean": round(statistics.mean(align_seconds) * 1000, 2),
+        "long_lecture_words": len(words),
+        "long_lecture_slides": len(texts),
+        "long_lecture_align_ms": round(long_seconds * 1000, 2)
+    }
+
+    print(
+        f"even split MAE {summary['even_split_boundary_mae']} s, "
+        f"aligned MAE {summary['aligned_boundary_mae']} s",
+        file=sys.stderr
+    )
+
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slides", type=int, default=6, help="Transcripts per lecture")
+    parser.add_argument("--noise", type=float, default=0.1, help="Fraction of script words edited")
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--scale", type=int, default=4, help="Corpus repeats for the timing run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.slides, args.noise, args.trials, args.scale, args.seed), indent=2))
@@ -0,0 +1,166 @@
+# benchmarks/stage_bench.py
+"""
+Per-stage micro-benchmarks of the pipeline, fully offline: the Gemini
+client and gTTS are replaced by the deterministic stand-ins in
+benchmarks/stand_ins.py, so only our own code is measured (plus the
+configured stand-in latencies).
+
+Stages: load (reference deck, synthetic PPTX, synthetic PDF with a cold
+and a warm page cache), clean, chunk, generate, synthesize, fast_align
+and attach_words. Whisper is not run here; see alignment_bench.
+
+    python -m benchmarks.stage_bench
+    python -m benchmarks.stage_bench --slides 200 --pages 200 --repeat 5 --out before.json
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import stand_ins
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+REFERENCE_DECK = BASE_DIR / "assets/examples/reference_ppt.pptx"
+
+
+def _measure(fn, repeat: int) -> dict:
+    times = []
+    result = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+
+    return {
+        "runs": repeat,
+        "median_ms": round(statistics.median(times) * 1000, 2),
+        "min_ms": round(min(times) * 1000, 2),
+        "max_ms": round(max(times) * 1000, 2),
+        "_result": result
+    }
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def run(slides: int, pages: int, repeat: int, llm_latency: float, tts_latency: float) -> dict:
+    stand_ins.install(llm_latency, tts_latency)
+
+    # imported after install() so settings see the offline defaults
+    from benchmarks.synthetic import make_pdf, make_pptx
+    from llm.script_generator import generate_slidewise_script
+    from loaders.pdf_loader import _count_key, _page_key, extract_pdf_pages, page_cache
+    from loaders.ppt_loader import load_ppt
+    from processing.chunker import chunk_units
+    from processing.cleaner import clean_units
+    from processing.script_parser import parse_slides_from_script
+    from services.script_service import iter_source_units, load_slides
+    from services.timeline_service import assign_slide_timings, attach_words_to_slides
+    from storage.disk_cache import file_digest
+    from tts.audio_generator import synthesize_slides
+    from tts.fast_aligner import fast_align
+
+    workdir = Path(tempfile.mkdtemp(prefix="stage_bench_"))
+    deck_path = workdir / "synthetic.pptx"
+    pdf_path = workdir / "synthetic.pdf"
+    deck_path.write_bytes(make_pptx(slides))
+    pdf_path.write_bytes(make_pdf(pages))
+
+    results = {}
+
+    def record(name: str, fn, runs: int = repeat):
+        measured = _measure(fn, runs)
+        print(f"{name:<24} {measured['median_ms']:>10.2f} ms", file=sys.stderr)
+        results[name] = {k: v for k, v in measured.items() if k != "_result"}
+        return measured["_result"]
+
+    # ---------- LOAD ----------
+    record("load_reference_ppt", lambda: load_ppt(str(REFERENCE_DECK)))
+    record("load_pptx", lambda: load_ppt(str(deck_path)))
+
+    pdf_digest = file_digest(str(pdf_path))
+
+    def load_pdf_cold():
+        for idx in range(pages):
+            page_cache.delete(_page_key(pdf_digest, idx))
+        page_cache.delete(_count_key(pdf_digest))
+        return extract_pdf_pages(str(pdf_path))
+
+    record("load_pdf_cold", load_pdf_cold)
+    record("load_pdf_warm", lambda: extract_pdf_pages(str(pdf_path)))
+
+    # ---------- CLEAN + CHUNK ----------
+    units = list(iter_source_units(str(deck_path), "synthetic.pptx"))
+    cleaned = record("clean", lambda: list(clean_units(units)))
+    record("chunk", lambda: list(chunk_units(cleaned)))
+
+    # ---------- GENERATE ----------
+    slide_records = load_slides(str(deck_path), "synthetic.pptx")
+    script = record(
+        "generate",
+        lambda: generate_slidewise_script(slide_records, tone="educational")
+    )
+
+    # ---------- SYNTHESIZE + ALIGN ----------
+    audio_path = str(workdir / "narration.mp3")
+    duration, offsets = record("synthesize", lambda: synthesize_slides(script, audio_path))
+    words = record("fast_align", lambda: fast_align(audio_path, script, duration, segments=offsets))
+
+    def attach():
+        parsed = parse_slides_from_script(script)
+        assign_slide_timings(parsed, duration)
+        attach_words_to_slides(parsed, words)
+        return parsed
+
+    record("attach_words", attach)
+
+    return {
+        "config": {
+            "slides": slides,
+            "pages": pages,
+            "repeat": repeat,
+            "llm_latency": llm_latency,
+            "tts_latency": tts_latency
+        },
+        "sizes": {
+            "script_words": len(script.split()),
+            "audio_seconds": duration,
+            "aligned_words": len(words)
+        },
+        "stages": results,
+        "peak_rss_mb": _peak_rss_mb()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slides", type=int, default=60, help="Synthetic deck size")
+    parser.add_argument("--pages", type=int, default=60, help="Synthetic PDF size")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.0)
+    parser.add_argument("--tts-latency", type=float, default=0.0)
+    parser.add_argument("--out", help="Also write the JSON summary here")
+    args = parser.parse_args()
+
+    if args.out:
+        args.out = os.path.abspath(args.out)
+
+    # keep caches and generated audio out of the source tree
+    os.chdir(tempfile.mkdtemp(prefix="stage_bench_cwd_"))
+    os.makedirs("static/audio", exist_ok=True)
+    os.makedirs("static/audio_meta", exist_ok=True)
+
+    summary = run(args.slides, args.pages, args.repeat, args.llm_latency, args.tts_latency)
+    output = json.dumps(summary, indent=2)
+    print(output)
+
+    if args.out:
+        Path(args.out).write_text(output)
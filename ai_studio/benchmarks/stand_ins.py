@@ -0,0 +1,140 @@
+# benchmarks/stand_ins.py
+"""
+Deterministic local stand-ins for the two network dependencies, so the
+pipeline can be measured without Gemini quota or Google TTS:
+
+- the Gemini client answers every slide-wise prompt with one narration
+  block per input slide, after a configurable latency;
+- gTTS "synthesizes" by replaying a recorded MP3 from static/audio,
+  picked by a hash of the text, after a configurable latency.
+
+install() must run before the app modules are imported.
+"""
+import asyncio
+import hashlib
+import os
+import re
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+RECORDED_AUDIO_DIR = BASE_DIR / "static/audio"
+
+_SLIDE_CONTENT_RE = re.compile(
+    r"^Slide (\d+) CONTENT:\n(.*?)(?=^Slide \d+ CONTEXT|^Slide \d+ CONTENT:|^FINAL REMINDERS:)",
+    re.MULTILINE | re.DOTALL
+)
+
+
+# ---------------- GEMINI ----------------
+
+def narrate(prompt: str, words_per_slide: int = 60) -> str:
+    """
+    The stand-in's answer: `Slide i:` + the first words of each slide's
+    content, so output size tracks input size.
+    """
+    blocks = []
+
+    for number, content in _SLIDE_CONTENT_RE.findall(prompt):
+        words = content.split()[:words_per_slide]
+        blocks.append(f"Slide {number}:\nThis slide explains {' '.join(words)}.")
+
+    return "\n\n".join(blocks) or "Slide 1:\nThis slide explains the material."
+
+
+class _Response:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _Models:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate_content(self, model, contents, config=None):
+        time.sleep(self.latency)
+        return _Response(narrate(contents))
+
+    def generate_content_stream(self, model, contents, config=None):
+        blocks = narrate(contents).split("\n\n")
+        for block in blocks:
+            time.sleep(self.latency / len(blocks))
+            yield _Response(block + "\n\n")
+
+
+class _AsyncModels:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def generate_content(self, model, contents, config=None):
+        await asyncio.sleep(self.latency)
+        return _Response(narrate(contents))
+
+
+class _Caches:
+    def create(self, model, config):
+        raise RuntimeError("context caching is not available offline")
+
+
+class FakeGeminiClient:
+    def __init__(self, latency: float = 0.5):
+        self.models = _Models(latency)
+        self.aio = type("Aio", (), {"models": _AsyncModels(latency)})()
+        self.caches = _Caches()
+
+
+# ---------------- gTTS ----------------
+
+def recorded_mp3s() -> list[Path]:
+    paths = sorted(RECORDED_AUDIO_DIR.glob("*.mp3"))
+    if not paths:
+        raise RuntimeError(f"No recorded MP3s found in {RECORDED_AUDIO_DIR}")
+    return paths
+
+
+class FakeTTS:
+    """
+    Drop-in for gtts.gTTS (constructor + write_to_fp/save).
+    """
+    latency = 0.2
+    _recordings: list[Path] = []
+
+    def __init__(self, text: str, **kwargs):
+        self.text = text
+
+    def _recording(self) -> bytes:
+        digest = int(hashlib.sha256(self.text.encode("utf-8")).hexdigest(), 16)
+        return self._recordings[digest % len(self._recordings)].read_bytes()
+
+    def write_to_fp(self, fp):
+        time.sleep(self.latency)
+        fp.write(self._recording())
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            self.write_to_fp(f)
+
+
+# ---------------- INSTALL ----------------
+
+def install(llm_latency: float = 0.5, tts_latency: float = 0.2):
+    """
+    Patches the Gemini client and gTTS in-process. Also defaults the
+    settings that would otherwise reach the network or throttle.
+    """
+    os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+    os.environ.setdefault("PROMPT_CACHE", "local")
+    os.environ.setdefault("GEMINI_RPM", "0")
+    os.environ.setdefault("ALIGNMENT_MODE", "fast")
+
+    FakeTTS.latency = tts_latency
+    FakeTTS._recordings = recorded_mp3s()
+
+    import gtts
+    gtts.gTTS = FakeTTS
+
+    import llm.gemini_client as gemini_client
+    gemini_client.client = FakeGeminiClient(llm_latency)
+
+    import tts.audio_generator as audio_generator
+    audio_generator.gTTS = FakeTTS
@@ -0,0 +1,96 @@
+# benchmarks/synthetic.py
+"""
+Deterministic synthetic documents for benchmarks: decks and PDFs of any
+size, built from a fixed vocabulary so runs are comparable.
+"""
+import io
+import random
+
+from pptx import Presentation
+
+_VOCABULARY = (
+    "model training data pipeline gradient descent loss function network "
+    "layer batch epoch feature vector embedding attention transformer "
+    "storage compute cluster latency throughput inference deployment "
+    "monitoring evaluation accuracy precision recall dataset label sample "
+    "optimizer learning rate regularization dropout convolution kernel"
+).split()
+
+
+def _sentences(rng: random.Random, words: int) -> str:
+    out = []
+    while words > 0:
+        length = min(words, rng.randint(8, 18))
+        sentence = " ".join(rng.choice(_VOCABULARY) for _ in range(length))
+        out.append(sentence.capitalize() + ".")
+        words -= length
+    return " ".join(out)
+
+
+def make_pptx(slides: int, words_per_slide: int = 80, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    prs = Presentation()
+    layout = prs.slide_layouts[1]   # title + content
+
+    for idx in range(slides):
+        slide = prs.slides.add_slide(layout)
+        slide.shapes.title.text = f"Topic {idx + 1}: {rng.choice(_VOCABULARY).title()}"
+        slide.placeholders[1].text = _sentences(rng, words_per_slide)
+
+    buf = io.BytesIO()
+    prs.save(buf)
+    return buf.getvalue()
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: int, words_per_page: int = 250, seed: int = 0) -> bytes:
+    """
+    A plain PDF with one text stream per page (Helvetica, wrapped lines),
+    written directly so no PDF library is needed.
+    """
+    rng = random.Random(seed)
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+
+    for idx in range(pages):
+        page_id, content_id = 4 + 2 * idx, 5 + 2 * idx
+        kids.append(f"{page_id} 0 R")
+
+        words = _sentences(rng, words_per_page).split()
+        lines = [" ".join(words[i:i + 12]) for i in range(0, len(words), 12)]
+        ops = ["BT", "/F1 11 Tf", "14 TL", "56 760 Td"]
+        ops += [f"({_pdf_escape(line)}) Tj T*" for line in lines]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode("latin-1")
+        objects[content_id] = (
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>".encode("latin-1")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n" % obj_id + objects[obj_id] + b"\nendobj\n"
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for obj_id in sorted(objects):
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref
+    )
+
+    return bytes(out)
@@ -0,0 +1,127 @@
+# benchmarks/whisper_bench.py
+"""
+Whisper alignment throughput per profile, on the static/audio corpus.
+
+Every profile gets a fresh AlignmentService; `--clients` threads then
+align the corpus files concurrently, as simultaneous requests would.
+Throughput is audio seconds aligned per wall second (and files per
+second); latency is per request, including time spent waiting to be
+batched. Start-time error is measured against the stored timelines
+(base model, beam 5), so it shows drift between profiles rather than
+absolute accuracy.
+
+Needs the Whisper weights for each profile's model size (downloaded on
+first use).
+
+    python -m benchmarks.whisper_bench
+    python -m benchmarks.whisper_bench --profiles balanced throughput --clients 1 8
+    python -m benchmarks.whisper_bench --no-batch      # batched profiles, unbatched
+"""
+import argparse
+import dataclasses
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from mutagen.mp3 import MP3
+
+from benchmarks.alignment_bench import load_corpus
+from config.settings import WHISPER_PROFILES
+from tts.alignment_service import AlignmentService, resolve_profile
+
+
+def _start_mae(words: list[dict], ref: list[dict]) -> float | None:
+    # positional match; only meaningful when the word counts agree
+    if not words or len(words) != len(ref):
+        return None
+    return float(np.mean(np.abs(
+        np.array([w["start"] for w in words]) - np.array([w["start"] for w in ref])
+    )))
+
+
+def run_profile(profile_name: str, corpus: list[dict], clients: int, replicas: int, batched: bool) -> dict:
+    profile = resolve_profile(profile_name)
+    if not batched:
+        profile = dataclasses.replace(profile, batch_size=1)
+
+    service = AlignmentService(
+        replicas=replicas,
+        max_pending=max(clients, replicas),
+        profile=profile
+    )
+
+    try:
+        # load the replicas before timing
+        service.align(corpus[0]["path"])
+
+        latencies = []
+
+        def align(item: dict):
+            start = time.perf_counter()
+            words = service.align(item["path"])
+            latencies.append(time.perf_counter() - start)
+            return _start_mae(words, item["words"])
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            errors = list(pool.map(align, corpus))
+        wall = time.perf_counter() - started
+
+        stats = service.stats()
+    finally:
+        service.shutdown()
+
+    audio_seconds = sum(item["audio_seconds"] for item in corpus)
+    comparable = [e for e in errors if e is not None]
+
+    return {
+        "profile": profile.name,
+        "version": profile.version,
+        "clients": clients,
+        "replicas": replicas,
+        "files": len(corpus),
+        "wall_seconds": round(wall, 3),
+        "files_per_second": round(len(corpus) / wall, 3),
+        "audio_seconds_per_second": round(audio_seconds / wall, 2),
+        "latency_p50": round(statistics.median(latencies), 3),
+        "latency_max": round(max(latencies), 3),
+        "mean_files_per_batch": stats["mean_files_per_batch"],
+        "start_mae_vs_stored": round(statistics.mean(comparable), 3) if comparable else None,
+        "word_count_matches": len(comparable)
+    }
+
+
+def run(profiles: list[str], clients: list[int], replicas: int, batched: bool, limit: int | None) -> list[dict]:
+    corpus = load_corpus(limit)
+    for item in corpus:
+        item["audio_seconds"] = MP3(item["path"]).info.length
+
+    results = []
+    for profile_name in profiles:
+        for count in clients:
+            row = run_profile(profile_name, corpus, count, replicas, batched)
+            print(json.dumps(row), file=sys.stderr)
+            results.append(row)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", nargs="+", default=list(WHISPER_PROFILES))
+    parser.add_argument("--clients", nargs="+", type=int, default=[1, 8], help="Concurrent requests")
+    parser.add_argument("--replicas", type=int, default=1)
+    parser.add_argument("--no-batch", action="store_true", help="Force the per-file path")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--out", default=None, help="Also write the results here")
+    args = parser.parse_args()
+
+    results = run(args.profiles, args.clients, args.replicas, not args.no_batch, args.limit)
+    print(json.dumps(results, indent=2))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
@@ -7,16 +7,123 @@ BASE_DIR = Path(__file__).resolve().parent
 ENV_PATH = BASE_DIR / ".env"
 load_dotenv(ENV_PATH)
 
-# API Keys
+# API Keys (the Gemini key is checked when the client is first used,
+# so the app still starts and reports readiness without one)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 # Model config (future-proof)
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "models/gemini-2.5-flash")
 
-# Processing defaults
+# Gemini client resilience
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", 60))                 # 0 = no rate limit
+GEMINI_BURST = int(os.getenv("GEMINI_BURST", 5))
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", 8))      # in-flight calls, 0 = unbounded
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", 120))   # per-call deadline
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", 4))
+GEMINI_BACKOFF_BASE = float(os.getenv("GEMINI_BACKOFF_BASE", 0.5))
+GEMINI_BACKOFF_MAX = float(os.getenv("GEMINI_BACKOFF_MAX", 16))
+
+# Uploads
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 256 * 1024 * 1024))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", 1024 * 1024))
+UPLOAD_IN_MEMORY_MAX_BYTES = int(os.getenv("UPLOAD_IN_MEMORY_MAX_BYTES", 8 * 1024 * 1024))
+UPLOAD_MMAP = os.getenv("UPLOAD_MMAP", "0") == "1"   # hand loaders an mmap, not a path
+
+# PDF extraction (page ranges on the "cpu" stage pool + per-page text cache)
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", 8))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 16))
+PDF_PAGE_CACHE_ENABLED = os.getenv("PDF_PAGE_CACHE_ENABLED", "1") == "1"
+PDF_PAGE_CACHE_DIR = os.getenv("PDF_PAGE_CACHE_DIR", "cache/pdf_pages")
+PDF_PAGE_CACHE_MAX_BYTES = int(os.getenv("PDF_PAGE_CACHE_MAX_BYTES", 128 * 1024 * 1024))
+
+# Processing defaults (tokens; a slide is only split when over MAX_CHUNK_SIZE,
+# and CHUNK_OVERLAP tokens of the previous part are passed as context)
 MAX_CHUNK_SIZE = int(os.getenv("MAX_CHUNK_SIZE", 800))
 CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", 100))
+TOKENIZER = os.getenv("TOKENIZER", "estimate")        # "estimate" | "gemini"
+TOKENIZER_MODEL = os.getenv("TOKENIZER_MODEL", "gemini-2.5-flash")
+
+# Static prompt prefix caching: "gemini" (explicit context cache),
+# "local" (in-process stand-in) or "off"
+PROMPT_CACHE = os.getenv("PROMPT_CACHE", "gemini")
+PROMPT_CACHE_TTL_SECONDS = int(os.getenv("PROMPT_CACHE_TTL_SECONDS", 3600))
+PROMPT_CACHE_MIN_TOKENS = int(os.getenv("PROMPT_CACHE_MIN_TOKENS", 1024))   # API minimum
+PROMPT_CACHE_RETRY_SECONDS = float(os.getenv("PROMPT_CACHE_RETRY_SECONDS", 60))  # after a failed upload
+
+# Batched (map-reduce) script generation for large decks
+SCRIPT_BATCH_THRESHOLD = int(os.getenv("SCRIPT_BATCH_THRESHOLD", 20))       # slides
+SCRIPT_BATCH_MAX_WORDS = int(os.getenv("SCRIPT_BATCH_MAX_WORDS", 2500))     # per group
+SCRIPT_BATCH_CONCURRENCY = int(os.getenv("SCRIPT_BATCH_CONCURRENCY", 4))
+SCRIPT_BATCH_RETRIES = int(os.getenv("SCRIPT_BATCH_RETRIES", 2))
+
+# Script cache (keyed by upload hash + tone + model + prompt version)
+SCRIPT_CACHE_ENABLED = os.getenv("SCRIPT_CACHE_ENABLED", "1") == "1"
+SCRIPT_CACHE_DIR = os.getenv("SCRIPT_CACHE_DIR", "cache/scripts")
+SCRIPT_CACHE_MAX_BYTES = int(os.getenv("SCRIPT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# Text-to-speech voice
+TTS_LANG = os.getenv("TTS_LANG", "en")
+TTS_TLD = os.getenv("TTS_TLD", "com")
+TTS_SLOW = os.getenv("TTS_SLOW", "0") == "1"
+TTS_SEGMENT_CONCURRENCY = int(os.getenv("TTS_SEGMENT_CONCURRENCY", 8))
+
+# Audio artifact cache (static/audio + static/audio_meta)
+AUDIO_CACHE_ENABLED = os.getenv("AUDIO_CACHE_ENABLED", "1") == "1"
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+AUDIO_CACHE_TTL_SECONDS = int(os.getenv("AUDIO_CACHE_TTL_SECONDS", 0))  # 0 = no TTL
+
+# Word timelines in audio_meta: binary .wtl files, zlib-compressed when set
+# (compressed files are smaller but can't be memory-mapped)
+TIMELINE_COMPRESS = os.getenv("TIMELINE_COMPRESS", "0") == "1"
+
+# Browser cache lifetime of immutable artifacts (MP3s, timeline exports)
+ARTIFACT_MAX_AGE = int(os.getenv("ARTIFACT_MAX_AGE", 365 * 24 * 3600))
+
+# Word alignment: "whisper" (ASR) or "fast" (text-aware, no ASR; approximate,
+# see tts/fast_aligner.py for measured accuracy)
+ALIGNMENT_MODE = os.getenv("ALIGNMENT_MODE", "whisper")
+
+# Whisper alignment profiles. batch_size 1 decodes each file sequentially
+# (conditioned on previous text); > 1 transcribes through the batched
+# pipeline, with concurrent requests grouped into one model pass. Batching
+# is opt-in: only "fast" and "throughput" use it, the default does not.
+WHISPER_PROFILES = {
+    "fast": {"model_size": "tiny", "beam_size": 1, "compute_type": "int8", "cpu_threads": 2, "batch_size": 16},
+    "balanced": {"model_size": "base", "beam_size": 5, "compute_type": "int8", "cpu_threads": 2, "batch_size": 1},
+    "throughput": {"model_size": "base", "beam_size": 5, "compute_type": "int8", "cpu_threads": 2, "batch_size": 8},
+    "accurate": {"model_size": "small", "beam_size": 5, "compute_type": "int8_float32", "cpu_threads": 4, "batch_size": 1},
+}
+WHISPER_PROFILE = os.getenv("WHISPER_PROFILE", "balanced")
+
+# Whisper alignment service (one model replica per worker process);
+# model size and threads override the profile when set
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE")
+WHISPER_REPLICAS = int(os.getenv("WHISPER_REPLICAS", 2))
+WHISPER_THREADS_PER_REPLICA = os.getenv("WHISPER_THREADS_PER_REPLICA")
+WHISPER_BATCH_MAX_FILES = int(os.getenv("WHISPER_BATCH_MAX_FILES", 8))      # requests per model pass
+WHISPER_BATCH_WINDOW_MS = float(os.getenv("WHISPER_BATCH_WINDOW_MS", 50))  # wait for company when idle
+ALIGNMENT_MAX_PENDING = int(os.getenv("ALIGNMENT_MAX_PENDING", 8))
+ALIGNMENT_QUEUE_TIMEOUT = float(os.getenv("ALIGNMENT_QUEUE_TIMEOUT", 30))
+ALIGNMENT_TIMEOUT = float(os.getenv("ALIGNMENT_TIMEOUT", 300))   # per alignment, once queued
+
+# Stage worker pools (shared by background jobs)
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", 2))
+LLM_WORKERS = int(os.getenv("LLM_WORKERS", 4))
+TTS_WORKERS = int(os.getenv("TTS_WORKERS", 2))
+# processes for document parsing and slide alignment (PDF_WORKERS is the old name)
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", os.getenv("PDF_WORKERS", min(os.cpu_count() or 1, 4))))
+
+# Batch ingestion (POST /jobs/batch): documents per batch, a zip counts its
+# members; each file still gets UPLOAD_MAX_BYTES, the whole body BATCH_MAX_BYTES
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", 100))
+BATCH_MAX_BYTES = int(os.getenv("BATCH_MAX_BYTES", 2 * 1024 * 1024 * 1024))
+
+# Engines to load in the background at boot ("llm", "pdf", "pptx", "tts",
+# "alignment", comma-separated, or "all"); /ready waits for them.
+# Empty: everything loads on first use.
+WARMUP = os.getenv("WARMUP", "")
 
-if not GEMINI_API_KEY:
-    raise RuntimeError("GEMINI_API_KEY is not set in config/.env file")
+# Background jobs: "memory" or "sqlite" (survives restarts)
+JOB_BACKEND = os.getenv("JOB_BACKEND", "memory")
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "jobs.db")
 
@@ -0,0 +1,245 @@
+# jobs/manager.py
+import os
+import threading
+import time
+import uuid
+
+from config.settings import JOB_BACKEND, JOB_DB_PATH, SCRIPT_CACHE_ENABLED
+from jobs.store import Job, MemoryJobStore, SQLiteJobStore
+from llm.script_generator import generate_slidewise_script
+from services.script_service import (
+    load_slides,
+    lookup_cached_script,
+    store_cached_script
+)
+from services.stage_pools import get_pool
+from tts.audio_generator import script_to_audio
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobManager:
+    """
+    Runs generation jobs in the background, one pipeline stage at a time.
+
+    Each stage is submitted to its own bounded pool (extract → llm → tts)
+    and schedules the next one when it finishes, so a job never holds a
+    worker while it waits for another stage. Cancellation is cooperative:
+    it is checked before each stage and at every progress report.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._futures = {}
+        self._listeners = {}
+
+    # ---------------- PUBLIC ----------------
+
+    def submit(self, kind: str, params: dict) -> Job:
+        job = Job(id=uuid.uuid4().hex, kind=kind, params=params)
+        self.store.save(job)
+        self._start(job)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self.store.get(job_id)
+
+    def cancel(self, job_id: str) -> Job | None:
+        job = self._update(job_id, status="cancelled")
+        if job is None:
+            return None
+
+        future = self._futures.pop(job_id, None)
+        if future is not None:
+            future.cancel()
+
+        self._cleanup(job)
+        self._notify(job)
+        return job
+
+    def on_finish(self, job_id: str, callback):
+        """
+        Calls `callback(job)` once the job succeeds, fails or is
+        cancelled (right away if it already has). Runs on the thread
+        that finished the job, so callbacks must not block.
+        """
+        with self._lock:
+            job = self.store.get(job_id)
+            if job is None or not job.finished:
+                self._listeners.setdefault(job_id, []).append(callback)
+                return
+
+        callback(job)
+
+    def resume(self):
+        """
+        Re-queue jobs that were queued or running when the process
+        stopped (only meaningful for the SQLite store).
+        """
+        for job in self.store.unfinished():
+            file_path = job.params.get("file_path")
+
+            if file_path and not os.path.exists(file_path):
+                self._finish(job.id, "failed", error="Upload lost across restart")
+                continue
+
+            job.status = "queued"
+            job.stages = {}
+            self.store.save(job)
+            self._start(job)
+
+    # ---------------- SCHEDULING ----------------
+
+    def _start(self, job: Job):
+        if job.kind == "audio":
+            self._schedule(job.id, "tts", self._audio_stage, job.params["script"])
+        else:
+            self._schedule(job.id, "extract", self._load_stage, None)
+
+    def _schedule(self, job_id: str, pool: str, fn, value):
+        self._futures[job_id] = get_pool(pool).submit(
+            self._run_stage, job_id, fn, value
+        )
+
+    def _run_stage(self, job_id: str, fn, value):
+        job = self.store.get(job_id)
+        if job is None or job.finished:
+            return
+
+        if job.status == "queued":
+            job = self._update(job_id, status="running")
+
+        try:
+            fn(job, value)
+        except JobCancelled:
+            pass
+        except Exception as e:
+            self._finish(job_id, "failed", error=str(e))
+
+    # ---------------- STAGES ----------------
+
+    def _load_stage(self, job: Job, _):
+        params = job.params
+        use_cache = params.get("use_cache", True) and SCRIPT_CACHE_ENABLED
+        cache_key = None
+
+        if use_cache:
+            cache_key, cached = lookup_cached_script(params["file_path"], params["tone"])
+            if cached is not None:
+                self._mark(job.id, "loaded")
+                self._mark(job.id, "scripted")
+                self._after_script(job, cached)
+                return
+
+        slides = load_slides(params["file_path"])
+        self._mark(job.id, "loaded")
+        self._schedule(job.id, "llm", self._script_stage, (slides, cache_key))
+
+    def _script_stage(self, job: Job, value):
+        slides, cache_key = value
+
+        script = generate_slidewise_script(slides, tone=job.params["tone"])
+        if cache_key:
+            store_cached_script(cache_key, script)
+
+        self._mark(job.id, "scripted")
+        self._after_script(job, script)
+
+    def _after_script(self, job: Job, script: str):
+        self._cleanup(job)
+
+        if job.params.get("audio"):
+            self._update(job.id, result={"script": script})
+            self._schedule(job.id, "tts", self._audio_stage, script)
+        else:
+            self._finish(job.id, "succeeded", result={"script": script})
+
+    def _audio_stage(self, job: Job, script: str):
+        audio_result = script_to_audio(
+            script,
+            use_cache=job.params.get("use_cache", True),
+            on_stage=lambda stage: self._mark(job.id, stage),
+            alignment=job.params.get("alignment")
+        )
+
+        result = dict(self.store.get(job.id).result or {})
+        result.update({
+            "audio_id": audio_result["audio_id"],
+            "audio_url": audio_result["audio_url"],
+            "duration": audio_result["duration"]
+        })
+        self._finish(job.id, "succeeded", result=result)
+
+    # ---------------- STATE ----------------
+
+    def _update(self, job_id: str, **changes) -> Job | None:
+        with self._lock:
+            job = self.store.get(job_id)
+            if job is None:
+                return None
+
+            # a finished job (e.g. cancelled) is never overwritten
+            if job.finished:
+                return job
+
+            for name, value in changes.items():
+                setattr(job, name, value)
+
+            self.store.save(job)
+            return job
+
+    def _mark(self, job_id: str, stage: str):
+        with self._lock:
+            job = self.store.get(job_id)
+            if job is None or job.status == "cancelled":
+                raise JobCancelled(job_id)
+
+            job.stages = {**job.stages, stage: time.time()}
+            self.store.save(job)
+
+    def _finish(self, job_id: str, status: str, **changes):
+        job = self._update(job_id, status=status, **changes)
+        self._futures.pop(job_id, None)
+        if job is not None:
+            self._cleanup(job)
+            self._notify(job)
+
+    def _notify(self, job: Job):
+        with self._lock:
+            listeners = self._listeners.pop(job.id, [])
+
+        for callback in listeners:
+            callback(job)
+
+    @staticmethod
+    def _cleanup(job: Job):
+        file_path = job.params.get("file_path")
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
+
+
+# ---------------- SINGLETON ----------------
+
+_manager: JobManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    global _manager
+
+    with _manager_lock:
+        if _manager is None:
+            if JOB_BACKEND == "sqlite":
+                store = SQLiteJobStore(JOB_DB_PATH)
+            elif JOB_BACKEND == "memory":
+                store = MemoryJobStore()
+            else:
+                raise RuntimeError(f"Unknown JOB_BACKEND: {JOB_BACKEND}")
+
+            _manager = JobManager(store)
+            _manager.resume()
+
+    return _manager
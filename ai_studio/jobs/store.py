@@ -0,0 +1,143 @@
+# jobs/store.py
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+
+# Pipeline stages reported by GET /jobs/{id}, in order
+STAGES = ("loaded", "scripted", "synthesized", "aligned")
+
+FINISHED = ("succeeded", "failed", "cancelled")
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str                       # "script" | "audio"
+    params: dict
+    status: str = "queued"          # queued | running | succeeded | failed | cancelled
+    stages: dict = field(default_factory=dict)   # stage → completion time
+    result: dict | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["progress"] = [
+            {"stage": stage, "done": stage in self.stages}
+            for stage in self.planned_stages()
+        ]
+        return data
+
+    def planned_stages(self) -> list[str]:
+        if self.kind == "audio":
+            return ["synthesized", "aligned"]
+        if self.params.get("audio"):
+            return list(STAGES)
+        return ["loaded", "scripted"]
+
+
+# ---------------- IN-PROCESS ----------------
+
+class MemoryJobStore:
+    def __init__(self):
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: Job):
+        job.updated_at = time.time()
+        with self._lock:
+            self._jobs[job.id] = job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def unfinished(self) -> list[Job]:
+        with self._lock:
+            return [j for j in self._jobs.values() if not j.finished]
+
+
+# ---------------- SQLITE ----------------
+
+class SQLiteJobStore:
+    """
+    Persists jobs in a local SQLite file so queued/running jobs can be
+    resumed after a restart.
+    """
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    stages TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def save(self, job: Job):
+        job.updated_at = time.time()
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id,
+                    job.kind,
+                    job.status,
+                    json.dumps(job.params),
+                    json.dumps(job.stages),
+                    json.dumps(job.result) if job.result is not None else None,
+                    job.error,
+                    job.created_at,
+                    job.updated_at,
+                )
+            )
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+
+        return self._to_job(row) if row else None
+
+    def unfinished(self) -> list[Job]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE status IN ('queued', 'running') "
+                "ORDER BY created_at"
+            ).fetchall()
+
+        return [self._to_job(row) for row in rows]
+
+    @staticmethod
+    def _to_job(row) -> Job:
+        return Job(
+            id=row[0],
+            kind=row[1],
+            status=row[2],
+            params=json.loads(row[3]),
+            stages=json.loads(row[4]),
+            result=json.loads(row[5]) if row[5] else None,
+            error=row[6],
+            created_at=row[7],
+            updated_at=row[8],
+        )
@@ -1,21 +1,665 @@
 # llm/gemini_client.py
-from google import genai
-from config.settings import GEMINI_API_KEY
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 
-# Create Gemini client
-client = genai.Client(api_key=GEMINI_API_KEY)
+from config.settings import (
+    GEMINI_API_KEY,
+    GEMINI_MODEL,
+    GEMINI_RPM,
+    GEMINI_BURST,
+    GEMINI_MAX_CONCURRENCY,
+    GEMINI_TIMEOUT_SECONDS,
+    GEMINI_MAX_RETRIES,
+    GEMINI_BACKOFF_BASE,
+    GEMINI_BACKOFF_MAX,
+    PROMPT_CACHE,
+    PROMPT_CACHE_TTL_SECONDS,
+    PROMPT_CACHE_MIN_TOKENS,
+    PROMPT_CACHE_RETRY_SECONDS
+)
+from monitoring.metrics import record_stage, timed, timed_iter
+from processing.tokens import count_tokens
 
-def generate(prompt: str, model: str = "gemini-2.5-flash") -> str:
-    try:
-        response = client.models.generate_content(
+# ---------------- CLIENT ----------------
+# google-genai takes about half a second to import, so the SDK and the
+# client are loaded on first use (or by warm_client() at boot), not when
+# this module is imported. Tests and benchmarks may assign `client`.
+
+client = None
+_client_lock = threading.Lock()
+
+
+def _types():
+    from google.genai import types
+    return types
+
+
+def get_client():
+    global client
+
+    with _client_lock:
+        if client is None:
+            if not GEMINI_API_KEY:
+                raise RuntimeError("GEMINI_API_KEY is not set in config/.env file")
+
+            from google import genai
+            client = genai.Client(api_key=GEMINI_API_KEY)
+
+    return client
+
+
+def warm_client():
+    get_client()
+    _types()
+
+
+def client_ready() -> bool:
+    return client is not None
+
+DEFAULT_MODEL = GEMINI_MODEL
+
+
+# ---------------- PREFIX CACHING ----------------
+# A long static prompt prefix (instructions + reference example) is
+# uploaded once as Gemini cached content and referenced by name, so
+# later calls only send (and pay full price for) the per-request part.
+
+class LocalPrefixCache:
+    """
+    In-process stand-in for upstream context caching (PROMPT_CACHE=local,
+    and for tests): tracks prefixes the same way but still sends them
+    inline.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: set[str] = set()
+        self.stats = {"created": 0, "hits": 0, "fallbacks": 0, "invalidated": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    @staticmethod
+    def key(model: str, prefix: str) -> str:
+        return hashlib.sha256(f"{model}|{prefix}".encode("utf-8")).hexdigest()
+
+    def prepare(self, model: str, prefix: str, prompt: str):
+        """
+        Returns (contents, config) for a prefix + prompt call.
+        """
+        key = self.key(model, prefix)
+
+        with self._lock:
+            if key in self._entries:
+                self.stats["hits"] += 1
+            else:
+                self._entries.add(key)
+                self.stats["created"] += 1
+
+        return prefix + prompt, None
+
+    def invalidate(self, model: str, prefix: str):
+        with self._lock:
+            self._entries.discard(self.key(model, prefix))
+            self.stats["invalidated"] += 1
+
+
+class GeminiPrefixCache(LocalPrefixCache):
+    """
+    Explicit Gemini context caching. Prefixes under PROMPT_CACHE_MIN_TOKENS
+    (below the API minimum) or that the API rejects are sent inline for
+    good; after a transient upload failure (timeout, 429, 5xx) they are
+    sent inline for PROMPT_CACHE_RETRY_SECONDS, then tried again.
+    """
+
+    def __init__(self, ttl_seconds: int = PROMPT_CACHE_TTL_SECONDS):
+        super().__init__()
+        self.ttl_seconds = ttl_seconds
+        self._handles: dict[str, tuple[str, float]] = {}   # key → (name, expires)
+        self._uncacheable: set[str] = set()
+        self._retry_at: dict[str, float] = {}              # key → next upload attempt
+
+    def _create(self, model: str, prefix: str) -> str:
+        cached = get_client().caches.create(
             model=model,
-            contents=prompt
+            config=_types().CreateCachedContentConfig(
+                contents=[prefix],
+                ttl=f"{self.ttl_seconds}s"
+            )
         )
+        return cached.name
+
+    def prepare(self, model: str, prefix: str, prompt: str):
+        key = self.key(model, prefix)
+
+        with self._lock:
+            handle = self._handles.get(key)
+            uncacheable = key in self._uncacheable
+            backing_off = self._retry_at.get(key, 0) > time.time()
+
+        if uncacheable or backing_off:
+            self._count("fallbacks")
+            return prefix + prompt, None
+
+        # renew a minute early so a call never races the expiry
+        if handle is None or handle[1] - 60 < time.time():
+            if count_tokens(prefix) < PROMPT_CACHE_MIN_TOKENS:
+                with self._lock:
+                    self._uncacheable.add(key)
+                self._count("fallbacks")
+                return prefix + prompt, None
+
+            try:
+                name = self._create(model, prefix)
+            except Exception as e:
+                with self._lock:
+                    if _rejected(e):
+                        self._uncacheable.add(key)
+                    else:
+                        self._retry_at[key] = time.time() + PROMPT_CACHE_RETRY_SECONDS
+                self._count("fallbacks")
+                return prefix + prompt, None
+
+            handle = (name, time.time() + self.ttl_seconds)
+            with self._lock:
+                self._handles[key] = handle
+                self._retry_at.pop(key, None)
+            self._count("created")
+        else:
+            self._count("hits")
+
+        return prompt, _types().GenerateContentConfig(cached_content=handle[0])
+
+    def invalidate(self, model: str, prefix: str):
+        with self._lock:
+            self._handles.pop(self.key(model, prefix), None)
+            self.stats["invalidated"] += 1
+
+
+def _rejected(exc: Exception) -> bool:
+    """
+    A 4xx other than timeout/rate limiting: the same upload would fail
+    again.
+    """
+    from google.genai import errors
+
+    return (
+        isinstance(exc, errors.APIError)
+        and 400 <= (exc.code or 0) < 500
+        and exc.code not in RETRYABLE_CODES
+    )
+
+
+def _make_prefix_cache():
+    if PROMPT_CACHE == "gemini":
+        return GeminiPrefixCache()
+    if PROMPT_CACHE == "local":
+        return LocalPrefixCache()
+    if PROMPT_CACHE == "off":
+        return None
+    raise RuntimeError(f"Unknown PROMPT_CACHE: {PROMPT_CACHE}")
+
+
+prefix_cache = _make_prefix_cache()
+
+
+def prefix_cache_stats() -> dict:
+    if prefix_cache is None:
+        return {"backend": "off"}
+    return {"backend": PROMPT_CACHE, **prefix_cache.stats}
+
+
+def _request(prompt: str, model: str, prefix: str | None):
+    """
+    (contents, config) for a call; with a prefix and no cache the
+    prefix is simply sent inline.
+    """
+    if not prefix:
+        return prompt, None
+    if prefix_cache is None:
+        return prefix + prompt, None
+    return prefix_cache.prepare(model, prefix, prompt)
+
+
+# ---------------- RESILIENCE ----------------
+
+RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+
+llm_stats = {
+    "calls": 0,
+    "retries": 0,
+    "throttled": 0,
+    "coalesced": 0,
+    "slot_waits": 0,
+    "deadline_exceeded": 0,
+    "failures": 0
+}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str, n: int = 1):
+    with _stats_lock:
+        llm_stats[name] += n
+
+
+class DeadlineExceeded(TimeoutError):
+    """The call's deadline passed (or would pass) before a response."""
+
+
+def _retryable(exc: Exception) -> bool:
+    import httpx
+    from google.genai import errors
+
+    if isinstance(exc, errors.APIError):
+        return exc.code in RETRYABLE_CODES
+    return isinstance(exc, (httpx.TransportError, ConnectionError, TimeoutError))
+
+
+def _cache_missing(exc: Exception) -> bool:
+    """
+    The request's cached content expired or was evicted upstream.
+    """
+    from google.genai import errors
+
+    if not isinstance(exc, errors.APIError):
+        return False
+    if exc.code == 404:
+        return True
+
+    message = str(exc).lower()
+    return exc.code in (400, 403) and ("cached_content" in message or "cachedcontent" in message)
+
+
+class TokenBucket:
+    """
+    Request rate limiter: `rate` tokens per second, bursts up to
+    `capacity`. A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, deadline: float) -> float:
+        """
+        Takes a token and returns how long to wait before using it.
+        Raises DeadlineExceeded (taking nothing) if that is past `deadline`.
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if now + wait > deadline:
+                raise DeadlineExceeded("Rate limit wait exceeds the call deadline")
+
+            self._tokens -= 1
+            return wait
+
+
+rate_limiter = TokenBucket(GEMINI_RPM / 60, GEMINI_BURST)
+
+
+class CallSlots:
+    """
+    Cap on Gemini requests in flight across the process. Every caller
+    (request handlers, background and batch jobs, map-reduce groups)
+    draws from it, so fanning out more work queues here instead of
+    multiplying upstream concurrency. A limit of 0 disables it.
+    """
+
+    POLL_SECONDS = 0.02
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._slots = threading.BoundedSemaphore(limit) if limit > 0 else None
+
+    def _acquire(self, deadline: float):
+        if self._slots.acquire(blocking=False):
+            return
+
+        _count("slot_waits")
+        if not self._slots.acquire(timeout=max(deadline - time.monotonic(), 0)):
+            raise DeadlineExceeded("Deadline exceeded waiting for an LLM slot")
+
+    @contextmanager
+    def hold(self, deadline: float):
+        if self._slots is None:
+            yield
+            return
+
+        self._acquire(deadline)
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def ahold(self, deadline: float):
+        if self._slots is None:
+            yield
+            return
+
+        # polled rather than waited on in a thread, so a cancelled
+        # task can never leave a slot taken behind it
+        if not self._slots.acquire(blocking=False):
+            _count("slot_waits")
+            while not self._slots.acquire(blocking=False):
+                if time.monotonic() >= deadline:
+                    raise DeadlineExceeded("Deadline exceeded waiting for an LLM slot")
+                await asyncio.sleep(self.POLL_SECONDS)
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+
+call_slots = CallSlots(GEMINI_MAX_CONCURRENCY)
+
+
+class _Attempts:
+    """
+    Retry state of one logical call, shared by the sync and async paths:
+    builds each attempt's request and decides what a failure means.
+    """
+
+    def __init__(self, prompt: str, model: str, prefix: str | None, deadline: float):
+        self.prompt = prompt
+        self.model = model
+        self.prefix = prefix
+        self.deadline = deadline
+        self.retries = 0
+        self.inline = False
+        self.cached = False
+
+    def throttle(self) -> float:
+        wait = rate_limiter.reserve(self.deadline)
+        if wait > 0:
+            _count("throttled")
+        return wait
+
+    def request(self):
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded("Deadline exceeded before the request was sent")
+
+        if self.inline and self.prefix:
+            contents, config = self.prefix + self.prompt, None
+        else:
+            contents, config = _request(self.prompt, self.model, self.prefix)
+
+        self.cached = config is not None
+        types = _types()
+        http_options = types.HttpOptions(timeout=max(int(remaining * 1000), 1))
+
+        if config is None:
+            config = types.GenerateContentConfig(http_options=http_options)
+        else:
+            config = config.model_copy(update={"http_options": http_options})
+
+        return contents, config
+
+    def failed(self, exc: Exception) -> float:
+        """
+        Returns the delay before the next attempt, or re-raises.
+        """
+        if self.cached and not self.inline and _cache_missing(exc):
+            # cached content expired or was evicted upstream: send inline
+            prefix_cache.invalidate(self.model, self.prefix)
+            self.inline = True
+            return 0.0
+
+        if not _retryable(exc) or self.retries >= GEMINI_MAX_RETRIES:
+            raise exc
+
+        # full jitter: uniform over an exponentially growing window
+        delay = random.uniform(0, min(GEMINI_BACKOFF_MAX, GEMINI_BACKOFF_BASE * 2 ** self.retries))
+        if time.monotonic() + delay >= self.deadline:
+            raise DeadlineExceeded(f"Deadline exceeded while retrying: {exc}") from exc
+
+        self.retries += 1
+        _count("retries")
+        return delay
+
+
+def _generate_sync(prompt: str, model: str, prefix: str | None, deadline: float) -> str:
+    attempts = _Attempts(prompt, model, prefix, deadline)
+
+    while True:
+        time.sleep(attempts.throttle())
+        contents, config = attempts.request()
+
+        try:
+            with call_slots.hold(deadline):
+                response = get_client().models.generate_content(
+                    model=model,
+                    contents=contents,
+                    config=config
+                )
+            if not response.text:
+                raise ValueError("Empty response from Gemini model")
+            return response.text
+
+        except Exception as e:
+            time.sleep(attempts.failed(e))
+
+
+async def _generate_async(prompt: str, model: str, prefix: str | None, deadline: float) -> str:
+    attempts = _Attempts(prompt, model, prefix, deadline)
+
+    # the SDK import and a prefix upload (caches.create) are blocking:
+    # keep them off the event loop
+    if not client_ready():
+        await asyncio.to_thread(warm_client)
+
+    while True:
+        await asyncio.sleep(attempts.throttle())
+        contents, config = await asyncio.to_thread(attempts.request)
+
+        try:
+            async with call_slots.ahold(deadline):
+                response = await get_client().aio.models.generate_content(
+                    model=model,
+                    contents=contents,
+                    config=config
+                )
+            if not response.text:
+                raise ValueError("Empty response from Gemini model")
+            return response.text
+
+        except Exception as e:
+            await asyncio.sleep(attempts.failed(e))
+
+
+# ---------------- SINGLE-FLIGHT ----------------
+# Identical prompts in flight at the same time share one upstream call:
+# the first caller leads, the rest wait on its future.
+
+_inflight: dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _join_flight(prompt: str, model: str, prefix: str | None) -> tuple[str, Future, bool]:
+    key = hashlib.sha256(
+        "\0".join([model, prefix or "", prompt]).encode("utf-8")
+    ).hexdigest()
+
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is not None:
+            _count("coalesced")
+            return key, future, False
+
+        future = Future()
+        _inflight[key] = future
+        return key, future, True
+
+
+def _land(key: str, future: Future, result=None, error: BaseException | None = None):
+    with _inflight_lock:
+        _inflight.pop(key, None)
+
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+def _failure(e: BaseException) -> RuntimeError:
+    _count("failures")
+    if isinstance(e, DeadlineExceeded):
+        _count("deadline_exceeded")
+    return RuntimeError(f"Gemini generation failed: {str(e)}")
+
+
+# ---------------- GENERATION ----------------
+
+def generate(
+    prompt: str,
+    model: str = DEFAULT_MODEL,
+    prefix: str | None = None,
+    timeout: float = GEMINI_TIMEOUT_SECONDS
+) -> str:
+    """
+    `prefix` is a static leading part of the prompt that may be served
+    from the prefix cache; the model sees prefix + prompt either way.
+
+    Rate-limited, retried with jittered backoff on retryable errors and
+    bounded by `timeout` seconds overall.
+    """
+    deadline = time.monotonic() + timeout
+    key, future, leader = _join_flight(prompt, model, prefix)
+
+    if not leader:
+        try:
+            with timed("generate"):
+                return future.result(timeout=max(deadline - time.monotonic(), 0))
+        except FutureTimeoutError:
+            raise _failure(DeadlineExceeded("Deadline exceeded waiting for a coalesced call"))
+
+    _count("calls")
+
+    try:
+        with timed("generate"):
+            text = _generate_sync(prompt, model, prefix, deadline)
+    except BaseException as e:
+        error = _failure(e) if isinstance(e, Exception) else RuntimeError("Gemini call interrupted")
+        _land(key, future, error=error)
+        if isinstance(e, Exception):
+            raise error
+        raise
+
+    _land(key, future, result=text)
+    return text
+
+
+async def agenerate(
+    prompt: str,
+    model: str = DEFAULT_MODEL,
+    prefix: str | None = None,
+    timeout: float = GEMINI_TIMEOUT_SECONDS
+) -> str:
+    """
+    Async counterpart of generate(), sharing its rate limiter, counters
+    and in-flight coalescing.
+    """
+    started = time.perf_counter()
+    try:
+        return await _agenerate(prompt, model, prefix, timeout)
+    finally:
+        # the span stack is per thread, so async calls record directly
+        record_stage("generate", time.perf_counter() - started)
+
+
+async def _agenerate(prompt: str, model: str, prefix: str | None, timeout: float) -> str:
+    deadline = time.monotonic() + timeout
+    key, future, leader = _join_flight(prompt, model, prefix)
+
+    if not leader:
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)),
+                max(deadline - time.monotonic(), 0)
+            )
+        except asyncio.TimeoutError:
+            raise _failure(DeadlineExceeded("Deadline exceeded waiting for a coalesced call"))
+
+    _count("calls")
+
+    try:
+        text = await _generate_async(prompt, model, prefix, deadline)
+    except BaseException as e:
+        # includes cancellation, so followers are never left waiting
+        error = _failure(e) if isinstance(e, Exception) else RuntimeError("Gemini call cancelled")
+        _land(key, future, error=error)
+        if isinstance(e, Exception):
+            raise error
+        raise
+
+    _land(key, future, result=text)
+    return text
+
+
+def generate_stream(
+    prompt: str,
+    model: str = DEFAULT_MODEL,
+    prefix: str | None = None,
+    timeout: float = GEMINI_TIMEOUT_SECONDS
+):
+    """
+    Yields response text chunks as the model produces them. Retried
+    like generate() until the first chunk arrives, never after.
+    """
+    return timed_iter("generate", _stream(prompt, model, prefix, timeout))
+
+
+def _stream(prompt: str, model: str, prefix: str | None, timeout: float):
+    deadline = time.monotonic() + timeout
+    attempts = _Attempts(prompt, model, prefix, deadline)
+    _count("calls")
+
+    try:
+        while True:
+            time.sleep(attempts.throttle())
+            contents, config = attempts.request()
+            produced = False
+
+            try:
+                # the slot is held until the stream is drained or closed
+                with call_slots.hold(deadline):
+                    for chunk in get_client().models.generate_content_stream(
+                        model=model,
+                        contents=contents,
+                        config=config
+                    ):
+                        if chunk.text:
+                            produced = True
+                            yield chunk.text
 
-        if not response.text:
-            raise ValueError("Empty response from Gemini model")
+                if not produced:
+                    raise ValueError("Empty response from Gemini model")
+                return
 
-        return response.text
+            except Exception as e:
+                if produced:
+                    raise
+                time.sleep(attempts.failed(e))
 
     except Exception as e:
-        raise RuntimeError(f"Gemini generation failed: {str(e)}")
+        raise _failure(e)
@@ -0,0 +1,141 @@
+# llm/prompt_templates.py
+import hashlib
+import threading
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+REF_SLIDES_PATH = BASE_DIR / "assets/examples/reference_ppt.txt"
+REF_SCRIPT_PATH = BASE_DIR / "assets/examples/reference_script.txt"
+
+# Bump whenever the prompt wording changes so cached scripts are invalidated
+# (the compiled prefix digest is part of the version as well, so edits to
+# the reference example invalidate them on their own)
+PROMPT_TEMPLATE_VERSION = "4"
+
+
+def _load_text(path: Path) -> str:
+    return path.read_text().strip() if path.exists() else ""
+
+
+# ---------------- SLIDE-WISE SCRIPT ----------------
+# The static part (instructions + reference example) comes first and is
+# byte-identical for every request, so it can be cached upstream; only
+# the tone, slide count and slides follow it.
+
+_SLIDEWISE_INSTRUCTIONS = """
+You are an expert technical educator teaching a university-level class.
+
+Your task is to convert slide content into a CLEAR, STRICTLY SLIDE-WISE
+teaching script.
+
+ CRITICAL CONSTRAINTS (DO NOT VIOLATE):
+- The number of output slides MUST be EXACTLY the number of input slides
+- One input slide → ONE output slide
+- DO NOT split or merge slides
+- EACH slide MUST start with: "Slide X:"
+- Slide numbering MUST be sequential from 1
+- Explain ALL concepts from the slide within the SAME slide
+- A "CONTEXT" block only repeats the end of the previous slide: use it for continuity, never explain it again
+
+ LANGUAGE RULES:
+- Do NOT use first-person language (I, we, today, let's)
+- No greetings, hooks, emojis, or conclusions
+- Academic, classroom-style explanation
+- Use the tone given with the slides
+
+REQUIRED OUTPUT FORMAT (EXACT):
+
+Slide 1:
+Explanation...
+
+Slide 2:
+Explanation...
+"""
+
+_SLIDEWISE_REFERENCE = """
+REFERENCE EXAMPLE (STYLE ONLY — DO NOT COPY CONTENT):
+
+Slides:
+{ref_slides}
+
+Ideal Slide-wise Script:
+{ref_script}
+"""
+
+_SLIDE_CONTEXT = """
+Slide {slide} CONTEXT (end of the previous slide, for continuity only, DO NOT narrate):
+{context}
+"""
+
+_SLIDE_CONTENT = """
+Slide {slide} CONTENT:
+{content}
+"""
+
+_SLIDEWISE_REMINDERS = """
+FINAL REMINDERS:
+- Output EXACTLY {slide_count} slides
+- Use ONLY the format "Slide X:"
+- Do NOT add anything before or after
+"""
+
+
+class SlidewiseTemplate:
+    """
+    The slide-wise prompt, split into a static `prefix` compiled once
+    and a per-request part rendered from the slides.
+
+    `version` identifies the prefix (template version + digest) for
+    script cache keys and upstream prefix caches.
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        digest = hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:12]
+        self.version = f"{PROMPT_TEMPLATE_VERSION}-{digest}"
+
+    def render(self, slides: list[dict], tone: str = "educational") -> str:
+        slide_count = len(slides)
+        parts = [
+            f"\nTone: {tone}\n",
+            f"\nNOW GENERATE THE SCRIPT FOR THESE {slide_count} SLIDES:\n"
+        ]
+
+        for s in slides:
+            if s.get("context"):
+                parts.append(_SLIDE_CONTEXT.format(slide=s["slide"], context=s["context"]))
+            parts.append(_SLIDE_CONTENT.format(slide=s["slide"], content=s["content"]))
+
+        parts.append(_SLIDEWISE_REMINDERS.format(slide_count=slide_count))
+
+        return "".join(parts)
+
+
+def compile_slidewise_template() -> SlidewiseTemplate:
+    prefix = _SLIDEWISE_INSTRUCTIONS
+
+    ref_slides = _load_text(REF_SLIDES_PATH)
+    ref_script = _load_text(REF_SCRIPT_PATH)
+
+    if ref_slides and ref_script:
+        prefix += _SLIDEWISE_REFERENCE.format(ref_slides=ref_slides, ref_script=ref_script)
+
+    return SlidewiseTemplate(prefix)
+
+
+_slidewise: SlidewiseTemplate | None = None
+_lock = threading.Lock()
+
+
+def get_slidewise_template() -> SlidewiseTemplate:
+    """
+    The compiled template; reference files are read on first use only.
+    """
+    global _slidewise
+
+    with _lock:
+        if _slidewise is None:
+            _slidewise = compile_slidewise_template()
+
+    return _slidewise
@@ -1,15 +1,25 @@
 # llm/script_generator.py
-from llm.gemini_client import generate
-from pathlib import Path
-
-BASE_DIR = Path(__file__).resolve().parents[1]
-
-REF_SLIDES_PATH = BASE_DIR / "assets/examples/reference_ppt.txt"
-REF_SCRIPT_PATH = BASE_DIR / "assets/examples/reference_script.txt"
-
-
-def _load_text(path: Path) -> str:
-    return path.read_text().strip() if path.exists() else ""
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config.settings import (
+    SCRIPT_BATCH_THRESHOLD,
+    SCRIPT_BATCH_MAX_WORDS,
+    SCRIPT_BATCH_CONCURRENCY,
+    SCRIPT_BATCH_RETRIES
+)
+from llm.gemini_client import generate, generate_stream
+from monitoring.metrics import observe
+from processing.script_parser import (
+    SLIDE_HEADER_RE,
+    SlideStreamParser,
+    split_script_blocks
+)
+from llm.prompt_templates import get_slidewise_template
+
+# a header on any line of a block, not just the first
+_HEADER_LINE_RE = re.compile(SLIDE_HEADER_RE.pattern, SLIDE_HEADER_RE.flags | re.MULTILINE)
 
 
 # ---------------- DYNAMIC SLIDE SPLITTER ----------------
@@ -52,83 +62,188 @@ def _split_single_slide_into_sections(
 
 # ---------------- MAIN GENERATOR ----------------
 
-def generate_slidewise_script(
+def _prompt_slides(slides: list[dict], split_single: bool = True) -> list[dict]:
+    """
+    `split_single=False` for map groups: a one-slide group is one slide
+    of a larger deck and must come back as exactly one block.
+    """
+    if not slides:
+        raise ValueError("No slide content provided")
+
+    # 🔥 HARD FALLBACK: dynamic split if extractor collapsed slides
+    if split_single and len(slides) == 1:
+        return _split_single_slide_into_sections(slides[0])
+
+    return slides
+
+
+def build_slidewise_prompt(
     slides: list[dict],
     tone: str = "educational"
 ) -> str:
     """
-    Generates a STRICT slide-wise teaching script.
+    Builds the STRICT slide-wise teaching prompt (static prefix +
+    rendered slides) as one string.
 
     GUARANTEES:
     - Output slide count == logical slide count
     - LLM does NOT invent, merge, or skip slides
     """
+    template = get_slidewise_template()
+    return template.prefix + template.render(_prompt_slides(slides), tone)
 
-    if not slides:
-        raise ValueError("No slide content provided")
 
-    # 🔥 HARD FALLBACK: dynamic split if extractor collapsed slides
-    if len(slides) == 1:
-        slides = _split_single_slide_into_sections(slides[0])
+def _generate_slides(slides: list[dict], tone: str, split_single: bool = True) -> str:
+    template = get_slidewise_template()
+    return generate(
+        template.render(_prompt_slides(slides, split_single), tone),
+        prefix=template.prefix
+    )
 
-    slide_count = len(slides)
 
-    ref_slides = _load_text(REF_SLIDES_PATH)
-    ref_script = _load_text(REF_SCRIPT_PATH)
+def generate_slidewise_script(
+    slides: list[dict],
+    tone: str = "educational"
+) -> str:
+    """
+    Generates a STRICT slide-wise teaching script. Large decks go through
+    the batched map-reduce path; everything else is one call.
+    """
+    if len(slides) > SCRIPT_BATCH_THRESHOLD:
+        return generate_slidewise_script_batched(slides, tone=tone)
 
-    prompt = f"""
-You are an expert technical educator teaching a university-level class.
+    return _generate_slides(slides, tone)
 
-Your task is to convert slide content into a CLEAR, STRICTLY SLIDE-WISE
-teaching script.
 
- CRITICAL CONSTRAINTS (DO NOT VIOLATE):
-- The number of output slides MUST be EXACTLY {slide_count}
-- One input slide → ONE output slide
-- DO NOT split or merge slides
-- EACH slide MUST start with: "Slide X:"
-- Slide numbering MUST be sequential from 1 to {slide_count}
-- Explain ALL concepts from the slide within the SAME slide
+# ---------------- BATCHED (MAP-REDUCE) ----------------
 
- LANGUAGE RULES:
-- Do NOT use first-person language (I, we, today, let's)
-- No greetings, hooks, emojis, or conclusions
-- Academic, classroom-style explanation
-- Tone: {tone}
+def _group_slides(slides: list[dict], max_words: int) -> list[list[dict]]:
+    """
+    Packs consecutive slides into groups under a word budget; a slide
+    larger than the budget gets a group of its own.
+    """
+    groups = []
+    current = []
+    current_words = 0
+
+    for slide in slides:
+        words = len(slide["content"].split())
 
-REQUIRED OUTPUT FORMAT (EXACT):
+        if current and current_words + words > max_words:
+            groups.append(current)
+            current = []
+            current_words = 0
 
-Slide 1:
-Explanation...
+        current.append(slide)
+        current_words += words
 
-Slide 2:
-Explanation...
-"""
+    if current:
+        groups.append(current)
 
-    if ref_slides and ref_script:
-        prompt += f"""
-REFERENCE EXAMPLE (STYLE ONLY — DO NOT COPY CONTENT):
+    return groups
 
-Slides:
-{ref_slides}
 
-Ideal Slide-wise Script:
-{ref_script}
-"""
+def _generate_group(group: list[dict], tone: str) -> list[str]:
+    """
+    One map step: slides renumbered 1..k, output checked to contain
+    exactly k slide blocks.
+    """
+    local = [
+        {"slide": idx, "content": slide["content"], "context": slide.get("context", "")}
+        for idx, slide in enumerate(group, start=1)
+    ]
+
+    # the first block also carries any preamble ("Sure! Here is...");
+    # keep it from its header on
+    blocks = []
+    for block in split_script_blocks(_generate_slides(local, tone, split_single=False)):
+        header = _HEADER_LINE_RE.search(block)
+        if header:
+            blocks.append(block[header.start():])
+
+    if len(blocks) != len(group):
+        raise ValueError(
+            f"Expected {len(group)} slides from batch, got {len(blocks)}"
+        )
+
+    return blocks
+
+
+def _generate_group_with_retry(group: list[dict], tone: str, retries: int) -> list[str]:
+    for attempt in range(retries + 1):
+        try:
+            return _generate_group(group, tone)
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(0.5 * 2 ** attempt)
+
+
+def generate_slidewise_script_batched(
+    slides: list[dict],
+    tone: str = "educational",
+    max_words: int = SCRIPT_BATCH_MAX_WORDS,
+    concurrency: int = SCRIPT_BATCH_CONCURRENCY,
+    retries: int = SCRIPT_BATCH_RETRIES
+) -> str:
+    """
+    Splits slides into prompt-budgeted groups, generates the groups
+    concurrently (each retried on its own), then stitches the blocks
+    back with global sequential `Slide X:` numbering.
+    """
+    if not slides:
+        raise ValueError("No slide content provided")
+
+    groups = _group_slides(slides, max_words)
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        results = list(pool.map(
+            lambda group: _generate_group_with_retry(group, tone, retries),
+            groups
+        ))
+
+    blocks = [block for group_blocks in results for block in group_blocks]
+
+    if len(blocks) != len(slides):
+        raise ValueError(
+            f"Batched script has {len(blocks)} slides, expected {len(slides)}"
+        )
+
+    return "\n\n".join(
+        SLIDE_HEADER_RE.sub(f"Slide {idx}:", block, count=1)
+        for idx, block in enumerate(blocks, start=1)
+    )
+
+
+def stream_slidewise_script(
+    slides: list[dict],
+    tone: str = "educational"
+):
+    """
+    Streams the script, yielding each `Slide N:` block as soon as the
+    next header (or the end of the response) shows it is complete.
+    Records time-to-first-slide.
+    """
+    started = time.perf_counter()
+    parser = SlideStreamParser()
+    first = True
+
+    def emit(blocks):
+        nonlocal first
+        for block in blocks:
+            if first:
+                observe("script_time_to_first_slide_seconds", time.perf_counter() - started)
+                first = False
+            yield block
 
-    prompt += "\nNOW GENERATE THE SCRIPT FOR THESE SLIDES:\n"
+    template = get_slidewise_template()
 
-    for s in slides:
-        prompt += f"""
-Slide {s['slide']} CONTENT:
-{s['content']}
-"""
+    for text in generate_stream(
+        template.render(_prompt_slides(slides), tone),
+        prefix=template.prefix
+    ):
+        yield from emit(parser.feed(text))
 
-    prompt += f"""
-FINAL REMINDERS:
-- Output EXACTLY {slide_count} slides
-- Use ONLY the format "Slide X:"
-- Do NOT add anything before or after
-"""
+    yield from emit(parser.finish())
 
-    return generate(prompt)
+    observe("script_stream_seconds", time.perf_counter() - started)
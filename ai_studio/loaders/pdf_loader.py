@@ -1,17 +1,215 @@
-import pdfplumber
+import io
+import sys
+import time
 from pathlib import Path
 
+from config.settings import (
+    CPU_WORKERS,
+    PDF_PAGES_PER_TASK,
+    PDF_PARALLEL_MIN_PAGES,
+    PDF_PAGE_CACHE_ENABLED,
+    PDF_PAGE_CACHE_DIR,
+    PDF_PAGE_CACHE_MAX_BYTES
+)
+from monitoring.metrics import observe
+from processing.records import SourceUnit
+from services.stage_pools import submit
+from storage.disk_cache import DiskCache, source_digest
 
-def load_pdf(path: str) -> str:
-    pdf_path = Path(path)
+# Part of the page cache key: bump when extraction output changes
+PAGE_EXTRACTION_VERSION = "1"
 
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDF not found at: {pdf_path}")
+page_cache = DiskCache(
+    PDF_PAGE_CACHE_DIR,
+    max_bytes=PDF_PAGE_CACHE_MAX_BYTES,
+    suffix=".txt"
+)
 
-    text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text += (page.extract_text() or "") + "\n"
+
+def _page_key(digest: str, index: int) -> str:
+    return f"{digest}-{PAGE_EXTRACTION_VERSION}-{index}"
+
+
+def _count_key(digest: str) -> str:
+    return f"{digest}-{PAGE_EXTRACTION_VERSION}-pages"
+
+
+def _open_pdf(source):
+    # imported on first use: pdfminer is slow to load and most requests
+    # never touch a PDF (see warm_pdf)
+    import pdfplumber
+
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    return pdfplumber.open(source)
+
+
+def _load_pdfplumber():
+    import pdfplumber  # noqa: F401
+
+
+_pdf_warm = False
+
+
+def warm_pdf():
+    # documents are parsed on the "cpu" pool, so that's where pdfminer
+    # has to be loaded; one task per worker (best effort: the pool may
+    # hand several to the same process)
+    global _pdf_warm
+    futures = [submit("cpu", _load_pdfplumber) for _ in range(max(CPU_WORKERS, 1))]
+    for future in futures:
+        future.result()
+    _pdf_warm = True
+
+
+def pdf_ready() -> bool:
+    return _pdf_warm
+
+
+def _extract_range(source, indices: list[int]) -> list[str]:
+    """
+    "cpu" stage task: text of the given pages. `source` is a path or the
+    raw PDF bytes. pdfplumber is pure Python, so threads would just take
+    turns on the GIL.
+    """
+    with _open_pdf(source) as pdf:
+        return [pdf.pages[idx].extract_text() or "" for idx in indices]
+
+
+def _survey(source, extract_below: int) -> tuple[int, list[str] | None]:
+    """
+    "cpu" stage task for a document whose page count isn't cached yet:
+    counts the pages and, when there are fewer than `extract_below`,
+    extracts them all in the same pass.
+    """
+    with _open_pdf(source) as pdf:
+        page_count = len(pdf.pages)
+
+        if page_count >= extract_below:
+            return page_count, None
+
+        return page_count, [page.extract_text() or "" for page in pdf.pages]
+
+
+# ---------------- EXTRACTION ----------------
+
+def _resolve(path):
+    if isinstance(path, (str, Path)):
+        pdf_path = Path(path)
+
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF not found at: {pdf_path}")
+
+        return str(pdf_path)
+
+    return path
+
+
+def iter_pdf_pages(path, use_cache: bool = True):
+    """
+    Yields the text of each page, in order.
+
+    Pages already in the page cache are served from it. The rest are
+    extracted on the "cpu" process pool: in ranges of PDF_PAGES_PER_TASK
+    once at least PDF_PARALLEL_MIN_PAGES are missing, as a single task
+    below that (where fanning the document out costs more than it
+    saves). The server process never parses the PDF itself.
+
+    `path` may also be a binary file-like object (BytesIO, mapped upload).
+    """
+    global _pdf_warm
+
+    source = _resolve(path)
+    started = time.perf_counter()
+
+    use_cache = use_cache and PDF_PAGE_CACHE_ENABLED
+    digest = source_digest(source) if use_cache else None
+
+    # workers open the document; buffers are shipped as bytes
+    task_source = source if isinstance(source, str) else bytes(source.getbuffer())
+    fan_out_from = PDF_PARALLEL_MIN_PAGES if CPU_WORKERS > 1 else sys.maxsize
+
+    page_count = None
+    if use_cache:
+        hit = page_cache.get(_count_key(digest))
+        if hit is not None:
+            page_count = int(hit)
+
+    extracted = {}
+
+    if page_count is None:
+        # first sight of this document: count (and, when small, extract)
+        # in one worker round trip
+        page_count, texts = submit("cpu", _survey, task_source, fan_out_from).result()
+        _pdf_warm = True
+        if texts is not None:
+            extracted = dict(enumerate(texts))
+        if use_cache:
+            page_cache.set(_count_key(digest), str(page_count).encode("ascii"))
+
+    cached = {}
+    if use_cache:
+        for idx in range(page_count):
+            if idx in extracted:
+                continue
+            hit = page_cache.get(_page_key(digest, idx))
+            if hit is not None:
+                cached[idx] = hit.decode("utf-8")
+
+    missing = [
+        idx for idx in range(page_count)
+        if idx not in cached and idx not in extracted
+    ]
+    chunk = PDF_PAGES_PER_TASK if len(missing) >= fan_out_from else max(len(missing), 1)
+
+    futures = {}
+    for i in range(0, len(missing), chunk):
+        indices = missing[i:i + chunk]
+        futures[indices[0]] = (
+            indices,
+            submit("cpu", _extract_range, task_source, indices)
+        )
+
+    for idx in range(page_count):
+        if idx in cached:
+            yield cached[idx]
+            continue
+
+        if idx not in extracted:
+            indices, future = futures.pop(idx)
+            extracted.update(zip(indices, future.result()))
+        text = extracted.pop(idx)
+
+        if use_cache:
+            page_cache.set(_page_key(digest, idx), text.encode("utf-8"))
+
+        yield text
+
+    elapsed = time.perf_counter() - started
+    observe("pdf_pages", page_count)
+    observe("pdf_pages_cached", len(cached))
+    if elapsed > 0:
+        observe("pdf_pages_per_second", page_count / elapsed)
+
+
+def extract_pdf_pages(path, use_cache: bool = True) -> list[str]:
+    return list(iter_pdf_pages(path, use_cache=use_cache))
+
+
+def iter_pdf_units(path, use_cache: bool = True):
+    """
+    Yields one SourceUnit per page that has text, in page order.
+    """
+    for number, text in enumerate(iter_pdf_pages(path, use_cache=use_cache), start=1):
+        if text.strip():
+            yield SourceUnit(kind="page", number=number, text=text)
+
+
+def load_pdf(path) -> str:
+    """
+    `path` may also be a binary file-like object (BytesIO, mapped upload).
+    """
+    text = "\n".join(extract_pdf_pages(path)) + "\n"
 
     if not text.strip():
         raise ValueError("No readable text found in PDF")
@@ -1,29 +1,89 @@
 # loaders/ppt_loader.py
-from pptx import Presentation
+import io
+import sys
 from pathlib import Path
 
+from processing.records import SourceUnit
+from services.stage_pools import submit
 
-def load_ppt(path: str) -> str:
-    ppt_path = Path(path)
+_warm = False
 
-    if not ppt_path.exists():
-        raise FileNotFoundError(f"PPT file not found at: {ppt_path}")
+
+def iter_ppt_slides(path):
+    """
+    Yields one SourceUnit per slide that has text, in deck order.
+
+    `path` may also be a binary file-like object (BytesIO, mapped upload).
+    """
+    if isinstance(path, (str, Path)):
+        ppt_path = Path(path)
+
+        if not ppt_path.exists():
+            raise FileNotFoundError(f"PPT file not found at: {ppt_path}")
+    else:
+        ppt_path = path
+
+    from pptx import Presentation
 
     prs = Presentation(ppt_path)
-    slides_text = []
 
-    for slide in prs.slides:
+    for number, slide in enumerate(prs.slides, start=1):
         slide_content = []
         for shape in slide.shapes:
             if hasattr(shape, "text"):
                 slide_content.append(shape.text)
 
-        if slide_content:
-            slides_text.append(" ".join(slide_content))
+        text = " ".join(slide_content)
+        if not text.strip():
+            continue
+
+        title_shape = slide.shapes.title
+        title = title_shape.text.strip() if title_shape is not None else ""
+
+        yield SourceUnit(kind="slide", number=number, text=text, title=title)
+
+
+def read_ppt_units(source) -> list[SourceUnit]:
+    """
+    "cpu" stage task: every SourceUnit of a deck. `source` is a path or
+    the raw PPTX bytes.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    return list(iter_ppt_slides(source))
+
 
-    text = "\n".join(slides_text)
+def iter_ppt_units(path):
+    """
+    iter_ppt_slides, parsed on the "cpu" stage pool so python-pptx does
+    not hold the server's GIL. The deck is parsed whole, then streamed.
+    """
+    source = str(path) if isinstance(path, (str, Path)) else bytes(path.getbuffer())
+    yield from submit("cpu", read_ppt_units, source).result()
+
+
+def load_ppt(path) -> str:
+    """
+    `path` may also be a binary file-like object (BytesIO, mapped upload).
+    """
+    text = "\n".join(unit.text for unit in iter_ppt_slides(path))
 
     if not text.strip():
         raise ValueError("No readable text found in PPT")
 
     return text
+
+
+def _load_pptx() -> bool:
+    import pptx  # noqa: F401
+    return True
+
+
+def warm_pptx():
+    # decks are parsed in the "cpu" pool: start a worker, load it there
+    global _warm
+    _warm = submit("cpu", _load_pptx).result()
+
+
+def pptx_ready() -> bool:
+    return _warm or "pptx" in sys.modules
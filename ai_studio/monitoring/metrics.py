@@ -0,0 +1,295 @@
+# monitoring/metrics.py
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# name → {"count", "sum", "min", "max", "last"}
+_summaries: dict[str, dict] = {}
+_lock = threading.Lock()
+
+
+def observe(name: str, value: float):
+    """
+    Records one observation of a timing or size metric.
+    """
+    with _lock:
+        summary = _summaries.get(name)
+
+        if summary is None:
+            _summaries[name] = {
+                "count": 1,
+                "sum": value,
+                "min": value,
+                "max": value,
+                "last": value
+            }
+            return
+
+        summary["count"] += 1
+        summary["sum"] += value
+        summary["min"] = min(summary["min"], value)
+        summary["max"] = max(summary["max"], value)
+        summary["last"] = value
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {
+            name: {**summary, "mean": summary["sum"] / summary["count"]}
+            for name, summary in _summaries.items()
+        }
+
+
+# ---------------- COUNTERS + HISTOGRAMS ----------------
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+SIZE_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+# (name, sorted label items) → value / {"buckets", "counts", "sum", "count"}
+_counters: dict[tuple, float] = {}
+_histograms: dict[tuple, dict] = {}
+
+
+def _key(name: str, labels: dict | None) -> tuple:
+    return name, tuple(sorted((labels or {}).items()))
+
+
+def inc(name: str, labels: dict | None = None, value: float = 1):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe_histogram(
+    name: str,
+    value: float,
+    labels: dict | None = None,
+    buckets: tuple = DURATION_BUCKETS
+):
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = {
+                "buckets": buckets,
+                "counts": [0] * len(buckets),
+                "sum": 0.0,
+                "count": 0
+            }
+
+        for idx, bound in enumerate(hist["buckets"]):
+            if value <= bound:
+                hist["counts"][idx] += 1
+                break
+
+        hist["sum"] += value
+        hist["count"] += 1
+
+
+def observe_size(kind: str, value: float):
+    """
+    Input size of a pipeline run: pages, slides, words, tokens,
+    audio_seconds.
+    """
+    observe_histogram("input_size", value, {"kind": kind}, buckets=SIZE_BUCKETS)
+
+
+# ---------------- STAGE TIMING ----------------
+# Stages report exclusive time: when one timed stage runs inside
+# another on the same thread (e.g. chunk_text pulling from clean_text
+# pulling from load_pdf), the inner time is not counted twice.
+
+_profile: contextvars.ContextVar[dict | None] = contextvars.ContextVar(
+    "stage_profile", default=None
+)
+_local = threading.local()
+
+
+class _Span:
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.total = 0.0
+        self.nested = 0.0
+        self._started = 0.0
+
+    def enter(self):
+        stack = _local.__dict__.setdefault("stack", [])
+        stack.append(self)
+        self._started = time.perf_counter()
+
+    def exit(self):
+        elapsed = time.perf_counter() - self._started
+        stack = _local.stack
+        stack.pop()
+        if stack:
+            stack[-1].nested += elapsed
+        self.total += elapsed
+
+    @property
+    def exclusive(self) -> float:
+        return self.total - self.nested
+
+
+def record_stage(stage: str, seconds: float, error: bool = False):
+    observe_histogram("stage_duration_seconds", seconds, {"stage": stage})
+    inc("stage_calls_total", {"stage": stage})
+    if error:
+        inc("stage_errors_total", {"stage": stage})
+
+    profile = _profile.get()
+    if profile is not None:
+        with _lock:
+            entry = profile.setdefault(stage, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+
+@contextmanager
+def timed(stage: str):
+    span = _Span(stage)
+    span.enter()
+    error = False
+
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        span.exit()
+        record_stage(stage, span.exclusive, error)
+
+
+def timed_iter(stage: str, iterable):
+    """
+    Times a generator stage: only the time spent producing items counts,
+    recorded once when the iteration ends.
+    """
+    span = _Span(stage)
+    iterator = iter(iterable)
+    error = False
+
+    try:
+        while True:
+            span.enter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            except BaseException:
+                error = True
+                raise
+            finally:
+                span.exit()
+
+            yield item
+    finally:
+        record_stage(stage, span.exclusive, error)
+
+
+def bind_context(fn):
+    """
+    Wraps `fn` to run in a copy of the caller's context, so work handed
+    to a pool still reports into the current request's profile. Bind
+    once per submitted task.
+    """
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.run(fn, *args, **kwargs)
+
+
+# ---------------- PER-REQUEST PROFILE ----------------
+
+def start_profile() -> contextvars.Token:
+    return _profile.set({})
+
+
+def finish_profile(token: contextvars.Token) -> dict:
+    profile = _profile.get() or {}
+    _profile.reset(token)
+    return profile
+
+
+def current_profile() -> dict | None:
+    return _profile.get()
+
+
+def profile_entries(profile: dict) -> dict:
+    """
+    Copy of a profile (stage → [seconds, calls]) safe to read while
+    pool threads are still adding to it.
+    """
+    with _lock:
+        return {stage: tuple(entry) for stage, entry in profile.items()}
+
+
+# ---------------- PROMETHEUS ----------------
+
+PREFIX = "ai_studio_"
+
+
+def _labels(items: tuple, extra: tuple = ()) -> str:
+    items = items + extra
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(counters: dict[str, float] | None = None) -> str:
+    """
+    Text exposition format. `counters` adds process-level counters kept
+    elsewhere (cache and client stats) as name → value.
+    """
+    lines = []
+
+    with _lock:
+        counter_items = sorted(_counters.items())
+        histogram_items = sorted(
+            (key, {**hist, "counts": list(hist["counts"])})
+            for key, hist in _histograms.items()
+        )
+        summary_items = sorted((name, dict(s)) for name, s in _summaries.items())
+
+    typed = set()
+
+    def declare(name: str, kind: str):
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), value in counter_items:
+        full = PREFIX + name
+        declare(full, "counter")
+        lines.append(f"{full}{_labels(labels)} {_number(value)}")
+
+    for name, value in sorted((counters or {}).items()):
+        full = PREFIX + name
+        declare(full, "counter")
+        lines.append(f"{full} {_number(value)}")
+
+    for (name, labels), hist in histogram_items:
+        full = PREFIX + name
+        declare(full, "histogram")
+
+        cumulative = 0
+        for bound, count in zip(hist["buckets"], hist["counts"]):
+            cumulative += count
+            lines.append(f"{full}_bucket{_labels(labels, (('le', _number(bound)),))} {cumulative}")
+        lines.append(f"{full}_bucket{_labels(labels, (('le', '+Inf'),))} {hist['count']}")
+        lines.append(f"{full}_sum{_labels(labels)} {_number(hist['sum'])}")
+        lines.append(f"{full}_count{_labels(labels)} {hist['count']}")
+
+    for name, summary in summary_items:
+        full = PREFIX + name
+        declare(full, "summary")
+        lines.append(f"{full}_sum {_number(summary['sum'])}")
+        lines.append(f"{full}_count {summary['count']}")
+
+    return "\n".join(lines) + "\n"
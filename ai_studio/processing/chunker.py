@@ -1,4 +1,14 @@
 # processing/chunker.py
+import re
+from dataclasses import replace
+
+from config.settings import MAX_CHUNK_SIZE, CHUNK_OVERLAP
+from monitoring.metrics import observe
+from processing.tokens import count_tokens
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
 def chunk_text(text: str, max_words: int = 800, overlap: int = 100):
     """
     Splits text into overlapping word chunks for LLM processing.
@@ -19,3 +29,109 @@ def chunk_text(text: str, max_words: int = 800, overlap: int = 100):
         end = start + max_words
         yield " ".join(words[start:end])
         start = end - overlap if end - overlap > 0 else end
+
+
+# ---------------- TOKEN-BUDGETED ----------------
+
+def _pieces(text: str, max_tokens: int) -> list[tuple[str, int]]:
+    """
+    Sentences with their token counts; a sentence over the budget is
+    cut into word runs that fit.
+    """
+    pieces = []
+
+    for sentence in _SENTENCE_END_RE.split(text):
+        tokens = count_tokens(sentence)
+        if tokens <= max_tokens:
+            pieces.append((sentence, tokens))
+            continue
+
+        run, run_tokens = [], 0
+        for word in sentence.split():
+            word_tokens = count_tokens(word)
+            if run and run_tokens + word_tokens > max_tokens:
+                pieces.append((" ".join(run), run_tokens))
+                run, run_tokens = [], 0
+            run.append(word)
+            run_tokens += word_tokens
+
+        if run:
+            pieces.append((" ".join(run), run_tokens))
+
+    return pieces
+
+
+def _tail(pieces: list[tuple[str, int]], max_tokens: int) -> str:
+    """
+    The trailing whole sentences of a chunk that fit in `max_tokens`.
+    """
+    tail, total = [], 0
+
+    for text, tokens in reversed(pieces):
+        if total + tokens > max_tokens:
+            break
+        tail.append(text)
+        total += tokens
+
+    return " ".join(reversed(tail))
+
+
+def chunk_by_tokens(
+    text: str,
+    max_tokens: int = MAX_CHUNK_SIZE,
+    overlap_tokens: int = CHUNK_OVERLAP
+):
+    """
+    Packs whole sentences into chunks of at most `max_tokens`.
+
+    Yields (chunk, context, tokens). Nothing is repeated between chunks:
+    `context` is the tail of the previous chunk (up to `overlap_tokens`)
+    for the LLM to read, not to narrate again.
+    """
+    if not text or not text.strip():
+        raise ValueError("Cannot chunk empty text")
+
+    current, current_tokens = [], 0
+    context = ""
+
+    for piece, tokens in _pieces(text, max_tokens):
+        if current and current_tokens + tokens > max_tokens:
+            yield " ".join(p for p, _ in current), context, current_tokens
+            context = _tail(current, overlap_tokens)
+            current, current_tokens = [], 0
+
+        current.append((piece, tokens))
+        current_tokens += tokens
+
+    if current:
+        yield " ".join(p for p, _ in current), context, current_tokens
+
+
+def chunk_units(
+    units,
+    max_tokens: int = MAX_CHUNK_SIZE,
+    overlap_tokens: int = CHUNK_OVERLAP
+):
+    """
+    Passes SourceUnits through with their token counts, splitting only a
+    unit over `max_tokens` into numbered parts.
+    """
+    for unit in units:
+        tokens = count_tokens(unit.text)
+
+        if tokens <= max_tokens:
+            observe("chunk_tokens", tokens)
+            yield replace(unit, tokens=tokens)
+            continue
+
+        chunks = list(chunk_by_tokens(unit.text, max_tokens, overlap_tokens))
+        for part, (chunk, context, chunk_tokens) in enumerate(chunks, start=1):
+            observe("chunk_tokens", chunk_tokens)
+            yield replace(
+                unit,
+                text=chunk,
+                context=context,
+                tokens=chunk_tokens,
+                part=part,
+                parts=len(chunks)
+            )
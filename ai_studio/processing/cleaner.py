@@ -1,5 +1,19 @@
 # processing/cleaner.py
 import re
+from dataclasses import replace
+
+
+def _normalize(text: str) -> str:
+    # Normalize whitespace
+    text = re.sub(r"\s+", " ", text)
+
+    # Remove common PDF artifacts
+    text = re.sub(r"\b(Page|page)\s+\d+\b", "", text)
+
+    # Remove repeated separators
+    text = re.sub(r"[_\-]{2,}", " ", text)
+
+    return text.strip()
 
 
 def clean_text(text: str) -> str:
@@ -11,13 +25,15 @@ def clean_text(text: str) -> str:
     if not text or not text.strip():
         raise ValueError("Empty text cannot be cleaned")
 
-    # Normalize whitespace
-    text = re.sub(r"\s+", " ", text)
+    return _normalize(text)
 
-    # Remove common PDF artifacts
-    text = re.sub(r"\b(Page|page)\s+\d+\b", "", text)
 
-    # Remove repeated separators
-    text = re.sub(r"[_\-]{2,}", " ", text)
-
-    return text.strip()
+def clean_units(units):
+    """
+    Cleans a stream of SourceUnits one at a time, dropping units left
+    empty, so slide/page boundaries survive cleaning.
+    """
+    for unit in units:
+        text = _normalize(unit.text)
+        if text:
+            yield replace(unit, text=text, title=_normalize(unit.title))
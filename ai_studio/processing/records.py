@@ -0,0 +1,23 @@
+# processing/records.py
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SourceUnit:
+    """
+    One slide (PPTX) or page (PDF) of extracted text, as it flows
+    through loaders → cleaner → chunker.
+
+    The chunker fills in `tokens`. When a unit over the budget is split
+    it sets `part` / `parts`, and `context` carries the tail of the
+    previous part (read by the LLM, not narrated); every other unit
+    passes through as part 1 of 1.
+    """
+    kind: str                       # "slide" | "page"
+    number: int                     # 1-based position in the document
+    text: str
+    title: str = ""
+    part: int = 1
+    parts: int = 1
+    tokens: int = 0
+    context: str = ""
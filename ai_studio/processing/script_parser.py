@@ -0,0 +1,131 @@
+# processing/script_parser.py
+import re
+
+SLIDE_HEADER_RE = re.compile(r"^slide\s+(\d+)\s*:?", re.IGNORECASE)
+
+
+def parse_slides_from_script(script: str) -> list[dict]:
+    slides = []
+    current = None
+
+    for raw_line in script.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        match = SLIDE_HEADER_RE.match(line)
+        if match:
+            if current:
+                slides.append(current)
+
+            slide_num = match.group(1)
+            current = {
+                "title": f"Slide {slide_num}:",
+                "text": ""
+            }
+            continue
+
+        if current:
+            current["text"] += line + " "
+
+    if current:
+        slides.append(current)
+
+    # Fallback safety
+    if not slides:
+        slides = [{
+            "title": "Slide 1:",
+            "text": script.strip()
+        }]
+
+    return slides
+
+
+def split_script_blocks(script: str) -> list[str]:
+    """
+    Splits a script into the raw text of each `Slide N:` block, header
+    included. Blocks line up 1:1 with parse_slides_from_script; text
+    before the first header is kept with the first block.
+    """
+    blocks = []
+    current = []
+
+    for raw_line in script.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        if SLIDE_HEADER_RE.match(line) and current and any(
+            SLIDE_HEADER_RE.match(l) for l in current
+        ):
+            blocks.append("\n".join(current))
+            current = []
+
+        current.append(line)
+
+    if current:
+        blocks.append("\n".join(current))
+
+    return blocks or [script.strip()]
+
+
+class SlideStreamParser:
+    """
+    Incremental splitter for streamed LLM output.
+
+    Text is fed in arbitrary chunks; a `Slide N:` block is emitted once
+    the following header line has fully arrived, and the last block on
+    finish(). Each block is {"slide", "title", "text"}.
+    """
+
+    def __init__(self):
+        self._pending = ""          # trailing partial line
+        self._lines: list[str] = []  # lines of the open block
+
+    def feed(self, text: str) -> list[dict]:
+        self._pending += text
+        *complete, self._pending = self._pending.split("\n")
+
+        done = []
+        for line in complete:
+            done.extend(self._push(line))
+
+        return done
+
+    def finish(self) -> list[dict]:
+        done = self._push(self._pending)
+        self._pending = ""
+
+        if self._lines:
+            done.append(self._close())
+
+        return done
+
+    def _push(self, line: str) -> list[dict]:
+        stripped = line.strip()
+        if not stripped:
+            return []
+
+        done = []
+        if SLIDE_HEADER_RE.match(stripped) and self._has_header():
+            done.append(self._close())
+
+        self._lines.append(stripped)
+        return done
+
+    def _has_header(self) -> bool:
+        return any(SLIDE_HEADER_RE.match(l) for l in self._lines)
+
+    def _close(self) -> dict:
+        raw = "\n".join(self._lines)
+        self._lines = []
+
+        slide = parse_slides_from_script(raw)[0]
+        match = SLIDE_HEADER_RE.match(raw)
+
+        return {
+            "slide": int(match.group(1)) if match else 1,
+            "title": slide["title"],
+            "text": slide["text"].strip(),
+            "raw": raw
+        }
@@ -0,0 +1,155 @@
+# processing/slide_alignment.py
+"""
+Slide boundaries from the words actually spoken.
+
+The transcript (Whisper or aligner words) is aligned token-by-token to
+the script slides with a banded LCS: only cells within `band` of the
+diagonal are filled, one NumPy pass per script token, so long scripts
+stay at O(n · band) time and memory instead of O(n · m). Each spoken
+word then inherits the slide of the script token it matched (unmatched
+words the slide of the previous match), and a slide starts at its first
+word.
+"""
+import re
+
+import numpy as np
+
+from processing.word_timeline import WordTimeline
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+# minimum half-width of the band, in tokens; by default it grows with
+# the square root of the length, which absorbs local drift (skipped or
+# inserted passages) without going quadratic
+MIN_BAND = 64
+
+
+def tokenize(text: str) -> list[str]:
+    return [t.lower() for t in _TOKEN_RE.findall(text)]
+
+
+def _word_token(word: str) -> str:
+    # one transcript word → one token ("model's" → "models", "1." → "1")
+    return "".join(tokenize(word))
+
+
+def align_tokens(a: list[str], b: list[str], band: int | None = None) -> np.ndarray:
+    """
+    Monotone alignment of `b` onto `a`: for every token of `b`, the index
+    of its matched token in `a`, or -1. Maximises the number of matches
+    within a diagonal band (exact when the band covers the whole
+    matrix).
+    """
+    n, m = len(a), len(b)
+    matched = np.full(m, -1, dtype=np.int64)
+    if not n or not m:
+        return matched
+
+    vocab = {}
+    a_ids = np.array([vocab.setdefault(t, len(vocab)) for t in a], dtype=np.int64)
+    b_ids = np.array([vocab.get(t, -1) for t in b], dtype=np.int64)
+
+    if band is None:
+        band = max(MIN_BAND, int(2 * max(n, m) ** 0.5))
+
+    # row i covers columns [lo[i], hi[i]) of the (n+1) x (m+1) LCS table,
+    # centred on the diagonal j = i * m / n
+    centre = np.arange(n + 1) * m / n
+    lo = np.clip(np.floor(centre - band), 0, m).astype(np.int64)
+    hi = np.clip(np.ceil(centre + band) + 1, 1, m + 1).astype(np.int64)
+
+    lo, hi = lo.tolist(), hi.tolist()
+    b_padded = np.concatenate(([-2], b_ids))   # column j ↔ b[j - 1]
+
+    # each stored row is prefixed with a 0, so index 0 stands for
+    # "left of the band" (a lower bound); past its right edge a row keeps
+    # its last value (rows are non-decreasing)
+    rows = [np.zeros(hi[0] - lo[0] + 1, dtype=np.int32)]
+
+    for i in range(1, n + 1):
+        l, h = lo[i], hi[i]
+        prev = rows[i - 1]
+        # previous row at columns l-1 .. h-1
+        idx = np.clip(np.arange(l - 1 - lo[i - 1], h - lo[i - 1]), -1, len(prev) - 2) + 1
+        above = prev[idx]
+        hit = b_padded[l:h] == a_ids[i - 1]
+        best = np.maximum(above[1:], above[:-1] + hit)
+        row = np.empty(h - l + 1, dtype=np.int32)
+        row[0] = 0
+        np.maximum.accumulate(best, out=row[1:])
+        rows.append(row)
+
+    a_list, b_list = a_ids.tolist(), b_ids.tolist()
+
+    def value(i: int, j: int) -> int:
+        row = rows[i]
+        k = min(max(j - lo[i], -1), len(row) - 2) + 1
+        return int(row[k])
+
+    # trace back from the bottom-right corner
+    i, j = n, m
+    while i > 0 and j > 0:
+        current = value(i, j)
+        if b_list[j - 1] == a_list[i - 1] and current == value(i - 1, j - 1) + 1:
+            matched[j - 1] = i - 1
+            i -= 1
+            j -= 1
+        elif current == value(i - 1, j):
+            i -= 1
+        else:
+            j -= 1
+
+    return matched
+
+
+def word_slides(slide_texts: list[str], words: list[str], band: int | None = None) -> np.ndarray:
+    """
+    Slide index of every transcript word (non-decreasing).
+    """
+    script_tokens = []
+    token_slide = []
+    for idx, text in enumerate(slide_texts):
+        tokens = tokenize(text)
+        script_tokens += tokens
+        token_slide += [idx] * len(tokens)
+
+    matched = align_tokens(script_tokens, [_word_token(w) for w in words], band)
+    token_slide = np.asarray(token_slide, dtype=np.int64)
+
+    slides = np.where(matched >= 0, token_slide[np.maximum(matched, 0)], -1)
+    # unmatched words stay with the slide before them (leading ones: slide 0)
+    return np.maximum.accumulate(np.maximum(slides, 0)) if len(slides) else slides
+
+
+def slide_boundaries(
+    slide_texts: list[str],
+    timeline: WordTimeline,
+    duration: float,
+    band: int | None = None
+) -> list[dict]:
+    """
+    [{"slide_index", "start", "end"}] for each slide: a slide starts at
+    its first spoken word and ends where the next one starts. Slides no
+    word matched get a zero-length span at that point.
+    """
+    count = len(slide_texts)
+    if not len(timeline):
+        return [
+            {"slide_index": idx, "start": 0.0, "end": round(duration, 2)} if idx == 0
+            else {"slide_index": idx, "start": round(duration, 2), "end": round(duration, 2)}
+            for idx in range(count)
+        ]
+
+    assigned = word_slides(slide_texts, timeline.words, band)
+    starts = timeline.starts
+
+    first = np.searchsorted(assigned, np.arange(count), side="left")
+    bounds = [0.0] + [
+        float(starts[f]) if f < len(starts) else float(duration)
+        for f in first[1:]
+    ] + [float(duration)]
+
+    return [
+        {"slide_index": idx, "start": round(bounds[idx], 2), "end": round(bounds[idx + 1], 2)}
+        for idx in range(count)
+    ]
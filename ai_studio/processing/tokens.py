@@ -0,0 +1,57 @@
+# processing/tokens.py
+import re
+import threading
+
+from config.settings import TOKENIZER, TOKENIZER_MODEL
+
+# ---------------- ESTIMATOR ----------------
+# Offline stand-in for the Gemini SentencePiece vocabulary: short words
+# are one token, long words one per ~6 letters, and every digit and
+# punctuation mark is a token of its own.
+
+_PIECE_RE = re.compile(r"[^\W\d_]+|\d|[^\w\s]|_")
+
+
+def estimate_tokens(text: str) -> int:
+    count = 0
+
+    for piece in _PIECE_RE.findall(text):
+        count += 1 + (len(piece) - 1) // 6 if piece.isalpha() else 1
+
+    return count
+
+
+# ---------------- GEMINI TOKENIZER ----------------
+# TOKENIZER=gemini counts with google-genai's LocalTokenizer (needs
+# sentencepiece and a one-off vocabulary download); if it cannot be
+# loaded the estimator is used instead.
+
+_local_tokenizer = None
+_local_failed = False
+_local_lock = threading.Lock()
+
+
+def _get_local_tokenizer():
+    global _local_tokenizer, _local_failed
+
+    with _local_lock:
+        if _local_tokenizer is None and not _local_failed:
+            try:
+                from google.genai.local_tokenizer import LocalTokenizer
+                _local_tokenizer = LocalTokenizer(model_name=TOKENIZER_MODEL)
+            except Exception:
+                _local_failed = True
+
+    return _local_tokenizer
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+
+    if TOKENIZER == "gemini":
+        tokenizer = _get_local_tokenizer()
+        if tokenizer is not None:
+            return tokenizer.count_tokens(text).total_tokens
+
+    return estimate_tokens(text)
@@ -0,0 +1,185 @@
+# processing/word_timeline.py
+"""
+Word timings as parallel arrays instead of one dict per word.
+
+`starts`/`ends` are float32 seconds and `ids` index an interned word
+table shared between a timeline and its slices, so slicing (per-slide
+views, time-range queries) never copies, and the arrays map 1:1 onto
+the binary timeline file.
+"""
+import numpy as np
+
+TIME_DTYPE = np.dtype("<f4")
+ID_DTYPE = np.dtype("<u4")
+
+# float32 keeps ~0.25 ms resolution an hour in; exported times are
+# rounded back to ms so dicts stay as readable as the aligner output
+EXPORT_DECIMALS = 3
+
+
+class WordTimeline:
+    __slots__ = ("starts", "ends", "ids", "table")
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, ids: np.ndarray, table: list[str]):
+        self.starts = starts
+        self.ends = ends
+        self.ids = ids
+        self.table = table
+
+    # ---------------- BUILD ----------------
+
+    @classmethod
+    def empty(cls) -> "WordTimeline":
+        return cls(
+            np.empty(0, dtype=TIME_DTYPE),
+            np.empty(0, dtype=TIME_DTYPE),
+            np.empty(0, dtype=ID_DTYPE),
+            []
+        )
+
+    @classmethod
+    def from_words(cls, words: list[dict]) -> "WordTimeline":
+        """
+        From {"word", "start", "end"} dicts, ordered by start (stable, so
+        words sharing a start keep their order).
+        """
+        count = len(words)
+        starts = np.fromiter((w["start"] for w in words), dtype=TIME_DTYPE, count=count)
+        ends = np.fromiter((w["end"] for w in words), dtype=TIME_DTYPE, count=count)
+
+        vocab = {}
+        ids = np.fromiter(
+            (vocab.setdefault(w["word"], len(vocab)) for w in words),
+            dtype=ID_DTYPE,
+            count=count
+        )
+
+        order = np.argsort(starts, kind="stable")
+        if count and np.any(order != np.arange(count)):
+            starts, ends, ids = starts[order], ends[order], ids[order]
+
+        return cls(starts, ends, ids, list(vocab))
+
+    @classmethod
+    def concat(cls, timelines: list["WordTimeline"], offsets: list[float] | None = None) -> "WordTimeline":
+        """
+        Joins timelines end to end, shifting each by its offset (e.g. the
+        per-slide segment start), with one merged word table.
+        """
+        if not timelines:
+            return cls.empty()
+
+        offsets = offsets if offsets is not None else [0.0] * len(timelines)
+        vocab = {}
+        starts, ends, ids = [], [], []
+
+        for timeline, offset in zip(timelines, offsets):
+            remap = np.fromiter(
+                (vocab.setdefault(word, len(vocab)) for word in timeline.table),
+                dtype=ID_DTYPE,
+                count=len(timeline.table)
+            )
+            starts.append(timeline.starts + TIME_DTYPE.type(offset))
+            ends.append(timeline.ends + TIME_DTYPE.type(offset))
+            ids.append(remap[timeline.ids] if len(timeline) else timeline.ids)
+
+        return cls(
+            np.concatenate(starts).astype(TIME_DTYPE, copy=False),
+            np.concatenate(ends).astype(TIME_DTYPE, copy=False),
+            np.concatenate(ids).astype(ID_DTYPE, copy=False),
+            list(vocab)
+        )
+
+    def copy(self) -> "WordTimeline":
+        """
+        Detached copy (e.g. to outlive the file mapping a view points into).
+        """
+        return WordTimeline(self.starts.copy(), self.ends.copy(), self.ids.copy(), list(self.table))
+
+    def shift(self, offset: float) -> "WordTimeline":
+        return WordTimeline(
+            self.starts + TIME_DTYPE.type(offset),
+            self.ends + TIME_DTYPE.type(offset),
+            self.ids,
+            self.table
+        )
+
+    # ---------------- QUERY ----------------
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, key: slice) -> "WordTimeline":
+        """
+        Zero-copy view over a contiguous run of words.
+        """
+        if not isinstance(key, slice):
+            raise TypeError("WordTimeline supports slicing only; use word(i)")
+        return WordTimeline(self.starts[key], self.ends[key], self.ids[key], self.table)
+
+    def word(self, index: int) -> str:
+        return self.table[int(self.ids[index])]
+
+    @property
+    def words(self) -> list[str]:
+        return [self.table[i] for i in self.ids.tolist()]
+
+    def index_range(self, start: float, end: float) -> tuple[int, int]:
+        """
+        [lo, hi) of the words whose start falls in [start, end).
+        """
+        lo, hi = np.searchsorted(self.starts, [start, end], side="left")
+        return int(lo), int(hi)
+
+    def between(self, start: float, end: float) -> "WordTimeline":
+        lo, hi = self.index_range(start, end)
+        return self[lo:hi]
+
+    def active_index(self, t: float) -> int:
+        """
+        Index of the word being spoken at `t`, or -1 between words.
+        """
+        idx = int(np.searchsorted(self.starts, t, side="right")) - 1
+        if idx < 0 or t > self.ends[idx]:
+            return -1
+        return idx
+
+    def split_offsets(self, slide_starts: list[float]) -> np.ndarray:
+        """
+        Word offsets of each slide (len(slide_starts) + 1 entries): a word
+        belongs to the slide its start falls in; the first slide also
+        takes anything before it, the last one anything after.
+        """
+        offsets = np.searchsorted(self.starts, slide_starts, side="left")
+        if len(offsets):
+            offsets[0] = 0
+        return np.append(offsets, len(self))
+
+    def split(self, slide_starts: list[float]) -> list["WordTimeline"]:
+        offsets = self.split_offsets(slide_starts).tolist()
+        return [self[offsets[i]:offsets[i + 1]] for i in range(len(slide_starts))]
+
+    # ---------------- EXPORT ----------------
+
+    def columns(self) -> dict:
+        """
+        JSON-ready parallel arrays: {"words", "starts", "ends"}.
+        """
+        return {
+            "words": self.words,
+            "starts": np.round(self.starts.astype(np.float64), EXPORT_DECIMALS).tolist(),
+            "ends": np.round(self.ends.astype(np.float64), EXPORT_DECIMALS).tolist()
+        }
+
+    def to_words(self) -> list[dict]:
+        """
+        Word dicts as the aligners produce them ({"id", "word", "start",
+        "end"}; ids are positions in the timeline).
+        """
+        columns = self.columns()
+        return [
+            {"id": idx, "word": word, "start": start, "end": end}
+            for idx, (word, start, end) in enumerate(zip(
+                columns["words"], columns["starts"], columns["ends"]
+            ))
+        ]
@@ -0,0 +1,88 @@
+# services/readiness.py
+"""
+Which heavy engines are loaded, and optional warm-up at boot.
+
+Everything heavy (Gemini SDK, document loaders, gTTS, Whisper replicas)
+loads on first use, so the app starts serving /health right away. With
+WARMUP set, the listed engines are loaded in a background thread after
+start-up instead, and /ready reports 503 until they are warm.
+"""
+import threading
+
+from config.settings import ALIGNMENT_MODE, WARMUP
+from llm.gemini_client import client_ready, warm_client
+from loaders.pdf_loader import pdf_ready, warm_pdf
+from loaders.ppt_loader import pptx_ready, warm_pptx
+from tts.alignment_service import alignment_ready, get_alignment_service
+from tts.audio_generator import tts_ready, warm_tts
+
+# engine → (is warm?, load it), in warm-up order
+ENGINES = {
+    "llm": (client_ready, warm_client),
+    "pdf": (pdf_ready, warm_pdf),
+    "pptx": (pptx_ready, warm_pptx),
+    "tts": (tts_ready, warm_tts),
+    "alignment": (alignment_ready, lambda: get_alignment_service().warmup()),
+}
+
+_errors: dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def warmup_engines() -> list[str]:
+    """
+    The engines WARMUP asks for: a comma-separated list, or "all"
+    (Whisper only when it is the default alignment mode).
+    """
+    names = [name.strip() for name in WARMUP.split(",") if name.strip()]
+
+    if names == ["all"]:
+        return [
+            name for name in ENGINES
+            if name != "alignment" or ALIGNMENT_MODE == "whisper"
+        ]
+
+    unknown = set(names) - set(ENGINES)
+    if unknown:
+        raise ValueError(f"Unknown WARMUP engines: {', '.join(sorted(unknown))}")
+
+    return names
+
+
+def warm(names: list[str]):
+    for name in names:
+        try:
+            ENGINES[name][1]()
+        except Exception as e:
+            # reported by /ready; the engine still loads on first use
+            with _lock:
+                _errors[name] = str(e)
+
+
+def start_warmup() -> threading.Thread | None:
+    names = warmup_engines()
+    if not names:
+        return None
+
+    thread = threading.Thread(target=warm, args=(names,), name="warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def readiness() -> dict:
+    """
+    {"ready", "engines": {name: warm?}, "waiting_for", "errors"}: ready
+    once every engine WARMUP asked for is warm.
+    """
+    engines = {name: is_warm() for name, (is_warm, _) in ENGINES.items()}
+    waiting = [name for name in warmup_engines() if not engines[name]]
+
+    with _lock:
+        errors = dict(_errors)
+
+    return {
+        "ready": not waiting,
+        "engines": engines,
+        "waiting_for": waiting,
+        "errors": errors
+    }
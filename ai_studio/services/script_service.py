@@ -1,39 +1,197 @@
-from loaders.pdf_loader import load_pdf
-from loaders.ppt_loader import load_ppt
-from processing.cleaner import clean_text
-from processing.chunker import chunk_text
-from llm.script_generator import generate_slidewise_script
+import hashlib
 
+from config.settings import (
+    SCRIPT_CACHE_ENABLED,
+    SCRIPT_CACHE_DIR,
+    SCRIPT_CACHE_MAX_BYTES
+)
+from loaders.pdf_loader import iter_pdf_units
+from loaders.ppt_loader import iter_ppt_units
+from processing.cleaner import clean_units
+from processing.chunker import chunk_units
+from llm.gemini_client import DEFAULT_MODEL
+from llm.prompt_templates import get_slidewise_template
+from llm.script_generator import (
+    generate_slidewise_script,
+    stream_slidewise_script
+)
+from processing.script_parser import SlideStreamParser
+from monitoring.metrics import observe_size, timed_iter
+from services.stage_pools import run_stage
+from storage.disk_cache import DiskCache, source_digest
 
-def generate_script_from_file(
-    file_path: str,
-    tone: str = "educational"
+
+script_cache = DiskCache(
+    SCRIPT_CACHE_DIR,
+    max_bytes=SCRIPT_CACHE_MAX_BYTES,
+    suffix=".txt"
+)
+
+
+def script_cache_key(
+    file_hash: str,
+    tone: str,
+    model: str = DEFAULT_MODEL
 ) -> str:
-    # 1️⃣ Load document
-    if file_path.lower().endswith(".pdf"):
-        raw_text = load_pdf(file_path)
-    elif file_path.lower().endswith(".pptx"):
-        raw_text = load_ppt(file_path)
-    else:
-        raise ValueError("Unsupported file format")
-
-    if not raw_text.strip():
-        raise ValueError("No readable text found in file")
+    raw = "|".join([file_hash, tone, model, get_slidewise_template().version])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def iter_source_units(file_path, filename: str | None = None):
+    """
+    Streams the document as SourceUnits (one per slide or page).
+
+    `file_path` may be a path or an in-memory/mmap buffer; buffers need
+    `filename` to pick the loader.
+    """
+    name = (filename or str(file_path)).lower()
+
+    if name.endswith(".pdf"):
+        return timed_iter("load_pdf", iter_pdf_units(file_path))
+    if name.endswith(".pptx"):
+        return timed_iter("load_ppt", iter_ppt_units(file_path))
+
+    raise ValueError("Unsupported file format")
+
 
-    # 2️⃣ Clean + chunk
-    cleaned_text = clean_text(raw_text)
-    chunks = list(chunk_text(cleaned_text))
+def iter_slides(file_path, filename: str | None = None):
+    """
+    Load → clean → chunk as one generator pipeline: each source slide or
+    page becomes one prompt slide, and only a slide over the chunk budget
+    is split. Nothing holds more than one unit of text at a time.
+    """
+    units = iter_source_units(file_path, filename)
+    units = timed_iter("clean_text", clean_units(units))
+    units = timed_iter("chunk_text", chunk_units(units))
 
-    if not chunks:
-        raise ValueError("No meaningful content after processing")
+    sources = {}
+    words = tokens = 0
 
-    # 3️⃣ Convert chunks → slide-wise structure
-    slides = [
-        {
-            "slide": idx + 1,
-            "content": chunk
+    for idx, unit in enumerate(units, start=1):
+        sources[unit.kind] = sources.get(unit.kind, 0) + (unit.part == 1)
+        words += len(unit.text.split())
+        tokens += unit.tokens
+
+        yield {
+            "slide": idx,
+            "content": unit.text,
+            "title": unit.title,
+            "context": unit.context,
+            "tokens": unit.tokens
         }
-        for idx, chunk in enumerate(chunks, start=1)
-    ]
 
-    return generate_slidewise_script(slides, tone=tone)
\ No newline at end of file
+    for kind, count in sources.items():
+        observe_size(f"{kind}s", count)
+    observe_size("words", words)
+    observe_size("tokens", tokens)
+
+
+def load_slides(file_path, filename: str | None = None) -> list[dict]:
+    """
+    The slide structure the generator expects (see iter_slides).
+    """
+    slides = list(iter_slides(file_path, filename))
+
+    if not slides:
+        raise ValueError("No readable text found in file")
+
+    return slides
+
+
+def lookup_cached_script(
+    file_path,
+    tone: str = "educational"
+) -> tuple[str, str | None]:
+    """
+    Returns (cache_key, cached script or None).
+    """
+    cache_key = script_cache_key(source_digest(file_path), tone)
+    cached = script_cache.get(cache_key)
+
+    return cache_key, cached.decode("utf-8") if cached is not None else None
+
+
+def store_cached_script(cache_key: str, script: str):
+    script_cache.set(cache_key, script.encode("utf-8"))
+
+
+def generate_script_from_file(
+    file_path,
+    tone: str = "educational",
+    use_cache: bool = True,
+    filename: str | None = None
+) -> str:
+    use_cache = use_cache and SCRIPT_CACHE_ENABLED
+
+    # Cache lookup (same bytes + tone + model + prompt → same script)
+    if use_cache:
+        cache_key, cached = lookup_cached_script(file_path, tone)
+        if cached is not None:
+            return cached
+
+    slides = load_slides(file_path, filename)
+    script = generate_slidewise_script(slides, tone=tone)
+
+    if use_cache:
+        store_cached_script(cache_key, script)
+
+    return script
+
+
+async def agenerate_script_from_file(
+    file_path,
+    tone: str = "educational",
+    use_cache: bool = True,
+    filename: str | None = None
+) -> str:
+    """
+    generate_script_from_file for async routes: each step waits on its
+    stage pool (hashing, cache and loading on "extract", which hands
+    parsing to "cpu"; the Gemini calls on "llm"), never on the event loop.
+    """
+    use_cache = use_cache and SCRIPT_CACHE_ENABLED
+
+    if use_cache:
+        cache_key, cached = await run_stage("extract", lookup_cached_script, file_path, tone)
+        if cached is not None:
+            return cached
+
+    slides = await run_stage("extract", load_slides, file_path, filename)
+    script = await run_stage("llm", generate_slidewise_script, slides, tone=tone)
+
+    if use_cache:
+        await run_stage("extract", store_cached_script, cache_key, script)
+
+    return script
+
+
+def stream_script_from_file(
+    file_path,
+    tone: str = "educational",
+    use_cache: bool = True,
+    filename: str | None = None
+):
+    """
+    Like generate_script_from_file, but yields each slide block
+    ({"slide", "title", "text", "raw"}) as soon as it is complete.
+    The assembled script is cached once the stream finishes.
+    """
+    use_cache = use_cache and SCRIPT_CACHE_ENABLED
+
+    if use_cache:
+        cache_key, cached = lookup_cached_script(file_path, tone)
+        if cached is not None:
+            parser = SlideStreamParser()
+            yield from parser.feed(cached)
+            yield from parser.finish()
+            return
+
+    slides = load_slides(file_path, filename)
+    blocks = []
+
+    for block in stream_slidewise_script(slides, tone=tone):
+        blocks.append(block["raw"])
+        yield block
+
+    if use_cache and blocks:
+        store_cached_script(cache_key, "\n\n".join(blocks))
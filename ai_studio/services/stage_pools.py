@@ -0,0 +1,71 @@
+# services/stage_pools.py
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from config.settings import CPU_WORKERS, EXTRACT_WORKERS, LLM_WORKERS, TTS_WORKERS
+from monitoring.metrics import bind_context
+
+# One bounded pool per pipeline stage, so a burst of slow LLM calls
+# cannot starve document extraction or narration (and vice versa).
+# Thread stages wait on I/O (files, Gemini, gTTS, the Whisper service)
+# or orchestrate; pure-Python parsing and alignment go to the "cpu"
+# process pool, where they don't take turns on the GIL with the server.
+_THREAD_POOL_SIZES = {
+    "extract": EXTRACT_WORKERS,
+    "llm": LLM_WORKERS,
+    "tts": TTS_WORKERS,
+}
+_PROCESS_POOL_SIZES = {
+    "cpu": CPU_WORKERS,
+}
+
+_pools: dict[str, Executor] = {}
+_lock = threading.Lock()
+
+
+def get_pool(stage: str) -> Executor:
+    if stage not in _THREAD_POOL_SIZES and stage not in _PROCESS_POOL_SIZES:
+        raise ValueError(f"Unknown pipeline stage: {stage}")
+
+    with _lock:
+        if stage not in _pools:
+            if stage in _PROCESS_POOL_SIZES:
+                # spawn: never fork a process that already runs server threads
+                _pools[stage] = ProcessPoolExecutor(
+                    max_workers=max(_PROCESS_POOL_SIZES[stage], 1),
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                _pools[stage] = ThreadPoolExecutor(
+                    max_workers=max(_THREAD_POOL_SIZES[stage], 1),
+                    thread_name_prefix=f"{stage}-stage"
+                )
+
+        return _pools[stage]
+
+
+def submit(stage: str, fn, *args, **kwargs) -> Future:
+    """
+    Runs `fn` on the stage's pool. Thread stages keep the caller's
+    request profile; process tasks must be picklable and their metrics
+    stay in the worker, so time them from the thread that waits.
+    """
+    if stage in _THREAD_POOL_SIZES:
+        fn = bind_context(fn)
+    return get_pool(stage).submit(fn, *args, **kwargs)
+
+
+async def run_stage(stage: str, fn, *args, **kwargs):
+    """
+    `submit` for async routes: the event loop waits without blocking.
+    """
+    return await asyncio.wrap_future(submit(stage, fn, *args, **kwargs))
+
+
+def shutdown_pools(wait: bool = False):
+    with _lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+        _pools.clear()
@@ -0,0 +1,236 @@
+# services/timeline_service.py
+"""
+Per-slide views over stored word timelines, for the timeline API: the
+player loads a small slide index up front and each slide's words only
+when it is about to be shown.
+"""
+import gzip
+import json
+import os
+import re
+import threading
+
+from config.settings import TIMELINE_COMPRESS
+from monitoring.metrics import timed
+from processing.slide_alignment import slide_boundaries
+from processing.word_timeline import WordTimeline
+from services.stage_pools import submit
+from storage.timeline_file import (
+    TIMELINE_SUFFIX,
+    TimelineFile,
+    encode_timeline,
+    load_timeline_meta,
+    read_timeline,
+    write_timeline
+)
+from tts.audio_generator import AUDIO_DIR, META_DIR
+
+try:
+    import brotli
+except ImportError:  # optional: exports are gzip-only without it
+    brotli = None
+
+AUDIO_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+# Content-Encoding → (file suffix, compressor), most preferred first
+EXPORT_ENCODINGS = {
+    **({"br": (".json.br", brotli.compress)} if brotli else {}),
+    "gzip": (".json.gz", lambda body: gzip.compress(body, compresslevel=9, mtime=0))
+}
+
+
+class TimelineNotFound(LookupError):
+    pass
+
+
+def timeline_path(audio_id: str) -> str:
+    """
+    The stored timeline of a narration: `.wtl`, or the JSON of an
+    artifact from before the binary format.
+    """
+    if not AUDIO_ID_RE.match(audio_id):
+        raise TimelineNotFound(audio_id)
+
+    for suffix in (TIMELINE_SUFFIX, ".json"):
+        path = os.path.join(META_DIR, audio_id + suffix)
+        if os.path.exists(path):
+            return path
+
+    raise TimelineNotFound(audio_id)
+
+
+def _open(audio_id: str) -> TimelineFile:
+    path = timeline_path(audio_id)
+    if path.endswith(TIMELINE_SUFFIX):
+        return read_timeline(path)
+
+    meta = load_timeline_meta(path)
+    timeline = WordTimeline.from_words(meta.pop("words"))
+    return TimelineFile(encode_timeline(timeline, meta))
+
+
+def assign_slide_timings(slides: list[dict], duration: float):
+    per_slide = duration / max(len(slides), 1)
+    t = 0.0
+
+    for idx, slide in enumerate(slides):
+        slide["start"] = round(t, 2)
+        slide["end"] = round(t + per_slide, 2)
+        slide["slide_index"] = idx
+        t += per_slide
+
+
+def attach_words_to_slides(slides: list[dict], timeline: WordTimeline):
+    """
+    Gives each timed slide a zero-copy view of its words: those whose
+    start falls inside the slide, so words crossing a boundary are kept.
+    """
+    views = timeline.split([slide["start"] for slide in slides])
+
+    for slide, view in zip(slides, views):
+        slide["words"] = view
+
+
+def _slide_bounds(file: TimelineFile, slide_count: int | None) -> list[tuple[float, float]]:
+    """
+    Slide start/end times: the offsets stored at synthesis time, or an
+    even split of the duration when the caller shows a different number
+    of slides.
+    """
+    stored = file.meta.get("slides") or []
+    if not stored or (slide_count is not None and slide_count != len(stored)):
+        duration = file.meta.get("duration") or _last_end(file.timeline)
+        stored = [{} for _ in range(max(slide_count or 1, 1))]
+        assign_slide_timings(stored, duration)
+
+    return [(s["start"], s["end"]) for s in stored]
+
+
+def _last_end(timeline: WordTimeline) -> float:
+    return round(float(timeline.ends[-1]), 2) if len(timeline) else 0.0
+
+
+def slide_index(audio_id: str, slide_count: int | None = None) -> dict:
+    with _open(audio_id) as file:
+        bounds = _slide_bounds(file, slide_count)
+        offsets = file.timeline.split_offsets([start for start, _ in bounds]).tolist()
+
+        return {
+            "audio_id": audio_id,
+            "audio_url": f"/{AUDIO_DIR}/{audio_id}.mp3",
+            "duration": file.meta.get("duration"),
+            "words": len(file),
+            "slides": [
+                {
+                    "slide_index": idx,
+                    "start": start,
+                    "end": end,
+                    "word_start": offsets[idx],
+                    "word_end": offsets[idx + 1]
+                }
+                for idx, (start, end) in enumerate(bounds)
+            ]
+        }
+
+
+def slide_words(audio_id: str, slide: int, slide_count: int | None = None) -> dict:
+    """
+    One slide's words as parallel arrays (words, starts, ends), ready
+    for binary search on the client.
+    """
+    with _open(audio_id) as file:
+        bounds = _slide_bounds(file, slide_count)
+        if not 0 <= slide < len(bounds):
+            raise TimelineNotFound(f"{audio_id}/{slide}")
+
+        offsets = file.timeline.split_offsets([start for start, _ in bounds])
+        lo, hi = int(offsets[slide]), int(offsets[slide + 1])
+
+        return {
+            "slide_index": slide,
+            "start": bounds[slide][0],
+            "end": bounds[slide][1],
+            "word_start": lo,
+            **file.timeline[lo:hi].columns()
+        }
+
+
+# ---------------- JSON EXPORT ----------------
+
+def timeline_export(audio_id: str, encoding: str) -> str:
+    """
+    Path of the precompressed JSON export of a timeline ("gzip" or
+    "br"), built for every available encoding on first request. The
+    export carries the words only (no slide offsets, which alignment
+    may rewrite), so it never changes once written.
+    """
+    if encoding not in EXPORT_ENCODINGS:
+        raise ValueError(f"Unsupported export encoding: {encoding}")
+
+    path = os.path.join(META_DIR, audio_id + EXPORT_ENCODINGS[encoding][0])
+    if os.path.exists(path):
+        return path
+
+    with _open(audio_id) as file:
+        body = json.dumps(
+            {
+                "audio_id": audio_id,
+                "duration": file.meta.get("duration") or _last_end(file.timeline),
+                "words": file.timeline.to_words()
+            },
+            separators=(",", ":")
+        ).encode("utf-8")
+
+    for suffix, compress in EXPORT_ENCODINGS.values():
+        out_path = os.path.join(META_DIR, audio_id + suffix)
+        tmp_path = f"{out_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(compress(body))
+            os.replace(tmp_path, out_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    return path
+
+
+# ---------------- SLIDE ALIGNMENT ----------------
+
+def align_slides(audio_id: str, slide_texts: list[str]) -> bool:
+    """
+    Makes the stored slide offsets match `slide_texts`. When they don't
+    (artifacts from before per-slide synthesis, or a different slide
+    split), the spoken words are aligned to the slide texts and the
+    derived boundaries are written back into the timeline, so the
+    timeline API serves them from then on. Returns True if it rewrote
+    the timeline.
+    """
+    with _open(audio_id) as file:
+        stored = file.meta.get("slides") or []
+        if len(stored) == len(slide_texts):
+            return False
+
+        # copied: the mapping closes with the file
+        timeline = file.timeline.copy()
+        meta = dict(file.meta)
+
+    meta.setdefault("audio_id", audio_id)
+    meta["duration"] = meta.get("duration") or _last_end(timeline)
+
+    # the word/slide matching is pure Python: run it on the "cpu" pool
+    with timed("slide_alignment"):
+        meta["slides"] = submit(
+            "cpu", slide_boundaries, slide_texts, timeline, meta["duration"]
+        ).result()
+
+    path = os.path.join(META_DIR, audio_id + TIMELINE_SUFFIX)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write_timeline(tmp_path, timeline, meta, compress=TIMELINE_COMPRESS)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return True
@@ -0,0 +1,154 @@
+# storage/disk_cache.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+
+def file_digest(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Streams a file through SHA-256 without loading it into memory.
+    """
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def source_digest(source) -> str:
+    """
+    SHA-256 of a document given as a path or an in-memory buffer
+    (BytesIO, mmap, bytes).
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return file_digest(source)
+
+    if hasattr(source, "getbuffer"):
+        return hashlib.sha256(source.getbuffer()).hexdigest()
+
+    return hashlib.sha256(source).hexdigest()
+
+
+class DiskCache:
+    """
+    Disk-backed key/value store with size-bounded LRU eviction.
+
+    Each entry is one file under `directory`. Recency is tracked in
+    memory and rebuilt from file mtimes on start-up, so the LRU order
+    survives restarts. Keys must be filename-safe (hex digests).
+    """
+
+    def __init__(self, directory: str, max_bytes: int, suffix: str = ".bin"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def _load_index(self):
+        found = []
+
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.suffix):
+                continue
+
+            st = os.stat(os.path.join(self.directory, name))
+            found.append((st.st_mtime, name[:-len(self.suffix)], st.st_size))
+
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._size += size
+
+    # ---------------- READ ----------------
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # persist recency for the next start-up
+        except FileNotFoundError:
+            with self._lock:
+                self._size -= self._entries.pop(key, 0)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+
+        return data
+
+    # ---------------- WRITE ----------------
+
+    def set(self, key: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._size -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._size += len(data)
+            self._evict()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._size -= self._entries.pop(key, 0)
+
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        # caller holds the lock
+        while self._size > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    # ---------------- STATS ----------------
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
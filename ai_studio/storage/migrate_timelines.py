@@ -0,0 +1,128 @@
+# storage/migrate_timelines.py
+"""
+Converts audio_meta JSON files to binary `.wtl` timelines, or exports
+timelines back to JSON.
+
+    python -m storage.migrate_timelines                     # JSON → .wtl, removes the JSON
+    python -m storage.migrate_timelines --keep-json --compress
+    python -m storage.migrate_timelines --export-json       # .wtl → JSON next to it
+    python -m storage.migrate_timelines --dry-run
+"""
+import argparse
+import os
+import sys
+
+from mutagen.mp3 import MP3
+
+from processing.word_timeline import WordTimeline
+from storage.timeline_file import (
+    TIMELINE_SUFFIX,
+    export_json,
+    load_timeline_meta,
+    write_timeline
+)
+
+META_DIR = "static/audio_meta"
+AUDIO_DIR = "static/audio"
+
+
+def _duration(audio_id: str, timeline: WordTimeline) -> float:
+    # early metadata was a bare word list with no duration
+    audio_path = os.path.join(AUDIO_DIR, f"{audio_id}.mp3")
+    if os.path.exists(audio_path):
+        return round(MP3(audio_path).info.length, 2)
+    return round(float(timeline.ends[-1]), 2) if len(timeline) else 0.0
+
+
+def migrate_file(json_path: str, compress: bool = False, keep_json: bool = False) -> tuple[int, int]:
+    """
+    Writes the `.wtl` beside `json_path`; returns (json bytes, wtl bytes).
+    """
+    audio_id = os.path.splitext(os.path.basename(json_path))[0]
+    meta = load_timeline_meta(json_path)
+    timeline = WordTimeline.from_words(meta["words"])
+
+    out_path = os.path.join(os.path.dirname(json_path), audio_id + TIMELINE_SUFFIX)
+    tmp_path = out_path + ".tmp"
+
+    write_timeline(
+        tmp_path,
+        timeline,
+        {
+            "audio_id": meta.get("audio_id", audio_id),
+            "duration": meta.get("duration") or _duration(audio_id, timeline),
+            "slides": meta.get("slides", [])
+        },
+        compress=compress
+    )
+    os.replace(tmp_path, out_path)
+
+    sizes = os.path.getsize(json_path), os.path.getsize(out_path)
+    if not keep_json:
+        os.remove(json_path)
+
+    return sizes
+
+
+def migrate_dir(
+    directory: str = META_DIR,
+    compress: bool = False,
+    keep_json: bool = False,
+    dry_run: bool = False
+) -> dict:
+    migrated, failed = 0, 0
+    before = after = 0
+
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+
+        path = os.path.join(directory, name)
+        if dry_run:
+            print(f"would migrate {path}", file=sys.stderr)
+            migrated += 1
+            continue
+
+        try:
+            json_bytes, wtl_bytes = migrate_file(path, compress=compress, keep_json=keep_json)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"skipped {path}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+
+        migrated += 1
+        before += json_bytes
+        after += wtl_bytes
+
+    return {"migrated": migrated, "failed": failed, "json_bytes": before, "wtl_bytes": after}
+
+
+def export_dir(directory: str = META_DIR) -> int:
+    exported = 0
+
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(TIMELINE_SUFFIX):
+            path = os.path.join(directory, name)
+            export_json(path, path[:-len(TIMELINE_SUFFIX)] + ".json")
+            exported += 1
+
+    return exported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dir", default=META_DIR)
+    parser.add_argument("--compress", action="store_true", help="zlib-compress the timelines")
+    parser.add_argument("--keep-json", action="store_true", help="Leave the JSON files in place")
+    parser.add_argument("--export-json", action="store_true", help="Export .wtl timelines as JSON instead")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    if args.export_json:
+        print(f"exported {export_dir(args.dir)} timelines")
+    else:
+        summary = migrate_dir(args.dir, args.compress, args.keep_json, args.dry_run)
+        print(
+            f"migrated {summary['migrated']} files ({summary['failed']} failed): "
+            f"{summary['json_bytes']} → {summary['wtl_bytes']} bytes"
+        )
@@ -0,0 +1,194 @@
+# storage/timeline_file.py
+"""
+Compact binary word timelines (`.wtl`), the on-disk form of audio_meta.
+
+Layout (little-endian), header then body:
+
+    magic "WTL1" | version u8 | flags u8 | reserved u16
+    word_count u32 | vocab_count u32 | meta_bytes u32
+
+    starts     float32[word_count]
+    ends       float32[word_count]
+    word_ids   uint32[word_count]      index into the word table
+    offsets    uint32[vocab_count + 1] byte offsets into the table blob
+    table      utf-8 bytes             distinct words, first-seen order
+    meta       utf-8 JSON              audio_id, duration, slides
+
+With FLAG_ZLIB the body is zlib-compressed (smaller, but read by
+decompressing); without it the arrays are memory-mapped in place.
+"""
+import json
+import mmap
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from processing.word_timeline import ID_DTYPE, TIME_DTYPE, WordTimeline
+
+MAGIC = b"WTL1"
+FORMAT_VERSION = 1
+FLAG_ZLIB = 1
+
+TIMELINE_SUFFIX = ".wtl"
+
+_HEADER = struct.Struct("<4sBBHIII")
+
+def encode_timeline(
+    timeline: WordTimeline,
+    meta: dict | None = None,
+    compress: bool = False
+) -> bytes:
+    """
+    Packs a WordTimeline and a small JSON `meta` dict into the binary
+    format. The arrays are written as they are; only the word table is
+    compacted to the ids actually used (a view may reference a larger
+    shared table).
+    """
+    count = len(timeline)
+    used, ids = np.unique(timeline.ids, return_inverse=True)
+    table = [timeline.table[i] for i in used.tolist()]
+
+    starts = timeline.starts.astype(TIME_DTYPE, copy=False)
+    ends = timeline.ends.astype(TIME_DTYPE, copy=False)
+    ids = ids.astype(ID_DTYPE, copy=False)
+
+    encoded = [word.encode("utf-8") for word in table]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+
+    meta_bytes = json.dumps(meta or {}, separators=(",", ":")).encode("utf-8")
+
+    body = b"".join([
+        starts.tobytes(),
+        ends.tobytes(),
+        ids.tobytes(),
+        offsets.tobytes(),
+        b"".join(encoded),
+        meta_bytes
+    ])
+
+    flags = 0
+    if compress:
+        body = zlib.compress(body, 6)
+        flags |= FLAG_ZLIB
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, flags, 0, count, len(table), len(meta_bytes))
+    return header + body
+
+
+def write_timeline(
+    path: str,
+    timeline: WordTimeline,
+    meta: dict | None = None,
+    compress: bool = False
+):
+    with open(path, "wb") as f:
+        f.write(encode_timeline(timeline, meta, compress=compress))
+
+
+class TimelineFile:
+    """
+    A decoded file: `timeline` is a WordTimeline whose arrays are views
+    straight over the file mapping (or the decompressed body), `meta`
+    the JSON metadata.
+    """
+
+    def __init__(self, buffer, mapping: mmap.mmap | None = None):
+        self._mapping = mapping
+
+        magic, version, flags, _, count, vocab, meta_len = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not a word timeline file")
+
+        if flags & FLAG_ZLIB:
+            buffer = zlib.decompress(memoryview(buffer)[_HEADER.size:])
+            offset = 0
+        else:
+            offset = _HEADER.size
+
+        def take(dtype: np.dtype, n: int) -> np.ndarray:
+            nonlocal offset
+            array = np.frombuffer(buffer, dtype=dtype, count=n, offset=offset)
+            offset += array.nbytes
+            return array
+
+        starts = take(TIME_DTYPE, count)
+        ends = take(TIME_DTYPE, count)
+        word_ids = take(ID_DTYPE, count)
+        table_offsets = take(ID_DTYPE, vocab + 1)
+
+        blob = bytes(memoryview(buffer)[offset:offset + int(table_offsets[-1])])
+        offset += len(blob)
+        table = [
+            blob[table_offsets[i]:table_offsets[i + 1]].decode("utf-8")
+            for i in range(vocab)
+        ]
+        self.timeline = WordTimeline(starts, ends, word_ids, table)
+
+        self.meta = json.loads(bytes(memoryview(buffer)[offset:offset + meta_len]) or b"{}")
+
+    def __len__(self) -> int:
+        return len(self.timeline)
+
+    def to_meta(self) -> dict:
+        """
+        The JSON-shaped metadata ({"audio_id", "duration", "slides",
+        "words"}) this file replaces.
+        """
+        return {**self.meta, "words": self.timeline.to_words()}
+
+    def close(self):
+        # drop the array views first: the mapping can't close under them
+        self.timeline = None
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_timeline(path: str, use_mmap: bool = True) -> TimelineFile:
+    """
+    Opens a `.wtl` file. Uncompressed files are memory-mapped with
+    use_mmap=True; close the result (or use it as a context manager)
+    to release the mapping.
+    """
+    with open(path, "rb") as f:
+        if use_mmap and os.fstat(f.fileno()).st_size > _HEADER.size:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if not _HEADER.unpack_from(mapping, 0)[2] & FLAG_ZLIB:
+                return TimelineFile(mapping, mapping)
+            mapping.close()
+
+        f.seek(0)
+        return TimelineFile(f.read())
+
+
+def load_timeline_meta(path: str) -> dict:
+    """
+    Metadata dict from either format: a `.wtl` timeline or a legacy
+    audio_meta JSON file (a dict, or just the word list).
+    """
+    if path.endswith(TIMELINE_SUFFIX):
+        with read_timeline(path, use_mmap=False) as timeline:
+            return timeline.to_meta()
+
+    with open(path) as f:
+        meta = json.load(f)
+
+    if isinstance(meta, list):
+        meta = {"words": meta}
+
+    return meta
+
+
+def export_json(timeline_path: str, json_path: str, indent: int | None = 2):
+    meta = load_timeline_meta(timeline_path)
+    with open(json_path, "w") as f:
+        json.dump(meta, f, indent=indent)
@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# the app imports its packages (config, services, ...) from ai_studio/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
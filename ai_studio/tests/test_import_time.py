@@ -0,0 +1,26 @@
+# tests/test_import_time.py
+"""
+Start-up budget: importing the app stays fast and leaves the heavy
+engines (Gemini SDK, pdfplumber, python-pptx, gTTS, Whisper) to load on
+first use. IMPORT_BUDGET_SECONDS overrides the budget on slow machines.
+"""
+import os
+
+from benchmarks.import_bench import DEFAULT_BUDGET, run
+
+BUDGET = float(os.getenv("IMPORT_BUDGET_SECONDS", DEFAULT_BUDGET))
+
+
+def test_app_import_within_budget():
+    summary = run(runs=3, top=10)
+
+    assert summary["median_seconds"] <= BUDGET, (
+        f"importing app.main took {summary['median_seconds']} s (budget {BUDGET} s); "
+        f"slowest modules: {summary['slowest_modules_ms']}"
+    )
+
+
+def test_heavy_engines_load_lazily():
+    summary = run(runs=1, top=0)
+
+    assert summary["eager_heavy_modules"] == []
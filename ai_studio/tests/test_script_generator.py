@@ -0,0 +1,53 @@
+# tests/test_script_generator.py
+import re
+
+import pytest
+
+from llm import script_generator
+
+_CONTENT_RE = re.compile(r"^Slide (\d+) CONTENT:", re.MULTILINE)
+
+
+@pytest.fixture
+def prompts(monkeypatch):
+    """
+    Stands in for the Gemini call: one narrated block per slide in the
+    prompt, after a chatty preamble. Returns the prompts it was sent.
+    """
+    sent = []
+
+    def fake_generate(prompt, prefix=None, **kwargs):
+        sent.append(prompt)
+        numbers = _CONTENT_RE.findall(prompt)
+        return "Sure! Here is the narration.\n\n" + "\n\n".join(
+            f"Slide {n}:\nNarration for slide {n}." for n in numbers
+        )
+
+    monkeypatch.setattr(script_generator, "generate", fake_generate)
+    return sent
+
+
+def _slides(count: int, words: int) -> list[dict]:
+    return [
+        {"slide": idx, "content": " ".join(["word"] * words)}
+        for idx in range(1, count + 1)
+    ]
+
+
+def test_long_one_slide_trailing_group_stays_one_slide(prompts):
+    # 21 slides of 125 words at a 2500-word budget: a 20-slide group,
+    # then a trailing group holding one slide over the 120-word split size
+    script = script_generator.generate_slidewise_script_batched(
+        _slides(21, 125), max_words=2500, retries=0
+    )
+
+    assert len(prompts) == 2
+    assert sorted(len(_CONTENT_RE.findall(p)) for p in prompts) == [1, 20]
+    assert re.findall(r"^Slide (\d+):", script, re.MULTILINE) == [str(n) for n in range(1, 22)]
+
+
+def test_single_slide_deck_is_still_split(prompts):
+    script = script_generator.generate_slidewise_script(_slides(1, 250))
+
+    assert len(_CONTENT_RE.findall(prompts[0])) == 3
+    assert script.count("Narration for slide") == 3
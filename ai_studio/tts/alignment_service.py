@@ -0,0 +1,494 @@
+# tts/alignment_service.py
+
+import os
+import re
+import bisect
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, replace
+
+from config.settings import (
+    WHISPER_PROFILES,
+    WHISPER_PROFILE,
+    WHISPER_MODEL_SIZE,
+    WHISPER_REPLICAS,
+    WHISPER_THREADS_PER_REPLICA,
+    WHISPER_BATCH_MAX_FILES,
+    WHISPER_BATCH_WINDOW_MS,
+    ALIGNMENT_MAX_PENDING,
+    ALIGNMENT_QUEUE_TIMEOUT,
+    ALIGNMENT_TIMEOUT
+)
+
+
+class AlignmentBusyError(RuntimeError):
+    """
+    Raised when the alignment queue stays full past the timeout, or an
+    alignment does not finish in time.
+    """
+
+
+# ---------------- PROFILES ----------------
+
+@dataclass(frozen=True)
+class WhisperProfile:
+    name: str
+    model_size: str
+    beam_size: int
+    compute_type: str
+    cpu_threads: int
+    batch_size: int
+
+    @property
+    def batched(self) -> bool:
+        return self.batch_size > 1
+
+    @property
+    def version(self) -> str:
+        """
+        Part of the audio cache key: anything that changes the words.
+        """
+        mode = f"batched{self.batch_size}-perfile" if self.batched else "seq"
+        return f"whisper-{self.model_size}-{self.compute_type}-b{self.beam_size}-vad-{mode}"
+
+
+def resolve_profile(name: str | None = None) -> WhisperProfile:
+    name = name or WHISPER_PROFILE
+    if name not in WHISPER_PROFILES:
+        raise ValueError(
+            f"Unknown Whisper profile: {name} "
+            f"(expected one of {', '.join(WHISPER_PROFILES)})"
+        )
+
+    profile = WhisperProfile(name=name, **WHISPER_PROFILES[name])
+
+    # explicit env settings win over the profile
+    if WHISPER_MODEL_SIZE:
+        profile = replace(profile, model_size=WHISPER_MODEL_SIZE)
+    if WHISPER_THREADS_PER_REPLICA:
+        profile = replace(profile, cpu_threads=int(WHISPER_THREADS_PER_REPLICA))
+
+    return profile
+
+
+# ---------------- WORKER PROCESS ----------------
+# Each worker process loads its own Whisper replica once at start-up.
+
+SAMPLE_RATE = 16000
+
+# Left to its own VAD, the batched pipeline packs speech into ~30 s
+# decoding windows across silences of any length, so files laid end to
+# end would share windows and one request's words would depend on its
+# batch partners. Each file is cut into windows on its own instead (VAD
+# as the pipeline runs it) and the windows are passed as clip_timestamps.
+WINDOW_SECONDS = 30
+VAD_MIN_SILENCE_MS = 160
+
+# between files of one pass; windows never cross it, it only keeps the
+# demux by start time unambiguous
+BATCH_GAP_SECONDS = 1.0
+
+_worker_model = None
+_worker_pipeline = None
+_worker_profile: WhisperProfile | None = None
+
+
+def _init_worker(profile: WhisperProfile):
+    global _worker_model, _worker_pipeline, _worker_profile
+
+    from faster_whisper import BatchedInferencePipeline, WhisperModel
+
+    _worker_profile = profile
+    _worker_model = WhisperModel(
+        profile.model_size,
+        device="cpu",
+        compute_type=profile.compute_type,
+        cpu_threads=profile.cpu_threads,
+        num_workers=1
+    )
+    _worker_pipeline = BatchedInferencePipeline(_worker_model) if profile.batched else None
+
+
+def _loaded() -> bool:
+    return _worker_model is not None
+
+
+def _clean_word(raw: str) -> str:
+    # Keep punctuation for frontend spacing, but normalize
+    return re.sub(r"\s+", " ", raw.strip())
+
+
+def _word_dict(order: int, word: str, start: float, end: float) -> dict:
+    return {
+        "id": order,
+        "word": word,
+        "start": round(max(start - 0.03, 0), 2),  #  small early bias
+        "end": round(end, 2)
+    }
+
+
+def _transcribe_words(audio_path: str) -> list[dict]:
+    if _worker_pipeline is not None:
+        return _transcribe_batch([audio_path])[0]
+
+    segments, _ = _worker_model.transcribe(
+        audio_path,
+        beam_size=_worker_profile.beam_size,
+        word_timestamps=True,
+        vad_filter=True
+    )
+
+    words = []
+
+    for segment in segments:
+        for w in segment.words or ():
+            clean = _clean_word(w.word)
+            if clean:
+                words.append(_word_dict(len(words), clean, w.start, w.end))
+
+    # ordered by start when the caller builds its WordTimeline
+    return words
+
+
+def _file_windows(audio, offset: float) -> list[dict]:
+    """
+    Decoding windows (seconds, on the batch timeline) for one file:
+    consecutive VAD speech chunks merged while they fit WINDOW_SECONDS.
+    """
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    speech = get_speech_timestamps(audio, VadOptions(
+        max_speech_duration_s=WINDOW_SECONDS,
+        min_silence_duration_ms=VAD_MIN_SILENCE_MS
+    ))
+
+    windows = []
+    for chunk in speech:
+        start = offset + chunk["start"] / SAMPLE_RATE
+        end = offset + chunk["end"] / SAMPLE_RATE
+
+        if windows and end - windows[-1]["start"] <= WINDOW_SECONDS:
+            windows[-1]["end"] = end
+        else:
+            windows.append({"start": start, "end": min(end, start + WINDOW_SECONDS)})
+
+    return windows
+
+
+def _transcribe_batch(audio_paths: list[str]) -> list:
+    """
+    One batched model pass over several files: the decoded audio is laid
+    end to end, each file is cut into its own decoding windows (see
+    _file_windows), the windows are decoded `batch_size` at a time, and
+    each word goes back to the file its start falls in. Per file: a word
+    list, or the exception that file raised while decoding.
+    """
+    import numpy as np
+    from faster_whisper import decode_audio
+
+    results = [None] * len(audio_paths)
+    clips, offsets, owners, windows = [], [], [], []
+    gap = np.zeros(int(BATCH_GAP_SECONDS * SAMPLE_RATE), dtype=np.float32)
+    position = 0
+
+    for idx, path in enumerate(audio_paths):
+        try:
+            audio = decode_audio(path, sampling_rate=SAMPLE_RATE)
+        except Exception as e:
+            results[idx] = e
+            continue
+
+        results[idx] = []
+        offsets.append(position / SAMPLE_RATE)
+        owners.append(idx)
+        windows += _file_windows(audio, position / SAMPLE_RATE)
+        clips += [audio, gap]
+        position += len(audio) + len(gap)
+
+    # no speech anywhere (an empty clip list would mean "run VAD")
+    if not windows:
+        return results
+
+    segments, _ = _worker_pipeline.transcribe(
+        np.concatenate(clips),
+        beam_size=_worker_profile.beam_size,
+        word_timestamps=True,
+        clip_timestamps=windows,
+        batch_size=_worker_profile.batch_size
+    )
+
+    for segment in segments:
+        for w in segment.words or ():
+            clean = _clean_word(w.word)
+            if not clean:
+                continue
+
+            k = max(bisect.bisect_right(offsets, w.start) - 1, 0)
+            words = results[owners[k]]
+            words.append(_word_dict(len(words), clean, w.start - offsets[k], w.end - offsets[k]))
+
+    return results
+
+
+# ---------------- SERVICE ----------------
+
+class AlignmentService:
+    """
+    Runs N Whisper replicas in separate processes.
+
+    At most `max_pending` alignments are queued or running at once;
+    callers beyond that wait up to `queue_timeout` seconds for a slot and
+    then get AlignmentBusyError, so overload turns into fast 503s instead
+    of an unbounded backlog. A queued alignment that takes longer than
+    `timeout` seconds fails the same way.
+
+    If the replica processes die (a model that cannot load, a crash),
+    the affected requests fail and the pool is started afresh for the
+    next ones.
+
+    With a batched profile, requests are not sent to a replica one by
+    one: a dispatcher thread waits for a free replica, then hands it
+    everything queued meanwhile (up to `batch_max_files`) as one pass.
+    Idle requests wait at most `batch_window_ms` for company.
+    """
+
+    def __init__(
+        self,
+        replicas: int = WHISPER_REPLICAS,
+        max_pending: int = ALIGNMENT_MAX_PENDING,
+        queue_timeout: float = ALIGNMENT_QUEUE_TIMEOUT,
+        timeout: float = ALIGNMENT_TIMEOUT,
+        profile: WhisperProfile | None = None,
+        batch_max_files: int = WHISPER_BATCH_MAX_FILES,
+        batch_window_ms: float = WHISPER_BATCH_WINDOW_MS
+    ):
+        self.profile = profile or resolve_profile()
+        self.replicas = max(replicas, 1)
+        self.max_pending = max(max_pending, self.replicas)
+        self.queue_timeout = queue_timeout
+        self.timeout = timeout
+        self.batch_max_files = max(batch_max_files, 1)
+        self.batch_window = batch_window_ms / 1000
+
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pending = 0
+        self._batches = 0
+        self._batched_files = 0
+        self._restarts = 0
+        self._lock = threading.Lock()
+        self._executor = self._new_executor()
+
+        self._queue = deque()
+        self._queued = threading.Condition(self._lock)
+        self._free_replicas = threading.Semaphore(self.replicas)
+        self._closed = False
+        self.warm = False
+
+        if self.profile.batched:
+            threading.Thread(
+                target=self._dispatch, name="alignment-batcher", daemon=True
+            ).start()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn: never fork a process that already runs server threads
+        return ProcessPoolExecutor(
+            max_workers=self.replicas,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.profile,)
+        )
+
+    def _submit(self, fn, *args) -> Future:
+        """
+        Submits to the replica pool, replacing it first if its processes
+        died. Raises RuntimeError once shut down.
+        """
+        executor = self._executor
+        try:
+            return executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._replace_broken(executor)
+            return self._executor.submit(fn, *args)
+
+    def _replace_broken(self, broken: ProcessPoolExecutor):
+        with self._lock:
+            if self._closed or self._executor is not broken:
+                return
+            self._executor = self._new_executor()
+            self._restarts += 1
+            self.warm = False
+
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def align(self, audio_path: str) -> list[dict]:
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise AlignmentBusyError("Alignment queue is full, retry later")
+
+        with self._lock:
+            self._pending += 1
+
+        queued = None
+        try:
+            audio_path = os.path.abspath(audio_path)
+
+            if not self.profile.batched:
+                future = self._submit(_transcribe_words, audio_path)
+            else:
+                future = Future()
+                queued = (audio_path, future)
+                with self._queued:
+                    self._queue.append(queued)
+                    self._queued.notify()
+
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                future.cancel()
+                raise AlignmentBusyError(
+                    f"Alignment did not finish within {self.timeout:g} s, retry later"
+                )
+        finally:
+            with self._lock:
+                # timed out before its batch was dispatched
+                if queued is not None and queued in self._queue:
+                    self._queue.remove(queued)
+                self._pending -= 1
+            self._slots.release()
+
+    def warmup(self):
+        """
+        Spawns every replica (worker processes otherwise start, and load
+        their model, on first use) and waits until they answer. A fast
+        replica may answer for a slower one, so the last replicas can
+        still be loading when this returns.
+        """
+        pings = [self._submit(_loaded) for _ in range(self.replicas)]
+        self.warm = all(ping.result() for ping in pings)
+
+    # ---------------- BATCHING ----------------
+
+    def _next_batch(self) -> list[tuple[str, Future]] | None:
+        with self._queued:
+            while not self._queue and not self._closed:
+                self._queued.wait()
+            if self._closed:
+                return None
+
+            # a lone request waits briefly for others to share the pass
+            if len(self._queue) < self.batch_max_files:
+                self._queued.wait_for(
+                    lambda: self._closed or len(self._queue) >= self.batch_max_files,
+                    timeout=self.batch_window
+                )
+
+            count = min(len(self._queue), self.batch_max_files)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _dispatch(self):
+        while True:
+            self._free_replicas.acquire()
+
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            with self._lock:
+                self._batches += 1
+                self._batched_files += len(batch)
+
+            try:
+                pass_future = self._submit(
+                    _transcribe_batch, [path for path, _ in batch]
+                )
+            except RuntimeError as e:
+                # shut down, or the fresh pool broke too: fail this batch,
+                # keep serving the queue until closed
+                self._free_replicas.release()
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                if self._closed:
+                    return
+                continue
+
+            pass_future.add_done_callback(
+                lambda done, batch=batch: self._deliver(done, batch)
+            )
+
+    def _deliver(self, done: Future, batch: list[tuple[str, Future]]):
+        self._free_replicas.release()
+
+        if done.cancelled():
+            error = RuntimeError("Alignment service shut down")
+        else:
+            error = done.exception()
+        results = done.result() if error is None else [error] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():   # timed out meanwhile
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    # ---------------- LIFECYCLE ----------------
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "profile": self.profile.name,
+                "warm": self.warm,
+                "model_size": self.profile.model_size,
+                "batch_size": self.profile.batch_size,
+                "replicas": self.replicas,
+                "threads_per_replica": self.profile.cpu_threads,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "batches": self._batches,
+                "restarts": self._restarts,
+                "mean_files_per_batch": round(self._batched_files / self._batches, 2) if self._batches else 0.0
+            }
+
+    def shutdown(self):
+        with self._queued:
+            self._closed = True
+            abandoned = list(self._queue)
+            self._queue.clear()
+            self._queued.notify_all()
+
+        for _, future in abandoned:
+            if not future.done():
+                future.set_exception(RuntimeError("Alignment service shut down"))
+
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_service: AlignmentService | None = None
+_service_lock = threading.Lock()
+
+
+def get_alignment_service() -> AlignmentService:
+    global _service
+
+    with _service_lock:
+        if _service is None:
+            _service = AlignmentService()
+
+    return _service
+
+
+def alignment_ready() -> bool:
+    return _service is not None and _service.warm
+
+
+def shutdown_alignment_service():
+    global _service
+
+    with _service_lock:
+        if _service is not None:
+            _service.shutdown()
+            _service = None
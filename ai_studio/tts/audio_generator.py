@@ -1,112 +1,386 @@
 # tts/audio_generator.py
 
+import io
 import os
-import uuid
-import json
-import re
+import time
+import hashlib
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-from gtts import gTTS
-from faster_whisper import WhisperModel
 from mutagen.mp3 import MP3
 
+from config.settings import (
+    TTS_LANG,
+    TTS_TLD,
+    TTS_SLOW,
+    AUDIO_CACHE_ENABLED,
+    AUDIO_CACHE_MAX_BYTES,
+    AUDIO_CACHE_TTL_SECONDS,
+    TIMELINE_COMPRESS,
+    ALIGNMENT_MODE,
+    TTS_SEGMENT_CONCURRENCY
+)
+from monitoring.metrics import bind_context, observe_size, timed
+from processing.script_parser import split_script_blocks
+from processing.word_timeline import WordTimeline
+from storage.timeline_file import TIMELINE_SUFFIX, load_timeline_meta, write_timeline
+from tts.alignment_service import get_alignment_service, resolve_profile
+from tts.fast_aligner import fast_align
+
 # ---------------- PATHS ----------------
 
 AUDIO_DIR = "static/audio"
 META_DIR = "static/audio_meta"
 
+# audio, timeline (binary or legacy JSON), its precompressed export and
+# the recency marker
+USED_SUFFIX = ".used"
+ARTIFACT_SUFFIXES = (".mp3", ".json", TIMELINE_SUFFIX, ".json.gz", ".json.br", USED_SUFFIX)
+
 os.makedirs(AUDIO_DIR, exist_ok=True)
 os.makedirs(META_DIR, exist_ok=True)
 
-# ---------------- WHISPER MODEL ----------------
-# base is fine for alignment, but lock params for stability
+# Part of the cache key: bump when synthesis or alignment output changes
+SYNTHESIS_VERSION = "per-slide-1"
+ALIGNMENT_VERSIONS = {
+    "whisper": resolve_profile().version,
+    "fast": "fast-energy-anchored-1",
+}
+
+# ---------------- CACHE ----------------
+
+audio_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str, n: int = 1):
+    with _stats_lock:
+        audio_cache_stats[name] += n
+
+
+def normalize_script(script: str) -> str:
+    return " ".join(script.split())
+
+
+def resolve_alignment_mode(alignment: str | None) -> str:
+    mode = alignment or ALIGNMENT_MODE
+    if mode not in ALIGNMENT_VERSIONS:
+        raise ValueError(
+            f"Unknown alignment mode: {mode} "
+            f"(expected one of {', '.join(ALIGNMENT_VERSIONS)})"
+        )
+    return mode
+
+
+def audio_cache_key(script: str, alignment: str = "whisper") -> str:
+    """
+    Content address for an audio artifact: same narration text, voice
+    and alignment settings → same audio id (uuid-sized hex).
+    """
+    raw = "|".join([
+        normalize_script(script),
+        TTS_LANG,
+        TTS_TLD,
+        str(TTS_SLOW),
+        SYNTHESIS_VERSION,
+        ALIGNMENT_VERSIONS[alignment]
+    ])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def _meta_path(audio_id: str) -> str | None:
+    """
+    The artifact's timeline: binary, or JSON written before the binary
+    format (see storage.migrate_timelines).
+    """
+    for suffix in (TIMELINE_SUFFIX, ".json"):
+        path = os.path.join(META_DIR, f"{audio_id}{suffix}")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _load_cached(audio_id: str) -> dict | None:
+    audio_path = os.path.join(AUDIO_DIR, f"{audio_id}.mp3")
+    meta_path = _meta_path(audio_id)
+
+    # meta is written last, so its presence marks a complete artifact
+    if meta_path is None or not os.path.exists(audio_path):
+        return None
+
+    try:
+        meta = load_timeline_meta(meta_path)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(meta, dict) or "words" not in meta:
+        return None
+
+    # refresh recency for LRU eviction on an empty marker: the served
+    # files' mtimes feed HTTP validators and must not move on a hit
+    Path(META_DIR, f"{audio_id}{USED_SUFFIX}").touch()
+
+    return {
+        "audio_id": audio_id,
+        "audio_url": f"/static/audio/{audio_id}.mp3",
+        "timestamps": meta["words"],
+        "duration": meta["duration"],
+        "slides": meta.get("slides", [])
+    }
+
+
+def enforce_audio_quota(
+    max_bytes: int = AUDIO_CACHE_MAX_BYTES,
+    ttl_seconds: int = AUDIO_CACHE_TTL_SECONDS,
+    keep: set[str] = frozenset()
+) -> int:
+    """
+    Evicts audio + metadata pairs that exceeded the TTL, then the least
+    recently used pairs until the total size fits in `max_bytes`.
+    Returns the number of evicted artifacts.
+    """
+    artifacts = {}
+
+    for directory in (AUDIO_DIR, META_DIR):
+        for entry in os.scandir(directory):
+            if not entry.is_file():
+                continue
+
+            # "<id>.json.gz" etc. belong to the same artifact as "<id>.wtl"
+            audio_id, _, ext = entry.name.partition(".")
+            if "." + ext not in ARTIFACT_SUFFIXES:
+                continue
+
+            st = entry.stat()
+            item = artifacts.setdefault(
+                audio_id, {"size": 0, "used": 0.0, "paths": []}
+            )
+            item["size"] += st.st_size
+            item["used"] = max(item["used"], st.st_mtime)
+            item["paths"].append(entry.path)
+
+    now = time.time()
+    total = sum(item["size"] for item in artifacts.values())
+    evicted = 0
+
+    for audio_id, item in sorted(artifacts.items(), key=lambda kv: kv[1]["used"]):
+        if audio_id in keep:
+            continue
+
+        expired = ttl_seconds > 0 and now - item["used"] > ttl_seconds
+        if not expired and total <= max_bytes:
+            continue
+
+        for path in item["paths"]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+        total -= item["size"]
+        evicted += 1
+
+    if evicted:
+        _count("evictions", evicted)
+
+    return evicted
+
+
+# ---------------- PER-SLIDE SYNTHESIS ----------------
+# Each `Slide N:` block is synthesized on its own, concurrently, and the
+# MP3 frames are joined byte-wise (no re-encode). A deck then narrates
+# in about the time of its slowest slide, and every slide's exact
+# offset falls out of the segment durations.
+
+_segment_pool: ThreadPoolExecutor | None = None
+_segment_pool_lock = threading.Lock()
+
+
+def _get_segment_pool() -> ThreadPoolExecutor:
+    global _segment_pool
+
+    with _segment_pool_lock:
+        if _segment_pool is None:
+            _segment_pool = ThreadPoolExecutor(
+                max_workers=max(TTS_SEGMENT_CONCURRENCY, 1),
+                thread_name_prefix="tts-segment"
+            )
+
+    return _segment_pool
+
+
+def _strip_tags(data: bytes) -> bytes:
+    """
+    Drops ID3v2 (front) and ID3v1 (back) tags so segments can be
+    concatenated as a plain stream of MP3 frames.
+    """
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = 0
+        for byte in data[6:10]:
+            size = (size << 7) | (byte & 0x7F)
+        footer = 10 if data[5] & 0x10 else 0
+        data = data[10 + size + footer:]
+
+    if len(data) >= 128 and data[-128:-125] == b"TAG":
+        data = data[:-128]
+
+    return data
+
+
+# gtts (and requests under it) is imported with the first synthesis;
+# tests and benchmarks may assign `gTTS` beforehand
+gTTS = None
+
+
+def _tts_engine():
+    global gTTS
+
+    if gTTS is None:
+        from gtts import gTTS as engine
+        gTTS = engine
+
+    return gTTS
+
+
+def warm_tts():
+    _tts_engine()
+
+
+def tts_ready() -> bool:
+    return gTTS is not None
+
+
+def synthesize_segment(text: str) -> tuple[bytes, float]:
+    """
+    TEXT → SPEECH (gTTS) for one segment; returns (mp3 frames, seconds).
+    """
+    buf = io.BytesIO()
+    with timed("tts_save"):
+        _tts_engine()(
+            text=text,
+            lang=TTS_LANG,
+            tld=TTS_TLD,
+            slow=TTS_SLOW
+        ).write_to_fp(buf)
+
+    data = _strip_tags(buf.getvalue())
+    with timed("mp3_probe"):
+        duration = MP3(io.BytesIO(data)).info.length
+
+    return data, duration
+
+
+def synthesize_slides(script: str, out_path: str) -> tuple[float, list[dict]]:
+    """
+    Synthesizes every slide block concurrently into one MP3 at
+    `out_path`. Returns (duration, per-slide offsets).
+    """
+    blocks = split_script_blocks(script)
+    pool = _get_segment_pool()
+    futures = [pool.submit(bind_context(synthesize_segment), block) for block in blocks]
+    segments = [future.result() for future in futures]
+
+    slides = []
+    t = 0.0
+
+    with open(out_path, "wb") as f:
+        for idx, (data, seconds) in enumerate(segments):
+            f.write(data)
+            slides.append({
+                "slide_index": idx,
+                "start": round(t, 2),
+                "end": round(t + seconds, 2)
+            })
+            t += seconds
+
+    return round(t, 2), slides
 
-whisper_model = WhisperModel(
-    "base",
-    device="cpu",
-    compute_type="int8",
-    cpu_threads=2,
-    num_workers=1
-)
 
 # ---------------- MAIN ----------------
 
-def script_to_audio(script: str) -> dict:
+def script_to_audio(
+    script: str,
+    use_cache: bool = True,
+    on_stage=None,
+    alignment: str | None = None
+) -> dict:
+    """
+    Narrates `script` and aligns word timestamps.
+
+    `alignment` picks "whisper" (ASR word timings) or "fast" (times the
+    known script words against the audio); defaults to ALIGNMENT_MODE.
+
+    `on_stage(name)` is called as each stage finishes ("synthesized",
+    "aligned") so callers can report progress.
+    """
+    on_stage = on_stage or (lambda name: None)
+
     if not script or not script.strip():
         raise ValueError("Empty script cannot be converted to audio")
 
-    audio_id = uuid.uuid4().hex
+    use_cache = use_cache and AUDIO_CACHE_ENABLED
+    alignment = resolve_alignment_mode(alignment)
+
+    audio_id = audio_cache_key(script, alignment)
+
+    if use_cache:
+        cached = _load_cached(audio_id)
+        if cached is not None:
+            _count("hits")
+            on_stage("synthesized")
+            on_stage("aligned")
+            return cached
+        _count("misses")
+
     audio_file = f"{audio_id}.mp3"
-    meta_file = f"{audio_id}.json"
+    meta_file = f"{audio_id}{TIMELINE_SUFFIX}"
 
     audio_path = os.path.join(AUDIO_DIR, audio_file)
     meta_path = os.path.join(META_DIR, meta_file)
 
-    # TEXT → SPEECH (gTTS)
-    tts = gTTS(
-        text=script,
-        lang="en",
-        slow=False
-    )
-    tts.save(audio_path)
-
-    # AUDIO DURATION
-    audio = MP3(audio_path)
-    duration = round(audio.info.length, 2)
-
-    # WHISPER WORD ALIGNMENT
-    segments, _ = whisper_model.transcribe(
-        audio_path,
-        beam_size=5,
-        word_timestamps=True,
-        vad_filter=True
-    )
-
-    words = []
-    order = 0
-
-    for segment in segments:
-        if not segment.words:
-            continue
-
-        for w in segment.words:
-            raw = w.word.strip()
+    # write under temp names so a concurrent request never sees half a pair
+    tmp_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+    tmp_audio_path = audio_path + tmp_suffix
+    tmp_meta_path = meta_path + tmp_suffix
 
-            # Keep punctuation for frontend spacing, but normalize
-            clean = re.sub(r"\s+", " ", raw)
+    try:
+        # TEXT → SPEECH (per slide, concurrent) + AUDIO DURATION
+        duration, slides = synthesize_slides(script, tmp_audio_path)
+        observe_size("audio_seconds", duration)
+        on_stage("synthesized")
 
-            if not clean:
-                continue
+        # WORD ALIGNMENT
+        if alignment == "fast":
+            with timed("fast_align"):
+                timeline = fast_align(tmp_audio_path, script, duration, segments=slides)
+        else:
+            # Whisper runs in worker-process replicas
+            with timed("transcribe"):
+                timeline = WordTimeline.from_words(get_alignment_service().align(tmp_audio_path))
+        on_stage("aligned")
 
-            start = round(max(w.start - 0.03, 0), 2)  #  small early bias
-            end = round(w.end, 2)
+        #  SAVE METADATA (binary word timeline)
+        write_timeline(
+            tmp_meta_path,
+            timeline,
+            {"audio_id": audio_id, "duration": duration, "slides": slides},
+            compress=TIMELINE_COMPRESS
+        )
 
-            words.append({
-                "id": order,
-                "word": clean,
-                "start": start,
-                "end": end
-            })
+        os.replace(tmp_audio_path, audio_path)
+        os.replace(tmp_meta_path, meta_path)
+    finally:
+        for path in (tmp_audio_path, tmp_meta_path):
+            if os.path.exists(path):
+                os.remove(path)
 
-            order += 1
-
-    #  SAFETY SORT (IMPORTANT)
-    words.sort(key=lambda x: x["start"])
-
-    #  SAVE METADATA
-    with open(meta_path, "w") as f:
-        json.dump(
-            {
-                "audio_id": audio_id,
-                "duration": duration,
-                "words": words
-            },
-            f,
-            indent=2
-        )
+    enforce_audio_quota(keep={audio_id})
 
     return {
         "audio_id": audio_id,
         "audio_url": f"/static/audio/{audio_file}",
-        "timestamps": words,   #  frontend uses this
-        "duration": duration
+        "timestamps": timeline.to_words(),   #  frontend uses this
+        "duration": duration,
+        "slides": slides
     }